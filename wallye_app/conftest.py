@@ -0,0 +1,32 @@
+"""Shared pytest fixtures (and the import root: `pytest` run from this folder finds the wallye package)."""
+import pytest
+
+
+class FakeRoot:
+    """Stands in for the Tk root: records root.after calls instead of running them."""
+
+    def __init__(self):
+        self.timers = {}
+        self._next = 0
+
+    def after(self, ms, func, *args):
+        self._next += 1
+        self.timers[self._next] = (ms, func, args)
+        return self._next
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def run_due(self, ms=0):
+        """Run (and drop) the timers due within `ms`, as the Tk loop would."""
+        for after_id, (delay, func, args) in sorted(self.timers.items(), key=lambda item: item[1][0]):
+            if delay <= ms and self.timers.pop(after_id, None) is not None:
+                func(*args)
+
+    def pending(self):
+        return sorted(self.timers.values(), key=lambda timer: timer[0])
+
+
+@pytest.fixture
+def fake_root():
+    return FakeRoot()
@@ -0,0 +1,61 @@
+import pytest
+
+from wallye.bulk import detect_format, import_file, validate_task
+from wallye.todos import TodoStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TodoStore(str(tmp_path / "todos.json"))
+    store.load()
+    yield store
+    store.close()
+
+
+def test_validate_task():
+    task = validate_task({"title": " Spesa ", "deadline": "2025-06-01 09:00", "priority": "alta"})
+    assert task == {"title": "Spesa", "desc": "", "deadline": "2025-06-01 09:00", "status": "pending", "priority": "alta"}
+    for rec, message in [
+        ({"title": ""}, "titolo mancante"),
+        ({"title": "x", "status": "forse"}, "stato non valido"),
+        ({"title": "x", "deadline": "prima o poi"}, "scadenza non valida"),
+        (["x"], "non è un oggetto"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_task(rec)
+
+
+def test_csv_errors_are_reported_by_line(tmp_path, store):
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "title,status,deadline\n"
+        "ok,pending,2025-06-01 09:00\n"
+        ",pending,\n"
+        "bad status,forse,\n"
+        "bad deadline,pending,prima o poi\n",
+        encoding="utf-8",
+    )
+    result = import_file(store, str(path))
+    assert (result["rows"], result["added"], result["skipped"]) == (4, 1, 3)
+    assert [line for line, _msg in result["errors"]] == [3, 4, 5]
+    assert [t["title"] for t in store.todos] == ["ok"]
+
+
+def test_ndjson_bad_lines_are_skipped(tmp_path, store):
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"title": "uno"}\n\n{not json\n[1, 2]\n{"title": "due"}\n', encoding="utf-8")
+    result = import_file(store, str(path))
+    assert (result["rows"], result["added"], result["skipped"]) == (4, 2, 2)
+    assert [line for line, _msg in result["errors"]] == [3, 4]
+
+
+def test_csv_without_title_column(tmp_path, store):
+    path = tmp_path / "tasks.csv"
+    path.write_text("name,status\nx,pending\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        import_file(store, str(path))
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        detect_format("tasks.xlsx")
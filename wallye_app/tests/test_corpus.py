@@ -0,0 +1,78 @@
+import pytest
+
+from wallye.corpus import CorpusCache, CorpusJob, HeavyHitters, make_record
+from wallye.text import text_stats
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CorpusCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+def _record(path, sig, text="il gatto dorme. il cane"):
+    stats = text_stats(text)
+    return make_record(path, sig, stats), dict(stats.freq)
+
+
+def test_cache_hit_and_miss(cache):
+    record, freq = _record("/a.txt", (100, 23))
+    cache.store(record, freq)
+    hit = cache.lookup("/a.txt", (100, 23))
+    assert hit is not None
+    assert hit[0]["words"] == record["words"] and hit[1] == freq
+    assert hit[2] is None  # stored without a hash
+    assert cache.lookup("/a.txt", (101, 23)) is None  # touched
+    assert cache.lookup("/a.txt", (100, 24)) is None  # resized
+    assert cache.lookup("/b.txt", (100, 23)) is None
+
+
+def test_cache_content_hash(cache):
+    record, freq = _record("/a.txt", (100, 23))
+    cache.store(record, freq, "abc")
+    assert cache.lookup_content("/copy.txt", (500, 23), "other") is None
+    assert cache.lookup_content("/copy.txt", (500, 99), "abc") is None  # same hash, other size
+    hit = cache.lookup_content("/copy.txt", (500, 23), "abc")
+    assert hit is not None and hit[1] == freq
+    assert cache.lookup("/copy.txt", (500, 23)) is not None  # remembered under the new path
+
+
+def test_store_without_hash_keeps_known_hash(cache):
+    record, freq = _record("/a.txt", (100, 23))
+    cache.store(record, freq)
+    cache.set_hash("/a.txt", "abc")
+    record["mtime_ns"] = 200
+    cache.store(record, freq)
+    assert cache.lookup("/a.txt", (200, 23))[2] == "abc"
+
+
+def test_job_uses_the_cache(tmp_path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a.txt").write_text("il gatto dorme.", encoding="utf-8")
+    (folder / "b.md").write_text("il cane abbaia.", encoding="utf-8")
+    (folder / "skip.bin").write_bytes(b"\0")
+    db = str(tmp_path / "cache.db")
+
+    def run():
+        job = CorpusJob(str(folder), workers=1, cache_path=db).start()
+        job.wait()
+        assert job.error is None
+        return job
+
+    first = run()
+    assert (first.analyzed, first.cached) == (2, 0)
+    assert first.result.words == 6 and first.result.freq["il"] == 2
+    second = run()
+    assert (second.analyzed, second.cached) == (0, 2)
+    assert second.result.freq == first.result.freq
+
+
+def test_heavy_hitters_top_words():
+    hh = HeavyHitters(3, width=1024, depth=4)
+    for i in range(200):
+        hh.add(f"raro{i}")
+    hh.update({"alfa": 50, "beta": 40, "gamma": 30})
+    assert [w for w, _c in hh.most_common()] == ["alfa", "beta", "gamma"]
+    assert hh.estimate("alfa") >= 50
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from wallye.deadlines import DeadlineScheduler, deadline_to_str
+
+
+def _task(tid, minutes, status="pending"):
+    return {"id": tid, "title": tid, "deadline": deadline_to_str(datetime.now() + timedelta(minutes=minutes)), "status": status}
+
+
+def _scheduler(root):
+    notices = []
+    return DeadlineScheduler(root, notices.append, notice_minutes=10), notices
+
+
+def test_due_tasks_come_in_deadline_order(fake_root):
+    sched, notices = _scheduler(fake_root)
+    sched.load([_task("later", 60), _task("five", 6), _task("two", 3), _task("finished", 2, status="done")])
+    fake_root.run_due()
+    assert [[t["id"] for t in batch] for batch in notices] == [["two", "five"]]
+    # the next timer is armed for the remaining task, capped at MAX_SLEEP_MS
+    assert [ms for ms, _func, _args in fake_root.pending()] == [DeadlineScheduler.MAX_SLEEP_MS]
+
+
+def test_notified_deadline_is_not_repeated(fake_root):
+    sched, notices = _scheduler(fake_root)
+    task = _task("t", 3)
+    sched.load([task])
+    fake_root.run_due()
+    sched.schedule(task)
+    fake_root.run_due()
+    assert len(notices) == 1
+    assert fake_root.pending() == []
+
+
+def test_reschedule_after_edit(fake_root):
+    sched, notices = _scheduler(fake_root)
+    task = _task("t", 60)
+    sched.load([task])
+    fake_root.run_due()
+    assert notices == []
+
+    task["deadline"] = deadline_to_str(datetime.now() + timedelta(minutes=3))
+    sched.schedule(task)
+    assert [ms for ms, _func, _args in fake_root.pending()] == [0]  # already inside the notice window
+    fake_root.run_due()
+    assert [[t["id"] for t in batch] for batch in notices] == [["t"]]
+
+
+def test_unschedule_and_done(fake_root):
+    sched, notices = _scheduler(fake_root)
+    removed, done = _task("removed", 3), _task("done", 4)
+    sched.load([removed, done])
+    sched.unschedule(removed)
+    done["status"] = "done"
+    sched.schedule(done)
+    fake_root.run_due()
+    assert notices == []
+    assert fake_root.pending() == []
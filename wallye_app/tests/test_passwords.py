@@ -0,0 +1,29 @@
+import pytest
+
+from wallye.passwords import build_charset, generate_password, generate_passwords
+
+
+def test_count_length_and_charset():
+    charset = build_charset(lower=True, upper=False, digits=True, symbols=False)
+    pws = list(generate_passwords(500, 12, charset))
+    assert len(pws) == 500
+    assert all(len(pw) == 12 for pw in pws)
+    assert set("".join(pws)) <= set(charset)
+
+
+def test_every_character_is_used():
+    # 6000 draws from 3 symbols: each one missing would be a bias, not bad luck
+    assert set("".join(generate_passwords(1000, 6, "abc"))) == set("abc")
+    full = build_charset()
+    assert set("".join(generate_passwords(2000, 16, full))) == set(full)
+
+
+def test_limits():
+    assert len(generate_password(1, "a")) == 1
+    assert len(list(generate_passwords(3, 1, "x" * 256))) == 3
+    with pytest.raises(ValueError):
+        generate_password(0, "abc")
+    with pytest.raises(ValueError):
+        generate_password(8, "")
+    with pytest.raises(ValueError):
+        generate_password(8, "x" * 257)
@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from wallye.releases import ReleaseCatalog
+
+
+def _write(path, releases, mtime_ns=None):
+    path.write_text(json.dumps(releases), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    path = tmp_path / "releases.json"
+    _write(path, [{"version": "1.0", "released": True}, {"version": "1.1", "released": False}], 1_000_000_000)
+    return path
+
+
+def test_parsed_once_until_the_file_changes(catalog_file):
+    catalog = ReleaseCatalog(str(catalog_file))
+    assert [r["version"] for r in catalog.available()] == ["1.0"]
+    generation = catalog.generation
+    catalog.releases()
+    catalog.get("1.1")
+    assert catalog.generation == generation
+
+    # same size, newer mtime: parsed again
+    _write(catalog_file, [{"version": "1.0", "released": True}, {"version": "1.1", "released": True}], 2_000_000_000)
+    assert [r["version"] for r in catalog.available()] == ["1.0", "1.1"]
+    assert catalog.generation == generation + 1
+
+
+def test_missing_or_broken_file(tmp_path):
+    catalog = ReleaseCatalog(str(tmp_path / "missing.json"))
+    assert catalog.releases() == []
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json", encoding="utf-8")
+    assert ReleaseCatalog(str(broken)).releases() == []
+
+
+def test_mark_installed(catalog_file):
+    catalog = ReleaseCatalog(str(catalog_file))
+    catalog.mark_installed("1.0")
+    assert catalog.available() == []
+    assert json.loads(catalog_file.read_text(encoding="utf-8"))[0]["installed"] is True
+    generation = catalog.generation
+    catalog.releases()
+    assert catalog.generation == generation  # its own write is not parsed again
+    with pytest.raises(KeyError):
+        catalog.mark_installed("9.9")
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from wallye.search import TaskIndex
+
+
+def _tasks():
+    return [
+        {"id": "1", "title": "Report mensile", "desc": "vendite", "deadline": "2025-06-03 09:00", "status": "pending"},
+        {"id": "2", "title": "Spesa", "desc": "latte e pane", "deadline": "", "status": "pending"},
+        {"id": "3", "title": "Report annuale", "desc": "", "deadline": "2025-06-01 09:00", "status": "done"},
+    ]
+
+
+def _ids(tasks):
+    return [t["id"] for t in tasks]
+
+
+def test_query_filters_and_sorts():
+    index = TaskIndex(_tasks())
+    assert _ids(index.query("report")) == ["1", "3"]
+    assert _ids(index.query("rep", status="pending")) == ["1"]  # last word is a prefix
+    assert _ids(index.query(sort="scadenza")) == ["3", "1", "2"]
+    assert _ids(index.query(due_before=datetime(2025, 6, 2))) == ["3"]
+
+
+def test_update_reindexes_task():
+    tasks = _tasks()
+    index = TaskIndex(tasks)
+    index.build()
+    tasks[1].update(title="Bilancio", deadline="2025-05-30 12:00")
+    index.update(tasks[1])
+    assert index.query("spesa") == []
+    assert _ids(index.query("bilancio")) == ["2"]
+    assert _ids(index.query(sort="scadenza")) == ["2", "3", "1"]
+    assert _ids(index.query(sort="inserimento")) == ["1", "2", "3"]  # keeps its place
+
+
+def test_remove_drops_task():
+    tasks = _tasks()
+    index = TaskIndex(tasks)
+    index.build()
+    removed = tasks.pop(0)
+    index.remove(removed)
+    assert _ids(index.query("report")) == ["3"]
+    assert _ids(index.query("vendite")) == []
+    assert _ids(index.query(due_before=datetime(2025, 6, 30))) == ["3"]
+
+
+def test_add_after_build():
+    tasks = _tasks()
+    index = TaskIndex(tasks)
+    index.build()
+    task = {"id": "4", "title": "Report trimestrale", "desc": "", "deadline": "", "status": "pending"}
+    tasks.append(task)
+    index.add(task)
+    assert _ids(index.query("trim")) == ["4"]
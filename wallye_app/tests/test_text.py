@@ -0,0 +1,39 @@
+import io
+
+from wallye.text import TextStats, analyze_stream, text_stats
+
+TEXT = "Il gatto dorme. Il cane abbaia! Perché il caffè è già freddo?"
+
+
+def _feed(chunks):
+    stats = TextStats()
+    for chunk in chunks:
+        stats.feed(chunk)
+    return stats.finish()
+
+
+def test_word_split_across_chunks():
+    stats = _feed(["Il gat", "to dor", "me. Il ca", "ne"])
+    assert stats.words == 5
+    assert stats.freq["gatto"] == 1 and stats.freq["dorme"] == 1 and stats.freq["cane"] == 1
+    assert "gat" not in stats.freq
+
+
+def test_any_chunk_size_gives_the_same_counts():
+    whole = text_stats(TEXT)
+    for size in (1, 2, 3, 7, len(TEXT)):
+        stats = analyze_stream(io.StringIO(TEXT), chunk_chars=size)
+        assert (stats.chars, stats.words, stats.sentences) == (whole.chars, whole.words, whole.sentences)
+        assert stats.freq == whole.freq
+
+
+def test_non_ascii_words_across_chunks():
+    stats = _feed(["il caff", "è è gi", "à"])
+    assert stats.freq == {"il": 1, "caffè": 1, "è": 1, "già": 1}
+
+
+def test_merge_adds_counts():
+    merged = text_stats("Il gatto.").merge(text_stats("Il cane."))
+    assert merged.words == 4
+    assert merged.sentences == 2
+    assert merged.freq["il"] == 2
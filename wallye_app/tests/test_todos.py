@@ -0,0 +1,118 @@
+from datetime import datetime
+
+from wallye.todos import SqliteTodoStore, TodoStore
+
+
+def _task(title, deadline="", status="pending"):
+    return {"title": title, "desc": "", "deadline": deadline, "status": status}
+
+
+def _titles(todos):
+    return [t["title"] for t in todos]
+
+
+def _reopen(path):
+    store = TodoStore(path)
+    todos = store.load()
+    store.close()
+    return todos
+
+
+# ---------------------------
+# TodoStore (JSON snapshot + journal)
+# ---------------------------
+def test_journal_replay(tmp_path):
+    path = str(tmp_path / "todos.json")
+    store = TodoStore(path)
+    store.load()
+    a = store.add(_task("a"))
+    b = store.add(_task("b"))
+    store.add(_task("c"))
+    store.update(a, {"status": "done"})
+    store.remove(b)
+    store.close()
+
+    todos = _reopen(path)
+    assert _titles(todos) == ["a", "c"]
+    assert todos[0]["status"] == "done"
+    assert todos[0]["id"] == a["id"]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = str(tmp_path / "todos.json")
+    store = TodoStore(path, compact_every=3)
+    store.load()
+    for i in range(5):
+        store.add(_task(f"t{i}"))
+    store.compact(wait=True)
+    store.close()
+
+    journal = tmp_path / "todos.json.journal"
+    assert not journal.exists() or journal.read_bytes().count(b"\n") < 3
+    assert _titles(_reopen(path)) == [f"t{i}" for i in range(5)]
+
+
+def test_torn_last_journal_line_is_dropped(tmp_path):
+    path = str(tmp_path / "todos.json")
+    store = TodoStore(path)
+    store.load()
+    store.add(_task("kept"))
+    store.close()
+    journal = tmp_path / "todos.json.journal"
+    good = journal.read_bytes()
+    with open(journal, "ab") as f:
+        f.write(b'{"op": "add", "id": "x", "task": {"title": "tor')  # interrupted append
+
+    store = TodoStore(path)
+    assert _titles(store.load()) == ["kept"]
+    assert journal.read_bytes() == good  # the torn tail is cut off on load
+    store.add(_task("after"))
+    store.close()
+    assert _titles(_reopen(path)) == ["kept", "after"]
+
+
+def test_import_todos_replaces_by_id(tmp_path):
+    path = str(tmp_path / "todos.json")
+    store = TodoStore(path)
+    store.load()
+    a = store.add(_task("a"))
+    added, updated = store.import_todos([dict(_task("a2"), id=a["id"]), _task("b")])
+    store.close()
+    assert (added, updated) == (1, 1)
+    assert _titles(_reopen(path)) == ["a2", "b"]
+
+
+# ---------------------------
+# SqliteTodoStore
+# ---------------------------
+def test_sqlite_upsert_keeps_order(tmp_path):
+    path = str(tmp_path / "todos.db")
+    store = SqliteTodoStore(path, json_path=None)
+    store.load()
+    a = store.add(_task("a"))
+    store.add(_task("b"))
+    added, updated = store.import_todos([dict(_task("a2", status="done"), id=a["id"]), _task("c")])
+    store.close()
+    assert (added, updated) == (1, 1)
+
+    store = SqliteTodoStore(path, json_path=None)
+    todos = list(store.load())
+    store.close()
+    assert _titles(todos) == ["a2", "b", "c"]
+    assert todos[0]["status"] == "done"
+
+
+def test_sqlite_due_between(tmp_path):
+    store = SqliteTodoStore(str(tmp_path / "todos.db"), json_path=None)
+    store.load()
+    store.import_todos([
+        _task("late", "2025-06-03 09:00"),
+        _task("early", "2025-06-01 18:30"),
+        _task("outside", "2025-06-10 09:00"),
+        _task("finished", "2025-06-02 09:00", status="done"),
+        _task("none"),
+    ])
+    due = store.due_between(datetime(2025, 6, 1), datetime(2025, 6, 7))
+    assert _titles(due) == ["early", "late"]
+    assert _titles(store.due_between(datetime(2025, 6, 1), datetime(2025, 6, 7), status="done")) == ["finished"]
+    store.close()
@@ -0,0 +1,12 @@
+"""Wallye: to-do manager, text analyzer and password generator.
+
+The core modules only use the standard library and never import tkinter;
+the GUI lives in wallye.gui and is imported only when it is started.
+"""
+from .todos import load_todos, save_todos, open_todo_store
+from .deadlines import parse_deadline, deadline_to_str, normalize_deadline, register_deadline_format
+from .text import estimate_syllables, flesch_reading_ease, text_stats, analyze_file
+from .passwords import build_charset, generate_password, generate_passwords, evaluate_password
+from .releases import load_private_releases, get_private_release_path
+
+__version__ = "1.0"
@@ -0,0 +1,146 @@
+"""Text analysis off the Tk thread: one thread per job, one process per file."""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .config import ANALYSIS_CHUNK_CHARS
+from .metrics import record
+from .text import TextStats
+
+_worker_cancel = None
+_worker_progress = None
+
+def _analysis_worker_init(cancel_event, progress_queue):
+    global _worker_cancel, _worker_progress
+    _worker_cancel = cancel_event
+    _worker_progress = progress_queue
+
+def _analysis_worker(path, chunk_chars=ANALYSIS_CHUNK_CHARS):
+    # runs in a pool process: reports bytes read, stops early when cancelled
+    stats = TextStats()
+    pos = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for chunk in iter(lambda: f.read(chunk_chars), ""):
+            if _worker_cancel is not None and _worker_cancel.is_set():
+                return None
+            stats.feed(chunk)
+            if _worker_progress is not None:
+                new_pos = f.buffer.tell()
+                _worker_progress.put(new_pos - pos)
+                pos = new_pos
+    return stats.finish()
+
+class AnalysisJob:
+    """Text analysis running off the Tk thread.
+
+    Either `text` (the editor content) or a list of `paths` is analyzed; with
+    several files each one goes to its own process (up to one per core) and
+    the results are merged. The Tk side only reads `progress()`, `done`,
+    `result` and `error` from a root.after poll and may call cancel().
+    """
+
+    def __init__(self, text=None, paths=(), workers=None):
+        self.text = text
+        self.paths = list(paths)
+        self.workers = workers or os.cpu_count() or 1
+        self.result = None
+        self.per_file = {}
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self._processed = 0
+        if text is not None:
+            self._total = len(text)
+        else:
+            self._total = sum(os.path.getsize(p) for p in self.paths)
+        self._cancel = multiprocessing.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    def cancel(self):
+        self.cancelled = True
+        self._cancel.set()
+
+    def progress(self):
+        # fraction in [0, 1]
+        return min(1.0, self._processed / self._total) if self._total else 0.0
+
+    def _run(self):
+        start = time.perf_counter_ns()
+        try:
+            if self.text is not None:
+                self.result = self._run_text()
+            elif len(self.paths) == 1:
+                self.result = self._run_file(self.paths[0])
+            else:
+                self.result = self._run_pool()
+        except Exception as e:
+            self.error = e
+        if self.cancelled:
+            self.result = None
+        else:
+            # whole job, off the Tk thread: editor text or files
+            record("analyze_text" if self.text is not None else "analyze_files", time.perf_counter_ns() - start)
+        self.done = True
+
+    def _run_text(self):
+        stats = TextStats()
+        text = self.text
+        for start in range(0, len(text), ANALYSIS_CHUNK_CHARS):
+            if self._cancel.is_set():
+                return None
+            stats.feed(text[start:start + ANALYSIS_CHUNK_CHARS])
+            self._processed = start + ANALYSIS_CHUNK_CHARS
+        return stats.finish()
+
+    def _run_file(self, path):
+        # a single file: no point paying for a process, stream it in this thread
+        stats = TextStats()
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for chunk in iter(lambda: f.read(ANALYSIS_CHUNK_CHARS), ""):
+                if self._cancel.is_set():
+                    return None
+                stats.feed(chunk)
+                self._processed = f.buffer.tell()
+        self.per_file[path] = stats.finish()
+        return stats
+
+    def _run_pool(self):
+        progress = multiprocessing.Queue()
+        total = TextStats()
+        workers = min(self.workers, len(self.paths))
+        with ProcessPoolExecutor(workers, initializer=_analysis_worker_init, initargs=(self._cancel, progress)) as pool:
+            futures = {pool.submit(_analysis_worker, p): p for p in self.paths}
+            pending = set(futures)
+            while pending:
+                finished, pending = wait(pending, timeout=0.1)
+                self._drain(progress)
+                if self._cancel.is_set():
+                    for fut in pending:
+                        fut.cancel()
+                for fut in finished:
+                    if fut.cancelled():
+                        continue
+                    stats = fut.result()
+                    if stats is not None:
+                        self.per_file[futures[fut]] = stats
+                        total.merge(stats)
+        self._drain(progress)
+        return None if self._cancel.is_set() else total
+
+    def _drain(self, progress):
+        try:
+            while True:
+                self._processed += progress.get_nowait()
+        except queue.Empty:
+            pass
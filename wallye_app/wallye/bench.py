@@ -0,0 +1,362 @@
+"""Benchmarks: python -m wallye bench NAME [ARGS]."""
+import functools
+import hashlib
+import http.server
+import io
+import json
+import os
+import random
+import re
+import secrets
+import tempfile
+import threading
+import time
+import zipfile
+from collections import Counter
+from datetime import datetime
+
+from .todos import format_task_row
+from .text import estimate_syllables, text_stats
+from .passwords import build_charset, generate_passwords
+
+
+def bench_task_list(*sizes, repeat=5):
+    """Refresh latency of the To-Do list: full Listbox rebuild vs VirtualList (needs a display)."""
+    import tkinter as tk
+    from .gui import VirtualList
+
+    sizes = sizes or (1000, 10000, 50000, 200000)
+    root = tk.Tk()
+    root.withdraw()
+    print(f"{'tasks':>8}  {'full rebuild':>14}  {'VirtualList':>12}")
+    for n in sizes:
+        todos = [{"id": str(i), "title": f"Task {i}", "deadline": "2030-01-01 09:00", "status": "pending"} for i in range(n)]
+        full = tk.Listbox(root)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            full.delete(0, tk.END)
+            for i, t in enumerate(todos):
+                full.insert(tk.END, format_task_row(i, t))
+        full_ms = (time.perf_counter() - start) * 1000 / repeat
+        view = VirtualList(root, todos, format_task_row)
+        view.rows = 30
+        start = time.perf_counter()
+        for _ in range(repeat):
+            view.reset(todos)
+        virt_ms = (time.perf_counter() - start) * 1000 / repeat
+        print(f"{n:>8}  {full_ms:>11.2f} ms  {virt_ms:>9.3f} ms")
+        full.destroy()
+        view.destroy()
+    root.destroy()
+
+def iter_corpus(size_mb, seed=0):
+    """Blocks of synthetic text, size_mb MB in total: Zipf-ish words, punctuation and line breaks."""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "re", "mi", "tu", "sen", "dar", "vi", "po", "que", "ste", "an"]
+    vocab = ["".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))) for _ in range(20000)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    tails = [" "] * 12 + [", ", ". ", "! ", "? ", ".\n"]
+    size = 0
+    target = int(size_mb * 1024 * 1024)
+    while size < target:
+        words = rng.choices(vocab, weights, k=50000)
+        block = "".join(w + rng.choice(tails) for w in words)[:target - size]
+        size += len(block)
+        yield block
+
+def make_corpus(size_mb, seed=0):
+    """Synthetic text of about size_mb MB, in memory (see iter_corpus)."""
+    return "".join(iter_corpus(size_mb, seed))
+
+def write_corpus(path, size_mb, seed=0):
+    """Stream iter_corpus to a UTF-8 file (ASCII only: bytes == characters)."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for block in iter_corpus(size_mb, seed):
+            f.write(block)
+    return path
+
+def _legacy_text_analysis(text):
+    # analyze_text + flesch_reading_ease as they were before the shared tokenizer
+    words = [w.lower() for w in ''.join(ch if ch.isalnum() or ch.isspace() else ' ' for ch in text).split() if w]
+    sentences = max(0, sum(1 for ch in text if ch in ".!?"))
+    most_common = Counter(words).most_common(10)
+    words2 = [w for w in ''.join(ch if ch.isalnum() or ch.isspace() else ' ' for ch in text).split() if w]
+    syllables = 0
+    for w in words2:
+        w = w.lower()
+        count = 0
+        prev_v = False
+        for ch in w:
+            is_v = ch in "aeiouy"
+            if is_v and not prev_v:
+                count += 1
+            prev_v = is_v
+        if w.endswith("e"):
+            count = max(1, count - 1)
+        syllables += max(1, count)
+    return len(words), sentences, most_common, syllables
+
+def bench_tokenizer(size_mb=100):
+    """Legacy per-character analysis vs the single-pass TextStats on a synthetic corpus."""
+    text = make_corpus(size_mb)
+    print(f"corpus: {len(text) / 1e6:.1f} M caratteri")
+    start = time.perf_counter()
+    legacy = _legacy_text_analysis(text)
+    legacy_s = time.perf_counter() - start
+    estimate_syllables.cache_clear()
+    start = time.perf_counter()
+    stats = text_stats(text)
+    new_s = time.perf_counter() - start
+    assert (stats.words, stats.sentences, stats.syllables) == (legacy[0], legacy[1], legacy[3])
+    print(f"legacy      {legacy_s:8.2f} s  {len(text) / legacy_s / 1e6:7.1f} M car/s")
+    print(f"TextStats   {new_s:8.2f} s  {len(text) / new_s / 1e6:7.1f} M car/s  (x{legacy_s / new_s:.1f})")
+
+def _legacy_passwords(count, length, charset):
+    # one secrets.choice call per character, as App.generate_password used to do
+    for _ in range(count):
+        yield ''.join(secrets.choice(charset) for _ in range(length))
+
+def bench_passwords(count=200000, length=16):
+    """Passwords per second: per-character secrets.choice vs bulk generate_passwords."""
+    charset = build_charset()
+    results = {}
+    for name, gen in (("secrets.choice", _legacy_passwords), ("generate_passwords", generate_passwords)):
+        start = time.perf_counter()
+        for _ in gen(count, length, charset):
+            pass
+        results[name] = time.perf_counter() - start
+    base = results["secrets.choice"]
+    for name, secs in results.items():
+        print(f"{name:<20} {secs:7.2f} s  {count / secs:12,.0f} pw/s  (x{base / secs:.1f})")
+
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file server that honours "Range: bytes=a-b" (SimpleHTTPRequestHandler ignores it).
+
+    Stand-in for a release server when trying the installer locally.
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so the installer's connection pool is used
+
+    def log_message(self, *args):
+        pass
+
+    def send_head(self):
+        m = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        path = self.translate_path(self.path)
+        if not m or not os.path.isfile(path):
+            return super().send_head()
+        size = os.path.getsize(path)
+        start = int(m.group(1))
+        end = min(int(m.group(2)) if m.group(2) else size - 1, size - 1)
+        if start > end:
+            self.send_error(416)
+            return None
+        with open(path, "rb") as f:
+            f.seek(start)
+            body = f.read(end - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        return io.BytesIO(body)
+
+class _QuietServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # cancelled downloads hang up mid-response; that is expected here
+        pass
+
+def serve_directory(folder, port=0):
+    """Start a RangeRequestHandler server for folder in a daemon thread; returns (server, base url)."""
+    handler = functools.partial(RangeRequestHandler, directory=folder)
+    server = _QuietServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+def bench_install(size_mb=200, workers=4):
+    """Installer throughput from a local Range-capable HTTP server and from a directory mirror."""
+    from .installer import InstallJob
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = os.path.join(tmp, "mirror")
+        os.makedirs(mirror)
+        artifact = os.path.join(mirror, "wallye.zip")
+        with zipfile.ZipFile(artifact, "w", zipfile.ZIP_STORED) as zf:
+            zf.writestr("payload.bin", os.urandom(int(size_mb * 1024 * 1024)))
+        digest = hashlib.sha256()
+        with open(artifact, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest = digest.hexdigest()
+        server, base = serve_directory(mirror)
+        try:
+            runs = [("http, 1 worker", base, 1), (f"http, {workers} worker", base, workers), ("mirror locale", mirror, workers)]
+            print(f"artefatto: {os.path.getsize(artifact) / 1e6:.1f} MB")
+            for i, (name, source, n) in enumerate(runs):
+                home = os.path.join(tmp, f"home{i}")
+                job = InstallJob({"version": "bench", "url": "wallye.zip", "sha256": digest}, mirror=source, workers=n,
+                                 staging_dir=os.path.join(home, "staging"), versions_dir=os.path.join(home, "versions"),
+                                 current_file=os.path.join(home, "current.json")).start()
+                job.wait()
+                if job.error is not None:
+                    raise job.error
+                r = job.result
+                print(f"{name:<16} {r['download_seconds']:7.2f} s  {r['mb_per_s']:8.1f} MB/s  (totale con swap {r['seconds']:.2f} s)")
+        finally:
+            server.shutdown()
+
+def make_tasks(n, seed=0):
+    """n synthetic tasks: short titles, some descriptions, deadlines over about two years."""
+    rng = random.Random(seed)
+    words = ["report", "call", "review", "fix", "deploy", "plan", "email", "invoice", "meeting", "backup"]
+    for i in range(n):
+        day = rng.randrange(730)
+        yield {
+            "id": f"t{i:07d}",
+            "title": f"{rng.choice(words).capitalize()} {rng.choice(words)} {i}",
+            "desc": "" if rng.random() < 0.5 else " ".join(rng.choices(words, k=8)),
+            "deadline": "" if rng.random() < 0.2 else f"{2025 + day // 365}-{day % 365 // 31 + 1:02d}-{day % 28 + 1:02d} {rng.randrange(24):02d}:{rng.choice((0, 15, 30, 45)):02d}",
+            "status": "done" if rng.random() < 0.3 else "pending",
+        }
+
+def write_todos_file(path, n, seed=0):
+    """todos.json with n synthetic tasks, written one task at a time (make_tasks)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, t in enumerate(make_tasks(n, seed)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(t, ensure_ascii=False))
+        f.write("]")
+    return path
+
+def write_catalog(path, n, seed=0):
+    """releases.json with n synthetic releases (about 90% released, half of them installed)."""
+    rng = random.Random(seed)
+    releases = []
+    for i in range(n):
+        version = f"{1 + i // 10000}.{i // 100 % 100}.{i % 100}"
+        day = rng.randrange(1500)
+        releases.append({
+            "version": version,
+            "title": f"Release {version}",
+            "date": f"{2022 + day // 365}-{day % 365 // 31 + 1:02d}-{day % 28 + 1:02d}",
+            "released": rng.random() < 0.9,
+            "installed": rng.random() < 0.5,
+            "url": f"wallye-{version}.zip",
+            "sha256": "%064x" % rng.getrandbits(256),
+            "notes": "\n".join(f"- modifica {k}" for k in range(rng.randint(1, 20))),
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(releases, f, indent=2)
+    return path
+
+def bench_import(rows=100000, legacy_rows=2000):
+    """Rows/s of bulk CSV/NDJSON import (JSON journal and SQLite) and export vs one add() per task."""
+    from .bulk import export_file, import_file
+    from .todos import TodoStore, SqliteTodoStore
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = {}
+        for fmt in ("csv", "ndjson"):
+            sources[fmt] = os.path.join(tmp, f"tasks.{fmt}")
+            r = export_file(make_tasks(rows), sources[fmt])
+            print(f"export {fmt:<7} {r['rows_per_s']:12,.0f} righe/s")
+        for fmt, src in sources.items():
+            for backend in ("json", "sqlite"):
+                base = os.path.join(tmp, f"{backend}-{fmt}")
+                store = TodoStore(base + ".json") if backend == "json" else SqliteTodoStore(base + ".db", json_path=None)
+                store.load()
+                r = import_file(store, src)
+                store.close()
+                print(f"import {fmt:<7} -> {backend:<6} {r['rows_per_s']:12,.0f} righe/s  ({r['added']} task, {r['seconds']:.2f} s)")
+        # before: one task at a time (a journal append each; the dialog used to rewrite the whole file)
+        store = TodoStore(os.path.join(tmp, "legacy.json"), compact_every=10 ** 9)
+        store.load()
+        start = time.perf_counter()
+        for t in make_tasks(legacy_rows):
+            store.add(t)
+        elapsed = time.perf_counter() - start
+        store.close()
+        print(f"add() singoli        {legacy_rows / elapsed:12,.0f} righe/s  ({legacy_rows} task)")
+
+def _legacy_parse_deadline(text):
+    # parse_deadline before the fast path and cache: two strptime attempts in try/except
+    text = text.strip()
+    if not text:
+        return None
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except Exception:
+            pass
+    return None
+
+def bench_deadlines(calls=1000000, distinct=5000):
+    """µs per parse_deadline call: legacy strptime vs fixed-width fast path, cold and cached."""
+    from .deadlines import _parse_absolute, _parse_fixed, parse_deadline
+    texts = [t["deadline"] for t in make_tasks(distinct * 2) if t["deadline"]][:distinct]
+    texts += [t[:10] for t in texts[:distinct // 5]]  # some date-only deadlines
+    workload = [texts[i % len(texts)] for i in range(calls)]
+    for t in texts:
+        assert parse_deadline(t) == _legacy_parse_deadline(t), t
+    runs = [
+        ("strptime (prima)", _legacy_parse_deadline),
+        ("fast path, no cache", _parse_fixed),
+        ("parse_deadline", parse_deadline),
+    ]
+    print(f"{calls:,} chiamate su {len(texts):,} scadenze distinte")
+    base = None
+    for name, func in runs:
+        _parse_absolute.cache_clear()
+        start = time.perf_counter()
+        for t in workload:
+            func(t)
+        secs = time.perf_counter() - start
+        base = base or secs
+        print(f"{name:<20} {secs * 1e6 / calls:7.3f} µs/chiamata  (x{base / secs:.1f})")
+
+def bench_search(count=100000, repeat=20):
+    """TaskIndex: build time, query latency and incremental update vs a linear scan."""
+    from .search import TaskIndex, tokenize
+    todos = list(make_tasks(count))
+    index = TaskIndex(todos)
+    start = time.perf_counter()
+    index.build()
+    print(f"{count:,} task, indice costruito in {time.perf_counter() - start:.2f} s")
+    queries = [
+        ("testo raro", dict(text="deploy invoice 4242")),
+        ("prefisso", dict(text="backup emai")),
+        ("stato + scadenza", dict(status="pending", due_before=datetime(2025, 3, 1), sort="scadenza")),
+        ("testo + titolo", dict(text="review plan", sort="titolo")),
+    ]
+    for name, q in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            found = index.query(**q)
+        idx_ms = (time.perf_counter() - start) * 1000 / repeat
+        words = tokenize(q.get("text", ""))
+        start = time.perf_counter()
+        # what a search without the index costs: tokenize every task (exact words only)
+        for t in todos:
+            if (not q.get("status") or t["status"] == q["status"]) and words <= tokenize(f"{t['title']} {t['desc']}"):
+                pass
+        scan_ms = (time.perf_counter() - start) * 1000
+        print(f"{name:<18} {len(found):>7} risultati  indice {idx_ms:8.2f} ms  scansione {scan_ms:8.1f} ms")
+    t = todos[count // 2]
+    start = time.perf_counter()
+    for i in range(1000):
+        t["title"] = f"Renamed task {i}"
+        index.update(t)
+    print(f"aggiornamento incrementale {(time.perf_counter() - start) * 1000 / 1000:.3f} ms/task")
+
+BENCHMARKS = {
+    "tasklist": bench_task_list,
+    "tokenizer": bench_tokenizer,
+    "passwords": bench_passwords,
+    "install": bench_install,
+    "import": bench_import,
+    "deadlines": bench_deadlines,
+    "search": bench_search,
+}
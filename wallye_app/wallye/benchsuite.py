@@ -0,0 +1,391 @@
+"""Benchmark suite: python -m wallye bench-suite [--scale S] [-o FILE] [--compare FILE].
+
+Every case runs headless on data from the seeded generators in bench.py
+(todos.json, a text corpus, releases.json). The data is written once per
+(size, seed) into a data directory and reused by later runs. Where a case
+covers GUI code, the Tk widgets are replaced by stand-ins that only
+record the calls (VirtualList, sync_listbox_rows, root.after), so what is
+timed is the app's own work.
+
+Each case runs `repeat` times. The result file keeps every run plus the
+median, with the parameters and the machine it ran on. Two result files
+can be compared case by case with compare_results, and `--compare` fails
+the command when a case slows down beyond the tolerance.
+"""
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from . import __version__
+from .bench import make_tasks, write_catalog, write_corpus, write_todos_file
+from .fileutil import atomic_write_json
+
+SCALES = {
+    "small": {"tasks": 1000, "text_mb": 1, "releases": 1000, "passwords": 10000},
+    "medium": {"tasks": 10000, "text_mb": 10, "releases": 2000, "passwords": 100000},
+    "large": {"tasks": 100000, "text_mb": 100, "releases": 5000, "passwords": 1000000},
+    "huge": {"tasks": 1000000, "text_mb": 1024, "releases": 10000, "passwords": 1000000},
+}
+RESULTS_FORMAT = 1  # bumped when the layout of the result file changes
+
+
+# ---------------------------
+# Tk stand-ins
+# ---------------------------
+class _FakeWidget:
+    """Accepts any widget call and does nothing (Listbox, Scrollbar)."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def delete(self, first, last=None):
+        self.rows = []
+
+    def insert(self, index, *items):
+        self.rows.extend(items)
+
+    def get(self, first, last=None):
+        return tuple(self.rows)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class _FakeRoot:
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, after_id):
+        pass
+
+
+def _virtual_list(source):
+    """A gui.VirtualList with stand-in widgets (no display needed)."""
+    from .gui import VirtualList
+    from .todos import format_task_row
+    return VirtualList.detached(source, format_task_row, _FakeWidget(), _FakeWidget(), rows=30)
+
+
+# ---------------------------
+# Data
+# ---------------------------
+# input files each group of cases reads (group = case name up to the dot)
+CASE_DATA = {
+    "todos": ("todos", "db"),
+    "list": ("todos",),
+    "deadlines": ("todos", "db"),
+    "text": ("corpus",),
+    "passwords": (),
+    "catalog": ("catalog",),
+}
+
+
+def prepare_data(data_dir, params, seed=0, need=("todos", "db", "corpus", "catalog")):
+    """Generate (or reuse) the input files in `need`; returns the paths of all of them."""
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {
+        "todos": os.path.join(data_dir, f"todos-{params['tasks']}-s{seed}.json"),
+        "corpus": os.path.join(data_dir, f"corpus-{params['text_mb']}mb-s{seed}.txt"),
+        "catalog": os.path.join(data_dir, f"releases-{params['releases']}-s{seed}.json"),
+    }
+    generators = {
+        "todos": lambda p: write_todos_file(p, params["tasks"], seed),
+        "corpus": lambda p: write_corpus(p, params["text_mb"], seed),
+        "catalog": lambda p: write_catalog(p, params["releases"], seed),
+    }
+    db = os.path.join(data_dir, f"todos-{params['tasks']}-s{seed}.db")
+    if "db" in need:
+        need = set(need) | {"todos"}
+    for key, path in paths.items():
+        if key in need and not os.path.exists(path):
+            start = time.perf_counter()
+            tmp = path + ".tmp"
+            generators[key](tmp)
+            os.replace(tmp, path)
+            print(f"  generato {os.path.basename(path)} ({os.path.getsize(path) / 1e6:.1f} MB, {time.perf_counter() - start:.1f} s)", file=sys.stderr)
+    if "db" in need and not os.path.exists(db):
+        from .todos import migrate_json_to_sqlite
+        migrate_json_to_sqlite(paths["todos"], db + ".tmp")
+        os.replace(db + ".tmp", db)
+    paths["db"] = db
+    return paths
+
+
+# ---------------------------
+# Cases
+# ---------------------------
+# A case is setup(ctx) -> (run, items, unit): run() is the timed operation,
+# items / median seconds is the throughput reported next to it.
+def case_todos_load_json(ctx):
+    from .todos import TodoStore
+
+    def run():
+        store = TodoStore(ctx["paths"]["todos"])
+        store.load()
+        store.close()
+    return run, ctx["params"]["tasks"], "task"
+
+
+def case_todos_save_json(ctx):
+    from .todos import TodoStore
+    path = os.path.join(ctx["work"], "save.json")
+    shutil.copyfile(ctx["paths"]["todos"], path)
+    store = TodoStore(path)
+    store.load()
+    ctx["cleanup"].append(store.close)
+    return store.save_all, ctx["params"]["tasks"], "task"
+
+
+def case_todos_add_json(ctx, count=1000):
+    # one journal append per edit, as the To-Do tab does
+    from .todos import TodoStore
+    store = TodoStore(os.path.join(ctx["work"], "add.json"), compact_every=10 ** 9)
+    store.load()
+    ctx["cleanup"].append(store.close)
+    tasks = list(make_tasks(count, seed=1))
+
+    def run():
+        for t in tasks:
+            store.add(dict(t, id=None))
+    return run, count, "task"
+
+
+def case_todos_load_sqlite(ctx):
+    from .todos import SqliteTodoStore
+
+    def run():
+        store = SqliteTodoStore(ctx["paths"]["db"], json_path=None)
+        store.load()
+        store.close()
+    return run, ctx["params"]["tasks"], "task"
+
+
+def case_list_refresh(ctx):
+    # App.refresh_task_list without a filter: only the visible window is formatted
+    view = _virtual_list(ctx["todos"])
+    return (lambda: view.reset(ctx["todos"])), 1, "refresh"
+
+
+def case_list_filter(ctx):
+    # search box + sort on a built index, then the list shows the result
+    from .search import TaskIndex
+    index = TaskIndex(ctx["todos"])
+    index.build()
+    view = _virtual_list(ctx["todos"])
+    return (lambda: view.reset(index.query("report", "pending", None, "scadenza"))), 1, "query"
+
+
+def case_list_index_build(ctx):
+    from .search import TaskIndex
+    index = TaskIndex(ctx["todos"])
+    return index.build, ctx["params"]["tasks"], "task"
+
+
+def case_deadlines_scan(ctx):
+    # DeadlineScheduler.load over every task, with a cold parse cache
+    from .deadlines import DeadlineScheduler, _parse_absolute
+    todos = ctx["todos"]
+
+    def run():
+        _parse_absolute.cache_clear()
+        DeadlineScheduler(_FakeRoot(), lambda tasks: None, notified=set()).load(todos)
+    return run, ctx["params"]["tasks"], "task"
+
+
+def case_deadlines_due_sqlite(ctx):
+    # the next week of pending deadlines through the (status, due_at) index
+    from .todos import SqliteTodoStore
+    store = SqliteTodoStore(ctx["paths"]["db"], json_path=None)
+    store.load()
+    ctx["cleanup"].append(store.close)
+    start = datetime(2025, 6, 1)
+
+    def run():
+        store.todos._cache.clear()
+        store.due_between(start, start + timedelta(days=7))
+    return run, 1, "query"
+
+
+def case_text_analyze(ctx):
+    from .text import analyze_file, estimate_syllables
+
+    def run():
+        estimate_syllables.cache_clear()
+        analyze_file(ctx["paths"]["corpus"])
+    return run, os.path.getsize(ctx["paths"]["corpus"]) / 1e6, "MB"
+
+
+def case_passwords(ctx):
+    from .passwords import build_charset, generate_passwords
+    count = ctx["params"]["passwords"]
+    charset = build_charset()
+
+    def run():
+        for _ in generate_passwords(count, 16, charset):
+            pass
+    return run, count, "password"
+
+
+def case_catalog_parse(ctx):
+    # first look at releases.json (or after it changed): parse + derived views
+    from .releases import ReleaseCatalog
+
+    def run():
+        ReleaseCatalog(ctx["paths"]["catalog"]).available()
+    return run, ctx["params"]["releases"], "release"
+
+
+def case_catalog_refresh(ctx, calls=1000):
+    # "Aggiorna" with nothing changed: one stat per call, the rows are kept
+    from .gui import sync_listbox_rows
+    from .releases import ReleaseCatalog
+    catalog = ReleaseCatalog(ctx["paths"]["catalog"])
+    listbox = _FakeWidget()
+
+    def refresh(generation):
+        # App.refresh_available_updates
+        available = catalog.available()
+        if catalog.generation != generation:
+            rows = [f"{i+1}. {r.get('version')} - {r.get('title') or ''} ({r.get('date') or ''})" for i, r in enumerate(available)]
+            sync_listbox_rows(listbox, listbox.get(0, "end"), rows)
+        return catalog.generation
+
+    shown = refresh(None)  # the tab was filled once when the app started
+
+    def run():
+        for _ in range(calls):
+            refresh(shown)
+    return run, calls, "refresh"
+
+
+CASES = {
+    "todos.load_json": case_todos_load_json,
+    "todos.save_json": case_todos_save_json,
+    "todos.add_json": case_todos_add_json,
+    "todos.load_sqlite": case_todos_load_sqlite,
+    "list.refresh": case_list_refresh,
+    "list.filter": case_list_filter,
+    "list.index_build": case_list_index_build,
+    "deadlines.scan": case_deadlines_scan,
+    "deadlines.due_sqlite": case_deadlines_due_sqlite,
+    "text.analyze": case_text_analyze,
+    "passwords.generate": case_passwords,
+    "catalog.parse": case_catalog_parse,
+    "catalog.refresh": case_catalog_refresh,
+}
+
+
+# ---------------------------
+# Running and comparing
+# ---------------------------
+def run_suite(scale="small", repeat=3, seed=0, data_dir=None, only=None, overrides=None):
+    """Run the selected cases; returns the result dict (see write_results)."""
+    params = dict(SCALES[scale], **(overrides or {}))
+    own_data = data_dir is None
+    data_dir = data_dir or tempfile.mkdtemp(prefix="wallye-bench-")
+    work = tempfile.mkdtemp(prefix="wallye-bench-work-")
+    results = {}
+    selected = {name: setup for name, setup in CASES.items()
+                if not only or any(name.startswith(prefix) for prefix in only)}
+    need = {key for name in selected for key in CASE_DATA[name.split(".")[0]]}
+    try:
+        paths = prepare_data(data_dir, params, seed, need)
+        from .todos import load_todos
+        ctx = {"params": params, "paths": paths, "work": work, "cleanup": [],
+               "todos": load_todos(paths["todos"]) if "todos" in need else []}
+        for name, setup in selected.items():
+            try:
+                run, items, unit = setup(ctx)
+            except ImportError as e:
+                # e.g. no tkinter: the GUI cases cannot even be imported
+                results[name] = {"skipped": str(e)}
+                print(f"{name:<22} saltato ({e})", file=sys.stderr)
+                continue
+            runs = []
+            for _ in range(repeat):
+                gc.collect()
+                start = time.perf_counter()
+                run()
+                runs.append(time.perf_counter() - start)
+            median = statistics.median(runs)
+            results[name] = {
+                "runs_s": runs,
+                "median_s": median,
+                "min_s": min(runs),
+                "items": items,
+                "unit": unit,
+                "rate": items / median if median else None,
+            }
+            print(format_case(name, results[name]), file=sys.stderr)
+        for close in ctx["cleanup"]:
+            close()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+        if own_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return {
+        "format": RESULTS_FORMAT,
+        "wallye": __version__,
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "scale": scale,
+        "params": params,
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def write_results(path, data):
+    atomic_write_json(path, data, indent=2)
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(base, new, tolerance=0.15):
+    """Per case: (name, base median, new median, ratio, regressed) for cases in both runs.
+
+    A case regresses when its median is more than `tolerance` slower.
+    Results made with different parameters are not comparable: ValueError.
+    """
+    if base.get("params") != new.get("params") or base.get("format") != new.get("format"):
+        raise ValueError("i due risultati hanno parametri diversi (scale/dimensioni): confronto non significativo")
+    rows = []
+    for name, r in new["results"].items():
+        b = base["results"].get(name)
+        if not b or "median_s" not in b or "median_s" not in r:
+            continue
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] else float("inf")
+        rows.append((name, b["median_s"], r["median_s"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def format_case(name, r):
+    if "skipped" in r:
+        return f"{name:<22} saltato"
+    rate = f"{r['rate']:14,.1f} {r['unit']}/s" if r["rate"] else ""
+    return f"{name:<22} {r['median_s'] * 1000:11.3f} ms  (min {r['min_s'] * 1000:.3f}){rate:>30}"
+
+
+def format_comparison(rows, tolerance):
+    lines = [f"{'caso':<22}{'prima ms':>12}{'dopo ms':>12}{'rapporto':>10}"]
+    for name, before, after, ratio, regressed in rows:
+        flag = f"  PEGGIORATO (> +{tolerance:.0%})" if regressed else ""
+        lines.append(f"{name:<22}{before * 1000:>12.3f}{after * 1000:>12.3f}{ratio:>9.2f}x{flag}")
+    return "\n".join(lines)
@@ -0,0 +1,190 @@
+"""Bulk import/export of tasks as CSV or NDJSON (one JSON object per line).
+
+Files are read and written one record at a time, so their size is never
+held twice in memory. Each row is validated (title, status, deadline via
+normalize_deadline, cached for absolute dates) and the valid ones reach the store in a
+single import_todos call, i.e. one journal write or one transaction.
+"""
+import csv
+import json
+import os
+import sys
+import time
+
+from .deadlines import normalize_deadline
+
+FIELDS = ("id", "title", "desc", "deadline", "status")
+STATUSES = ("pending", "done")
+MAX_REPORTED_ERRORS = 20
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".ndjson", ".jsonl"):
+        return "ndjson"
+    raise ValueError(f"formato non riconosciuto per {path!r}: usa .csv, .ndjson/.jsonl oppure --format")
+
+
+# ---------------------------
+# Reading
+# ---------------------------
+# Readers yield (line number, raw record); a record that cannot be decoded
+# comes through as a ValueError, so one bad line only costs that line.
+def read_csv(f):
+    """Records of a CSV file whose header has at least a `title` column."""
+    reader = csv.DictReader(f)
+    if not reader.fieldnames or "title" not in [n.strip().lower() for n in reader.fieldnames]:
+        raise ValueError("intestazione CSV senza la colonna 'title'")
+    for row in reader:
+        rec = {}
+        for key, value in row.items():
+            if key is None:
+                continue  # more cells than header columns
+            key = key.strip().lower()
+            if key == "extra":
+                # other fields of an exported task, kept as JSON in one column
+                if value:
+                    try:
+                        rec.update(json.loads(value))
+                    except ValueError:
+                        rec = ValueError("colonna 'extra' non è JSON valido")
+                        break
+            elif value is not None:
+                rec[key] = value
+        yield reader.line_num, rec
+
+
+def read_ndjson(f):
+    """One record per non-empty line."""
+    for lineno, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield lineno, json.loads(line)
+        except ValueError as e:
+            yield lineno, ValueError(f"JSON non valido: {e}")
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def validate_task(rec):
+    """Normalized task dict from a raw record; raises ValueError if it is not usable."""
+    if isinstance(rec, ValueError):
+        raise rec
+    if not isinstance(rec, dict):
+        raise ValueError("il record non è un oggetto")
+    title = str(rec.get("title") or "").strip()
+    if not title:
+        raise ValueError("titolo mancante")
+    status = str(rec.get("status") or "pending").strip().lower()
+    if status not in STATUSES:
+        raise ValueError(f"stato non valido: {status!r}")
+    deadline = normalize_deadline(str(rec.get("deadline") or ""))
+    if deadline is None:
+        raise ValueError(f"scadenza non valida: {rec.get('deadline')!r}")
+    task = {k: v for k, v in rec.items() if k not in FIELDS and v not in (None, "")}
+    task.update(title=title, desc=str(rec.get("desc") or ""), deadline=deadline, status=status)
+    if rec.get("id"):
+        task["id"] = str(rec["id"])
+    return task
+
+
+def import_file(store, path, fmt=None):
+    """Stream, validate and import a CSV/NDJSON file into an opened store.
+
+    Invalid rows are skipped and reported (the first MAX_REPORTED_ERRORS
+    of them); everything else is written in one batch. Returns a summary
+    dict with the counts and the rows/s throughput.
+    """
+    fmt = detect_format(path, fmt)
+    start = time.perf_counter()
+    tasks = []
+    errors = []
+    rows = skipped = 0
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for lineno, rec in READERS[fmt](f):
+            rows += 1
+            try:
+                tasks.append(validate_task(rec))
+            except ValueError as e:
+                skipped += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append((lineno, str(e)))
+    parsed = time.perf_counter()
+    added, updated = store.import_todos(tasks)
+    elapsed = time.perf_counter() - start
+    return {
+        "path": path,
+        "format": fmt,
+        "rows": rows,
+        "added": added,
+        "updated": updated,
+        "skipped": skipped,
+        "errors": errors,
+        "parse_seconds": parsed - start,
+        "seconds": elapsed,
+        "rows_per_s": rows / elapsed if elapsed else 0.0,
+    }
+
+
+# ---------------------------
+# Writing
+# ---------------------------
+def write_csv(tasks, out):
+    writer = csv.writer(out)
+    writer.writerow(FIELDS + ("extra",))
+    count = 0
+    for t in tasks:
+        extra = {k: v for k, v in t.items() if k not in FIELDS}
+        writer.writerow([t.get(k, "") for k in FIELDS] + [json.dumps(extra, ensure_ascii=False) if extra else ""])
+        count += 1
+    return count
+
+
+def write_ndjson(tasks, out):
+    count = 0
+    for t in tasks:
+        out.write(json.dumps(t, ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+WRITERS = {"csv": write_csv, "ndjson": write_ndjson}
+
+
+def export_file(tasks, path, fmt=None):
+    """Write tasks to path ("-" = stdout) as CSV or NDJSON; returns a summary dict."""
+    fmt = detect_format(path, fmt) if path != "-" or fmt else "ndjson"
+    start = time.perf_counter()
+    if path == "-":
+        count = WRITERS[fmt](tasks, sys.stdout)
+    else:
+        # large buffer: many small row writes, few syscalls
+        with open(path, "w", encoding="utf-8", newline="", buffering=1 << 20) as out:
+            count = WRITERS[fmt](tasks, out)
+    elapsed = time.perf_counter() - start
+    return {"path": path, "format": fmt, "rows": count, "seconds": elapsed,
+            "rows_per_s": count / elapsed if elapsed else 0.0}
+
+
+def format_import(result):
+    lines = [
+        f"Righe lette: {result['rows']} ({result['format']})",
+        f"Aggiunti: {result['added']}, aggiornati: {result['updated']}, scartati: {result['skipped']}",
+        f"Tempo: {result['seconds']:.2f} s ({result['rows_per_s']:,.0f} righe/s)",
+    ]
+    for lineno, msg in result["errors"]:
+        lines.append(f"  riga {lineno}: {msg}")
+    if result["skipped"] > len(result["errors"]):
+        lines.append(f"  ... altri {result['skipped'] - len(result['errors'])} errori")
+    return "\n".join(lines)
+
+
+def format_export(result):
+    return f"Esportati {result['rows']} task in {result['path']} ({result['format']}) in {result['seconds']:.2f} s ({result['rows_per_s']:,.0f} righe/s)"
@@ -0,0 +1,363 @@
+"""Command line: python -m wallye [gui|todo|analyze|corpus|genpass|audit|install|bench|bench-suite] ...
+
+Only the modules a subcommand needs are imported, so scripted use never
+pays for tkinter (or needs a display).
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+from .config import APP_TITLE, CORPUS_CACHE_FILE, DEADLINE_NOTICE_MINUTES, INSTALL_WORKERS
+
+
+def cmd_gui(args):
+    from .gui import main as gui_main
+    gui_main()
+
+
+def cmd_todo_list(args):
+    from .todos import open_todo_store, format_task_row
+    from .deadlines import parse_deadline
+    store = open_todo_store(args.backend)
+    todos = store.load()
+    before = None
+    if args.before:
+        before = parse_deadline(args.before)
+        if not before:
+            print(f"data non valida: {args.before!r}", file=sys.stderr)
+            store.close()
+            return 2
+    if args.search or before or args.sort != "inserimento":
+        from .search import TaskIndex
+        todos = TaskIndex(todos).query(args.search, args.status, before, args.sort)
+    elif args.status:
+        todos = [t for t in todos if t.get("status", "pending") == args.status]
+    for i, t in enumerate(todos):
+        print(format_task_row(i, t))
+    store.close()
+
+
+def cmd_todo_add(args):
+    from .todos import open_todo_store
+    from .deadlines import normalize_deadline
+    deadline = normalize_deadline(args.deadline)
+    if deadline is None:
+        print(f"scadenza non valida: {args.deadline!r} (formato YYYY-MM-DD HH:MM o 'domani 9:00')", file=sys.stderr)
+        return 2
+    store = open_todo_store(args.backend)
+    store.load()
+    t = store.add({"title": args.title, "desc": args.desc, "deadline": deadline, "status": "pending"})
+    store.close()
+    print(t["id"])
+
+
+def cmd_todo_due(args):
+    from .todos import open_todo_store
+    from .deadlines import parse_deadline
+    now = datetime.now()
+    if args.before:
+        end = parse_deadline(args.before)
+        if not end:
+            print(f"data non valida: {args.before!r}", file=sys.stderr)
+            return 2
+    else:
+        end = now + timedelta(minutes=args.within)
+    store = open_todo_store(args.backend)
+    store.load()
+    for t in store.due_between(now, end):
+        print(f"{t.get('deadline', '')}  {t.get('title', '')}  [{t['id']}]")
+    store.close()
+
+
+def cmd_todo_import(args):
+    from .todos import open_todo_store
+    from .bulk import import_file, format_import
+    store = open_todo_store(args.backend)
+    store.load()
+    try:
+        result = import_file(store, args.file, args.format)
+    except (OSError, ValueError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    print(format_import(result))
+    return 1 if result["skipped"] and args.strict else 0
+
+
+def cmd_todo_export(args):
+    from .todos import open_todo_store
+    from .bulk import export_file, format_export
+    store = open_todo_store(args.backend)
+    try:
+        result = export_file(store.load(), args.file, args.format)
+    except (OSError, ValueError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    if args.file != "-":
+        print(format_export(result))
+
+
+def cmd_analyze(args):
+    from .text import analyze_file, format_analysis
+    from .analysis import AnalysisJob
+    try:
+        if len(args.files) == 1:
+            print(format_analysis(analyze_file(args.files[0])))
+            return
+        job = AnalysisJob(paths=args.files, workers=args.jobs)
+    except OSError as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+    job.start()
+    job.wait()
+    if job.error is not None:
+        print(f"Errore: {job.error}", file=sys.stderr)
+        return 1
+    for p in args.files:
+        print(f"File: {p} ({job.per_file[p].words} parole)")
+    print()
+    print(format_analysis(job.result))
+
+
+def cmd_corpus(args):
+    from .corpus import CorpusJob, export_corpus, format_corpus
+    from .text import format_analysis
+    if not os.path.isdir(args.folder):
+        print(f"cartella non trovata: {args.folder}", file=sys.stderr)
+        return 2
+    extensions = tuple(e if e.startswith(".") else "." + e for e in args.ext.split(",")) if args.ext else None
+    kwargs = {"extensions": extensions} if extensions else {}
+    job = CorpusJob(args.folder, workers=args.jobs, top_k=args.top_k, cache_path=None if args.no_cache else args.cache,
+                    use_hash=args.hash, **kwargs).start()
+    try:
+        while not job.wait(0.5):
+            status = f"{job.scanned} file trovati" if job.scanning else f"{job.progress() * 100:5.1f}%"
+            print(f"\r{status:<24}", end="", file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+        print("\ninterrotto: i file già analizzati restano in cache", file=sys.stderr)
+        return 130
+    print("\r", end="", file=sys.stderr)
+    if job.error is not None:
+        print(f"Errore: {job.error}", file=sys.stderr)
+        return 1
+    print(format_corpus(job) + format_analysis(job.result, job.top_k or 10))
+    if args.output:
+        try:
+            export_corpus(job, args.output)
+        except OSError as e:
+            # the per-file results are still in the cache: a rerun with another -o is quick
+            print(f"Errore: esportazione non riuscita: {e}", file=sys.stderr)
+            return 2
+        print(f"\nRisultati salvati in {args.output}")
+    return 1 if job.errors else 0
+
+
+def cmd_genpass(args):
+    from .passwords import build_charset, write_passwords
+    charset = build_charset(not args.no_lower, not args.no_upper, not args.no_digits, not args.no_symbols)
+    if not charset:
+        print("serve almeno un tipo di carattere", file=sys.stderr)
+        return 2
+    if args.length < 1:
+        print(f"lunghezza non valida: {args.length} (almeno 1)", file=sys.stderr)
+        return 2
+    try:
+        if args.output:
+            with open(args.output, "w", encoding="ascii", newline="\n") as out:
+                write_passwords(out, args.count, args.length, charset)
+        else:
+            write_passwords(sys.stdout, args.count, args.length, charset)
+    except (OSError, ValueError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+
+
+def cmd_audit(args):
+    from .strength import audit_file, format_audit
+    try:
+        result = audit_file(args.file)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+    print(format_audit(result))
+
+
+def cmd_install(args):
+    from .releases import default_catalog
+    from .installer import InstallJob, format_install
+    catalog = default_catalog()
+    release = catalog.get(args.version)
+    if release is None:
+        print(f"versione sconosciuta: {args.version}", file=sys.stderr)
+        return 2
+    job = InstallJob(release, mirror=args.mirror, workers=args.jobs).start()
+    try:
+        while not job.wait(0.5):
+            print(f"\r{job.stage}: {job.progress() * 100:5.1f}%", end="", file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+        print("\ninterrotto: il download riprenderà dal punto raggiunto", file=sys.stderr)
+        return 130
+    print(file=sys.stderr)
+    if job.error is not None:
+        print(f"Errore: {job.error}", file=sys.stderr)
+        return 1
+    print(format_install(job.result))
+    try:
+        catalog.mark_installed(args.version)
+    except (OSError, KeyError) as e:
+        # installed and active already: only releases.json is behind
+        reason = f"{args.version} non è più in {catalog.path}" if isinstance(e, KeyError) else e
+        print(f"Installazione riuscita, ma il catalogo non è stato aggiornato: {reason}", file=sys.stderr)
+        return 1
+
+
+def cmd_bench(args):
+    from .bench import BENCHMARKS
+    if args.name not in BENCHMARKS:
+        print(f"benchmark sconosciuto: {args.name} (disponibili: {', '.join(BENCHMARKS)})", file=sys.stderr)
+        return 2
+    BENCHMARKS[args.name](*map(int, args.args))
+
+
+def cmd_bench_suite(args):
+    from .benchsuite import (SCALES, run_suite, write_results, load_results, compare_results,
+                             format_comparison)
+    overrides = {k: v for k, v in (("tasks", args.tasks), ("text_mb", args.text_mb), ("releases", args.releases)) if v}
+    only = args.only.split(",") if args.only else None
+    print(f"scala {args.scale}: {dict(SCALES[args.scale], **overrides)}", file=sys.stderr)
+    data = run_suite(args.scale, args.repeat, args.seed, args.data, only, overrides)
+    if args.output:
+        write_results(args.output, data)
+    if args.compare:
+        try:
+            rows = compare_results(load_results(args.compare), data, args.tolerance)
+        except (OSError, ValueError) as e:
+            print(f"Errore: {e}", file=sys.stderr)
+            return 2
+        print(format_comparison(rows, args.tolerance))
+        if any(regressed for *_rest, regressed in rows):
+            return 1
+    elif not args.output:
+        print(json.dumps(data, indent=2))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wallye", description=APP_TITLE)
+    parser.add_argument("--metrics", metavar="FILE", help="salva in FILE (JSON) i tempi delle operazioni alla fine")
+    parser.add_argument("--profile", metavar="FILE", help="profila il comando con cProfile + tracemalloc: statistiche in FILE, riepilogo su stderr")
+    sub = parser.add_subparsers(dest="command")
+
+    sub.add_parser("gui", help="apre l'interfaccia grafica (default)").set_defaults(func=cmd_gui)
+
+    todo = sub.add_parser("todo", help="gestione dei task")
+    todo.add_argument("--backend", choices=["json", "sqlite"], help="archivio dei task (default: WALLYE_TODO_BACKEND o json)")
+    todo_sub = todo.add_subparsers(dest="todo_command", required=True)
+    p = todo_sub.add_parser("list", help="elenca i task")
+    p.add_argument("--status", choices=["pending", "done"])
+    p.add_argument("--search", default="", metavar="TESTO", help="parole nel titolo o nella descrizione")
+    p.add_argument("--before", metavar="DATA", help="solo task con scadenza entro questa data")
+    p.add_argument("--sort", choices=["inserimento", "scadenza", "titolo"], default="inserimento")
+    p.set_defaults(func=cmd_todo_list)
+    p = todo_sub.add_parser("add", help="aggiunge un task e ne stampa l'id")
+    p.add_argument("title")
+    p.add_argument("--desc", default="")
+    p.add_argument("--deadline", default="", help="YYYY-MM-DD HH:MM, ISO 8601 o 'domani 9:00'")
+    p.set_defaults(func=cmd_todo_add)
+    p = todo_sub.add_parser("due", help="task pending in scadenza")
+    p.add_argument("--within", type=int, default=DEADLINE_NOTICE_MINUTES, metavar="MIN", help="entro MIN minuti da adesso")
+    p.add_argument("--before", metavar="DATA", help="prima di questa data (YYYY-MM-DD HH:MM)")
+    p.set_defaults(func=cmd_todo_due)
+    p = todo_sub.add_parser("import", help="importa task da CSV o NDJSON (una riga per task)")
+    p.add_argument("file")
+    p.add_argument("--format", choices=["csv", "ndjson"], help="default: dall'estensione del file")
+    p.add_argument("--strict", action="store_true", help="esce con errore se alcune righe sono state scartate")
+    p.set_defaults(func=cmd_todo_import)
+    p = todo_sub.add_parser("export", help="esporta i task in CSV o NDJSON")
+    p.add_argument("file", help="file di destinazione, - per stdout (NDJSON)")
+    p.add_argument("--format", choices=["csv", "ndjson"], help="default: dall'estensione del file")
+    p.set_defaults(func=cmd_todo_export)
+
+    p = sub.add_parser("analyze", help="analizza uno o più file di testo")
+    p.add_argument("files", nargs="+", metavar="FILE")
+    p.add_argument("-j", "--jobs", type=int, help="processi in parallelo (default: numero di core)")
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser("corpus", help="analizza tutti i file di testo di una cartella (con cache per file)")
+    p.add_argument("folder")
+    p.add_argument("-j", "--jobs", type=int, help="processi in parallelo (default: numero di core)")
+    p.add_argument("--ext", help="estensioni da includere, separate da virgola (default: txt,md,csv,log,py)")
+    p.add_argument("--top-k", type=int, metavar="K", help="frequenze approssimate delle K parole più comuni a memoria limitata (count-min sketch)")
+    p.add_argument("--cache", default=CORPUS_CACHE_FILE, metavar="FILE", help="cache dei risultati per file (default ~/.wallye_corpus_cache.db)")
+    p.add_argument("--no-cache", action="store_true", help="rianalizza tutto senza leggere né scrivere la cache")
+    p.add_argument("--hash", action="store_true", help="riconosce i file anche dal contenuto (SHA-256), non solo da data e dimensione")
+    p.add_argument("-o", "--output", metavar="FILE", help="esporta totale e risultati per file (.json) o righe per file (.csv)")
+    p.set_defaults(func=cmd_corpus)
+
+    p = sub.add_parser("genpass", help="genera password in blocco")
+    p.add_argument("-n", "--count", type=int, default=1)
+    p.add_argument("--length", type=int, default=16, help="lunghezza delle password (default 16)")
+    p.add_argument("--no-lower", action="store_true", help="escludi le minuscole")
+    p.add_argument("--no-upper", action="store_true", help="escludi le maiuscole")
+    p.add_argument("--no-digits", action="store_true", help="escludi le cifre")
+    p.add_argument("--no-symbols", action="store_true", help="escludi i simboli")
+    p.add_argument("-o", "--output", help="file di destinazione (default: stdout)")
+    p.set_defaults(func=cmd_genpass)
+
+    p = sub.add_parser("audit", help="valuta un file di password (una per riga)")
+    p.add_argument("file")
+    p.set_defaults(func=cmd_audit)
+
+    p = sub.add_parser("install", help="scarica, verifica e installa una release del catalogo")
+    p.add_argument("version")
+    p.add_argument("--mirror", help="cartella o URL base per gli artefatti (default: WALLYE_RELEASE_MIRROR)")
+    p.add_argument("-j", "--jobs", type=int, default=INSTALL_WORKERS, help=f"download paralleli (default {INSTALL_WORKERS})")
+    p.set_defaults(func=cmd_install)
+
+    p = sub.add_parser("bench", help="esegue un benchmark")
+    p.add_argument("name")
+    p.add_argument("args", nargs="*", help="parametri numerici del benchmark")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("bench-suite", help="suite di benchmark con dati sintetici, risultati in JSON confrontabili")
+    p.add_argument("--scale", choices=["small", "medium", "large", "huge"], default="small",
+                   help="dimensione dei dati (small: 1k task, 1 MB di testo; huge: 1M task, 1 GB)")
+    p.add_argument("--tasks", type=int, help="numero di task (sostituisce quello della scala)")
+    p.add_argument("--text-mb", type=int, help="MB di testo da analizzare")
+    p.add_argument("--releases", type=int, help="release nel catalogo")
+    p.add_argument("--repeat", type=int, default=3, help="ripetizioni per caso (default 3, si usa la mediana)")
+    p.add_argument("--seed", type=int, default=0, help="seme dei generatori (default 0)")
+    p.add_argument("--data", metavar="DIR", help="cartella dei dati generati, riusati ai lanci successivi (default: temporanea)")
+    p.add_argument("--only", metavar="CASI", help="solo i casi con questi prefissi, separati da virgola (es. todos,text)")
+    p.add_argument("-o", "--output", metavar="FILE", help="salva i risultati in FILE (JSON)")
+    p.add_argument("--compare", metavar="FILE", help="confronta con un risultato precedente; esce con 1 se un caso peggiora")
+    p.add_argument("--tolerance", type=float, default=0.15, help="rallentamento tollerato nel confronto (default 0.15 = 15%%)")
+    p.set_defaults(func=cmd_bench_suite)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    func = getattr(args, "func", cmd_gui)
+    capture = None
+    if args.profile:
+        from .metrics import Capture
+        capture = Capture()
+        capture.start()
+    try:
+        code = func(args) or 0
+    finally:
+        if capture is not None:
+            print(capture.stop(profile_path=args.profile), file=sys.stderr)
+        if args.metrics:
+            from .metrics import dump_json
+            dump_json(args.metrics)
+    sys.exit(code)
@@ -0,0 +1,44 @@
+"""Paths and tunables shared by the GUI and the command line."""
+import os
+
+APP_TITLE = "Wallye - Utility App v1.0"
+TODO_FILE = "todos.json"
+TODO_JOURNAL_SUFFIX = ".journal"  # append-only log next to TODO_FILE (todos.json.journal)
+TODO_COMPACT_EVERY = 500  # journal records before folding them into a new snapshot
+TODO_BACKEND = os.environ.get("WALLYE_TODO_BACKEND", "json")  # "json" (journal) oppure "sqlite"
+TODO_DB_FILE = "todos.db"
+TODO_DB_PAGE = 200  # rows fetched at a time by the lazy SQLite task list
+DEADLINE_NOTICE_MINUTES = 10  # avvisa se la scadenza è entro questo numero di minuti
+NOTIFY_MIN_INTERVAL_MS = 5000  # al massimo un riepilogo di scadenze ogni tanti millisecondi
+NOTIFIED_FILE = "notified.json"  # avvisi già mostrati (id task -> scadenza), non ripetuti al riavvio
+NOTIFIED_KEEP_HOURS = 24  # avvisi di scadenze passate da più di tante ore vengono dimenticati
+DEADLINE_CACHE_SIZE = 1 << 16  # distinct deadline strings kept by the parse_deadline cache
+ANALYSIS_CHUNK_CHARS = 1 << 20  # characters read per chunk when analyzing files
+SYLLABLE_CACHE_SIZE = 1 << 16  # distinct words kept by the estimate_syllables memo
+CORPUS_EXTENSIONS = (".txt", ".md", ".csv", ".log", ".py")  # file analizzati in modalità cartella
+CORPUS_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".wallye_corpus_cache.db")  # risultati per file, riusati se il file non cambia
+CORPUS_SKETCH_WIDTH = 1 << 16  # contatori per riga del count-min sketch (top-k a memoria limitata)
+CORPUS_SKETCH_DEPTH = 4  # righe del count-min sketch
+LIVE_ANALYSIS_DELAY_MS = 300  # pausa di digitazione prima di aggiornare l'analisi live
+SEARCH_DELAY_MS = 150  # pausa di digitazione prima di rifare la ricerca nei task
+WATCH_INTERVAL_MS = int(os.environ.get("WALLYE_WATCH_INTERVAL_MS", "1000"))  # controllo modifiche esterne ai file, 0 = disattivato
+
+# Private releases
+PRIVATE_RELEASE_HOME = os.path.join(os.path.expanduser("~"), ".wallye_releases")
+PRIVATE_RELEASES_FILE = os.path.join(PRIVATE_RELEASE_HOME, "releases.json")
+PRIVATE_RELEASES_DIR = os.path.join(PRIVATE_RELEASE_HOME, "releases")
+RELEASE_NOTES_CACHE = 64  # RELEASE_<ver>.md bodies kept in memory
+
+# Release installer
+RELEASE_MIRROR = os.environ.get("WALLYE_RELEASE_MIRROR", "")  # cartella o URL base per gli artefatti con percorso relativo
+PRIVATE_STAGING_DIR = os.path.join(PRIVATE_RELEASE_HOME, "staging")  # download parziali (ripresi al tentativo successivo)
+PRIVATE_VERSIONS_DIR = os.path.join(PRIVATE_RELEASE_HOME, "versions")  # una cartella per versione installata
+PRIVATE_CURRENT_FILE = os.path.join(PRIVATE_RELEASE_HOME, "current.json")  # versione attiva, riscritto in modo atomico
+INSTALL_WORKERS = 4  # download paralleli per artefatto
+INSTALL_CHUNK_BYTES = 4 << 20  # byte per richiesta Range
+INSTALL_TIMEOUT = 30  # secondi per connessione/lettura
+
+# Diagnostics
+METRICS_ENABLED = os.environ.get("WALLYE_METRICS", "1") != "0"  # timer sulle operazioni principali, 0 = disattivati
+METRICS_SAMPLES = 4096  # ultime durate tenute per operazione (per p50/p95/p99)
+TRACEMALLOC_FRAMES = 1  # frame per allocazione registrati durante la profilazione
@@ -0,0 +1,506 @@
+"""Corpus mode: analyze every text file in a folder, reusing earlier results.
+
+CorpusJob lists the folder and looks each file up in a CorpusCache, a
+SQLite file keyed by absolute path + mtime + size (optionally by the
+SHA-256 of the content, so a copied or touched file is not redone). Only
+the files that are new or changed go to the process pool (the same
+worker as AnalysisJob). Each one is stored back as soon as it is done,
+so a cancelled run keeps its progress.
+
+Per-file results are merged one file at a time. Word frequencies go into
+an exact Counter, or, with top_k, into HeavyHitters, whose memory does
+not grow with the vocabulary of the corpus.
+"""
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .analysis import _analysis_worker, _analysis_worker_init
+from .config import CORPUS_CACHE_FILE, CORPUS_EXTENSIONS, CORPUS_SKETCH_DEPTH, CORPUS_SKETCH_WIDTH
+from .metrics import timed
+from .text import flesch_score
+
+_PRIME = (1 << 61) - 1  # Mersenne prime for the sketch's row hashes
+CACHE_VERSION = 1  # bump when the tokenizer changes what a file's stats are
+
+
+def scan_folder(folder, extensions=CORPUS_EXTENSIONS, on_found=None):
+    """Files under folder (recursively) with one of the extensions, sorted by path.
+
+    on_found(n), if given, is called after each directory with the number
+    of files found so far.
+    """
+    exts = tuple(e.lower() for e in extensions)
+    found = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in filenames:
+            if name.lower().endswith(exts):
+                found.append(os.path.abspath(os.path.join(dirpath, name)))
+        if on_found is not None:
+            on_found(len(found))
+    found.sort()
+    return found
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ---------------------------
+# Word frequencies
+# ---------------------------
+class HeavyHitters:
+    """Approximate top-k word counts in bounded memory.
+
+    A count-min sketch (`depth` rows of `width` counters) estimates the
+    count of any word. It never undercounts, and with probability
+    1 - exp(-depth) it overcounts by at most e/width of the total. Next to
+    it, only the words with the largest estimates are kept as candidates.
+    When the candidates reach twice `capacity`, they are cut back to
+    `capacity`.
+    """
+
+    def __init__(self, k, width=CORPUS_SKETCH_WIDTH, depth=CORPUS_SKETCH_DEPTH, capacity=None):
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity or max(8 * k, 256)
+        self.rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+        # one (a, b) per row: ((a*h + b) mod p) mod width, pairwise independent
+        # rows; hash((row, word)) is not, its low bits collide in every row at once
+        rng = random.Random(depth * 1000003 + width)
+        self._ab = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(depth)]
+        self.total = 0
+        self.candidates = {}  # word -> estimate when last seen
+        self._threshold = 0  # smallest estimate kept by the last prune
+
+    def estimate(self, word):
+        h = hash(word)
+        return min(row[(a * h + b) % _PRIME % self.width] for (a, b), row in zip(self._ab, self.rows))
+
+    def add(self, word, n=1):
+        width = self.width
+        h = hash(word)
+        est = None
+        for (a, b), row in zip(self._ab, self.rows):
+            i = (a * h + b) % _PRIME % width
+            row[i] += n
+            if est is None or row[i] < est:
+                est = row[i]
+        self.total += n
+        if word in self.candidates or est > self._threshold:
+            self.candidates[word] = est
+            if len(self.candidates) >= 2 * self.capacity:
+                self._prune()
+
+    def update(self, counts):
+        for word, n in counts.items():
+            self.add(word, n)
+
+    def _prune(self):
+        kept = sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)[:self.capacity]
+        self.candidates = dict(kept)
+        self._threshold = kept[-1][1] if kept else 0
+
+    def most_common(self, n=None):
+        # fresh estimates: a candidate may have grown after it was last seen
+        ranked = sorted(((w, self.estimate(w)) for w in self.candidates), key=lambda item: (-item[1], item[0]))
+        return ranked[:n or self.k]
+
+    def memory_bytes(self):
+        return self.depth * self.width * 8 + len(self.candidates) * 100
+
+
+class CorpusStats:
+    """Totals of many files; frequencies exact (Counter) or top-k (HeavyHitters).
+
+    Has the same chars/words/sentences/most_common()/readability() surface
+    as TextStats, so format_analysis() works on it.
+    """
+
+    def __init__(self, top_k=None):
+        self.files = 0
+        self.chars = 0
+        self.words = 0
+        self.sentences = 0
+        self.syllables = 0
+        self.top_k = top_k
+        self.freq = HeavyHitters(top_k) if top_k else Counter()
+
+    def add(self, record, freq):
+        self.files += 1
+        self.chars += record["chars"]
+        self.words += record["words"]
+        self.sentences += record["sentences"]
+        self.syllables += record["syllables"]
+        self.freq.update(freq)
+
+    def most_common(self, n=10):
+        return self.freq.most_common(n)
+
+    def readability(self):
+        return flesch_score(self.words, self.sentences, self.syllables)
+
+    def summary(self, n=50):
+        return {
+            "files": self.files,
+            "chars": self.chars,
+            "words": self.words,
+            "sentences": self.sentences,
+            "syllables": self.syllables,
+            "readability": self.readability(),
+            "top_mode": f"heavy hitters (k={self.top_k})" if self.top_k else "esatto",
+            "vocabulary": None if self.top_k else len(self.freq),
+            "top_words": [[w, c] for w, c in self.most_common(n)],
+        }
+
+
+def make_record(path, sig, stats):
+    """Per-file result (everything but the full frequency table)."""
+    syllables = stats.syllables
+    return {
+        "path": path,
+        "size": sig[1],
+        "mtime_ns": sig[0],
+        "chars": stats.chars,
+        "words": stats.words,
+        "sentences": stats.sentences,
+        "syllables": syllables,
+        "readability": flesch_score(stats.words, stats.sentences, syllables),
+        "top_words": [[w, c] for w, c in stats.most_common(10)],
+    }
+
+
+# ---------------------------
+# Cache
+# ---------------------------
+class CorpusCache:
+    """Per-file results on disk (SQLite), keyed by path + mtime + size, or content hash.
+
+    One connection per instance: open it in the thread that uses it.
+    """
+
+    COLUMNS = ("chars", "words", "sentences", "syllables", "readability")
+
+    def __init__(self, path=CORPUS_CACHE_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            # results of another analyzer version: start over
+            with self.conn:
+                self.conn.execute("DROP TABLE IF EXISTS files")
+                self.conn.execute(f"PRAGMA user_version={CACHE_VERSION}")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT,"
+                " chars INTEGER, words INTEGER, sentences INTEGER, syllables INTEGER,"
+                " readability REAL, top_words TEXT, freq BLOB)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_files_sha256 ON files(sha256)")
+
+    def _row_to_result(self, row, path, sig):
+        record = dict(zip(self.COLUMNS, row[:5]))
+        record.update(path=path, size=sig[1], mtime_ns=sig[0], top_words=json.loads(row[5]))
+        return record, json.loads(zlib.decompress(row[6]))
+
+    def lookup(self, path, sig):
+        """(record, freq, sha256) for a file unchanged since it was stored, else None.
+
+        Matches on path + (mtime, size). sha256 is None when the row was
+        stored without one (see set_hash).
+        """
+        cols = ", ".join(self.COLUMNS) + ", top_words, freq, sha256"
+        row = self.conn.execute(f"SELECT {cols} FROM files WHERE path=? AND mtime_ns=? AND size=?", (path, sig[0], sig[1])).fetchone()
+        if row is None:
+            return None
+        return self._row_to_result(row, path, sig) + (row[7],)
+
+    def lookup_content(self, path, sig, sha256):
+        """(record, freq) for content already seen under another path or timestamp, else None.
+
+        A match is stored under `path` too, so the next run finds it by path.
+        """
+        cols = ", ".join(self.COLUMNS) + ", top_words, freq"
+        # the size must agree as well: a hash kept from an older version of a file is never used
+        row = self.conn.execute(f"SELECT {cols} FROM files WHERE sha256=? AND size=? LIMIT 1", (sha256, sig[1])).fetchone()
+        if row is None:
+            return None
+        result = self._row_to_result(row, path, sig)
+        self.store(result[0], result[1], sha256)
+        return result
+
+    def set_hash(self, path, sha256):
+        # fill in the hash of a row stored by a run without it
+        with self.conn:
+            self.conn.execute("UPDATE files SET sha256=? WHERE path=?", (sha256, path))
+
+    def store(self, record, freq, sha256=None):
+        blob = zlib.compress(json.dumps(freq, ensure_ascii=False).encode("utf-8"))
+        with self.conn:
+            # a run without hashes keeps the hash a run with them already stored
+            self.conn.execute(
+                "INSERT INTO files VALUES (?,?,?,?,?,?,?,?,?,?,?) ON CONFLICT(path) DO UPDATE SET"
+                " mtime_ns=excluded.mtime_ns, size=excluded.size, sha256=COALESCE(excluded.sha256, sha256),"
+                " chars=excluded.chars, words=excluded.words, sentences=excluded.sentences,"
+                " syllables=excluded.syllables, readability=excluded.readability,"
+                " top_words=excluded.top_words, freq=excluded.freq",
+                (record["path"], record["mtime_ns"], record["size"], sha256)
+                + tuple(record[c] for c in self.COLUMNS)
+                + (json.dumps(record["top_words"], ensure_ascii=False), blob),
+            )
+
+    def prune(self, folder, keep):
+        """Forget files under folder that are no longer in `keep`."""
+        prefix = os.path.join(os.path.abspath(folder), "")
+        keep = set(keep)
+        stale = [(p,) for (p,) in self.conn.execute("SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))
+                 if p not in keep]
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path=?", stale)
+        return len(stale)
+
+    def close(self):
+        self.conn.close()
+
+
+# ---------------------------
+# Job
+# ---------------------------
+class CorpusJob:
+    """Folder analysis off the Tk thread, with the AnalysisJob interface.
+
+    `result` is a CorpusStats, `per_file` maps path -> record (see
+    make_record, plus "cached"). `errors` lists (path, message) for the
+    files that could not be read. cache_path=None disables the cache.
+    The folder is listed in the worker thread too: until that is done,
+    `scanning` is True and `scanned` counts the files found so far.
+    """
+
+    def __init__(self, folder, workers=None, top_k=None, cache_path=CORPUS_CACHE_FILE, use_hash=False,
+                 extensions=CORPUS_EXTENSIONS):
+        self.folder = os.path.abspath(folder)
+        self.extensions = extensions
+        self.paths = []
+        self.scanning = True
+        self.scanned = 0
+        self.workers = workers or os.cpu_count() or 1
+        self.top_k = top_k
+        self.cache_path = cache_path
+        self.use_hash = use_hash
+        self.result = None
+        self.per_file = {}
+        self.errors = []
+        self.analyzed = 0
+        self.cached = 0
+        self.seconds = None
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self._processed = 0
+        self._total = 0
+        self._cancel = multiprocessing.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    def cancel(self):
+        self.cancelled = True
+        self._cancel.set()
+
+    def progress(self):
+        # bytes of the files that actually need analyzing
+        if not self._total:
+            return 1.0 if self.done else 0.0
+        return min(1.0, self._processed / self._total)
+
+    def _run(self):
+        start = time.perf_counter()
+        cache = None
+        try:
+            self.paths = scan_folder(self.folder, self.extensions, on_found=self._found)
+            self.scanning = False
+            if self.cache_path:
+                cache = CorpusCache(self.cache_path)
+            self.result = self._run_corpus(cache)
+        except Exception as e:
+            self.error = e
+        finally:
+            if cache is not None:
+                cache.close()
+        if self.cancelled:
+            self.result = None
+        self.scanning = False
+        self.seconds = time.perf_counter() - start
+        self.done = True
+
+    def _found(self, n):
+        self.scanned = n
+
+    @timed("analyze_corpus")
+    def _run_corpus(self, cache):
+        total = CorpusStats(self.top_k)
+        todo = []  # (path, sig, sha256)
+        for path in self.paths:
+            sha = None
+            try:
+                st = os.stat(path)
+                sig = (st.st_mtime_ns, st.st_size)
+                hit = cache.lookup(path, sig) if cache is not None else None
+                # the content is only read when path + mtime + size say nothing
+                if hit is not None:
+                    if self.use_hash and hit[2] is None:
+                        cache.set_hash(path, file_sha256(path))
+                elif self.use_hash:
+                    sha = file_sha256(path)
+                    if cache is not None:
+                        hit = cache.lookup_content(path, sig, sha)
+            except OSError as e:
+                self.errors.append((path, str(e)))
+                continue
+            if hit is None:
+                todo.append((path, sig, sha))
+                continue
+            record, freq = hit[:2]
+            record["cached"] = True
+            self.per_file[path] = record
+            total.add(record, freq)
+            self.cached += 1
+        self._total = sum(sig[1] for _p, sig, _sha in todo)
+
+        def finished(path, sig, sha, stats):
+            record = make_record(path, sig, stats)
+            if cache is not None:
+                cache.store(record, stats.freq, sha)
+            record["cached"] = False
+            self.per_file[path] = record
+            total.add(record, stats.freq)
+            self.analyzed += 1
+
+        if len(todo) == 1 or self.workers == 1:
+            # no point paying for processes
+            for path, sig, sha in todo:
+                if self._cancel.is_set():
+                    return None
+                try:
+                    stats = _analysis_worker(path)
+                except OSError as e:
+                    self.errors.append((path, str(e)))
+                    continue
+                self._processed += sig[1]
+                finished(path, sig, sha, stats)
+        elif todo:
+            if not self._run_pool(todo, finished):
+                return None
+        if cache is not None and not self._cancel.is_set():
+            cache.prune(self.folder, self.paths)
+        # per_file in path order, whatever order the pool finished in
+        self.per_file = {p: self.per_file[p] for p in self.paths if p in self.per_file}
+        return total
+
+    def _run_pool(self, todo, finished):
+        progress = multiprocessing.Queue()
+        workers = min(self.workers, len(todo))
+        with ProcessPoolExecutor(workers, initializer=_analysis_worker_init, initargs=(self._cancel, progress)) as pool:
+            futures = {pool.submit(_analysis_worker, item[0]): item for item in todo}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.1)
+                self._drain(progress)
+                if self._cancel.is_set():
+                    for fut in pending:
+                        fut.cancel()
+                for fut in done:
+                    if fut.cancelled():
+                        continue
+                    path, sig, sha = futures[fut]
+                    try:
+                        stats = fut.result()
+                    except OSError as e:
+                        self.errors.append((path, str(e)))
+                        continue
+                    if stats is not None:
+                        finished(path, sig, sha, stats)
+        self._drain(progress)
+        return not self._cancel.is_set()
+
+    def _drain(self, progress):
+        try:
+            while True:
+                self._processed += progress.get_nowait()
+        except queue.Empty:
+            pass
+
+
+# ---------------------------
+# Export
+# ---------------------------
+def export_corpus(job, path, fmt=None):
+    """Aggregate + per-file results of a finished CorpusJob as JSON, or per-file rows as CSV."""
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "json")
+    files = [job.per_file[p] for p in job.paths if p in job.per_file]
+    if fmt == "json":
+        data = {
+            "folder": job.folder,
+            "aggregate": job.result.summary(job.top_k or 50),
+            "analyzed": job.analyzed,
+            "cached": job.cached,
+            "errors": [{"path": p, "error": msg} for p, msg in job.errors],
+            "files": files,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False, indent=2))
+        return len(files)
+    cols = ("path", "size", "chars", "words", "sentences", "syllables", "readability", "cached")
+    agg = job.result.summary(job.top_k or 10)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(cols + ("top_words",))
+        for r in files:
+            writer.writerow([r.get(c, "") for c in cols] + [" ".join(f"{w}:{c}" for w, c in r["top_words"])])
+        # last row: the whole corpus
+        writer.writerow(["TOTALE", sum(r["size"] for r in files)] + [agg[c] for c in cols[2:7]] + [""]
+                        + [" ".join(f"{w}:{c}" for w, c in agg["top_words"])])
+    return len(files)
+
+
+def format_corpus(job, max_files=20):
+    """Header for format_analysis: files, cache hits, timing, the largest files."""
+    lines = [
+        f"Cartella: {job.folder}",
+        f"File: {len(job.per_file)} ({job.analyzed} analizzati, {job.cached} dalla cache, {len(job.errors)} errori) in {job.seconds:.2f} s",
+    ]
+    if job.top_k:
+        lines.append(f"Frequenze: top {job.top_k} approssimate (count-min sketch, {job.result.freq.memory_bytes() / 1e6:.1f} MB)")
+    largest = sorted(job.per_file.values(), key=lambda r: r["words"], reverse=True)[:max_files]
+    for r in largest:
+        lines.append(f"  {os.path.relpath(r['path'], job.folder)}: {r['words']} parole{' (cache)' if r['cached'] else ''}")
+    if len(job.per_file) > max_files:
+        lines.append(f"  ... altri {len(job.per_file) - max_files} file")
+    for p, msg in job.errors[:5]:
+        lines.append(f"  errore {os.path.relpath(p, job.folder)}: {msg}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,245 @@
+"""Deadline parsing and the deadline notice scheduler."""
+import heapq
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from .config import DEADLINE_NOTICE_MINUTES, DEADLINE_CACHE_SIZE
+from .metrics import incr, timed
+
+# ---------------------------
+# Parsing
+# ---------------------------
+# Absolute formats: parser(text) -> datetime or None. Their results only
+# depend on the text, so they share the LRU cache keyed by the raw string.
+DEADLINE_FORMATS = []
+# Relative formats: parser(text, now) -> datetime or None; never cached.
+RELATIVE_DEADLINE_FORMATS = []
+
+
+def register_deadline_format(name, parser, relative=False):
+    """Add a parser tried after the built-in ones (see DEADLINE_FORMATS)."""
+    (RELATIVE_DEADLINE_FORMATS if relative else DEADLINE_FORMATS).append((name, parser))
+    _parse_absolute.cache_clear()
+
+
+def parse_deadline(text, now=None):
+    """Deadline text -> naive local datetime, or None if no format matches.
+
+    "YYYY-MM-DD" and "YYYY-MM-DD HH:MM" take a fixed-width fast path (no strptime);
+    other absolute formats go through the registry. Both are cached per
+    raw string. Relative forms ("domani 9:00") are resolved against `now`.
+    """
+    dt = _parse_absolute(text)
+    if dt is None and RELATIVE_DEADLINE_FORMATS:
+        text = text.strip().lower()
+        if text:
+            now = now or datetime.now()
+            for _name, parser in RELATIVE_DEADLINE_FORMATS:
+                dt = parser(text, now)
+                if dt is not None:
+                    break
+    return dt
+
+
+@lru_cache(maxsize=DEADLINE_CACHE_SIZE)
+def _parse_absolute(text):
+    text = text.strip()
+    dt = _parse_fixed(text)
+    if dt is not None:
+        return dt
+    if not text:
+        return None
+    for _name, parser in DEADLINE_FORMATS:
+        dt = parser(text)
+        if dt is not None:
+            return dt
+    return None
+
+
+_FIXED_RE = re.compile(r"(\d{4})-(\d\d)-(\d\d)(?: (\d\d):(\d\d))?", re.ASCII)
+
+
+def _parse_fixed(text):
+    # one anchored regex + int() instead of strptime (format parsing, locale
+    # lookups and an exception per failed format)
+    m = _FIXED_RE.fullmatch(text)
+    if m is None:
+        return None
+    y, mo, d, h, mi = m.groups()
+    try:
+        return datetime(int(y), int(mo), int(d), int(h or 0), int(mi or 0))
+    except ValueError:
+        return None  # e.g. month 13, February 30
+
+
+def _parse_iso8601(text):
+    # 2024-05-10T09:00:00, with optional fraction and Z/+02:00; aware times become local
+    if "T" not in text and "t" not in text:
+        return None
+    if text[-1:] in "Zz":
+        text = text[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(text.replace("t", "T"))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def _parse_strptime(text):
+    # what parse_deadline always accepted, e.g. unpadded "2024-5-1 9:00"
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+_RELATIVE_DAYS = {"oggi": 0, "today": 0, "domani": 1, "tomorrow": 1, "dopodomani": 2}
+
+
+def _parse_relative_day(text, now):
+    # "domani", "oggi 18:30", "tomorrow 9:00", "dopodomani 9"; without a time: 09:00
+    word, _, clock = text.partition(" ")
+    days = _RELATIVE_DAYS.get(word)
+    if days is None:
+        return None
+    clock = clock.strip()
+    hour, minute = 9, 0
+    if clock:
+        h, _, m = clock.partition(":")
+        if not (h.isdigit() and (not m or m.isdigit())):
+            return None
+        hour, minute = int(h), int(m or 0)
+        if hour > 23 or minute > 59:
+            return None
+    day = now + timedelta(days=days)
+    return day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+
+register_deadline_format("iso8601", _parse_iso8601)
+register_deadline_format("strptime", _parse_strptime)
+register_deadline_format("giorno relativo", _parse_relative_day, relative=True)
+
+
+def normalize_deadline(text, now=None):
+    """Text to store for a deadline: relative forms are pinned to a date, the rest is kept.
+
+    Returns None if the text is not a valid deadline ("" stays "").
+    """
+    text = (text or "").strip()
+    if not text:
+        return ""
+    if _parse_absolute(text) is not None:
+        return text
+    dt = parse_deadline(text, now)
+    return deadline_to_str(dt) if dt else None
+
+
+def deadline_to_str(dt):
+    if not dt:
+        return ""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+class DeadlineScheduler:
+    """Fires a notice DEADLINE_NOTICE_MINUTES before each pending deadline.
+
+    Pending deadlines sit in a min-heap ordered by notice time, with the
+    parsed datetime cached per task, and a single `root.after` timer is
+    armed for the earliest one. Add/edit/remove only push a new heap entry
+    (O(log n)); superseded entries are skipped lazily when they surface.
+    """
+
+    MAX_SLEEP_MS = 15 * 60 * 1000  # re-check at least this often (clock changes, suspend)
+
+    def __init__(self, root, notify, notice_minutes=DEADLINE_NOTICE_MINUTES, notified=None):
+        self.root = root
+        self.notify = notify  # called once per tick with all the tasks that just entered the notice window
+        self.notice = timedelta(minutes=notice_minutes)
+        self._heap = []
+        self._entries = {}  # task id -> current heap entry
+        self._seq = 0
+        self._timer = None
+        # (task id, deadline text) pairs already notified: a set, or a
+        # NotifiedStore to remember them across restarts
+        self.notified = set() if notified is None else notified
+
+    def _entry(self, task):
+        if task.get("status", "pending") == "done":
+            return None
+        dl_text = task.get("deadline") or ""
+        dl = parse_deadline(dl_text)
+        if not dl or (task["id"], dl_text) in self.notified:
+            return None
+        self._seq += 1
+        return [dl - self.notice, self._seq, dl, dl_text, task]
+
+    def load(self, tasks):
+        # bulk build: O(n) heapify instead of n pushes
+        self._entries = {}
+        for t in tasks:
+            entry = self._entry(t)
+            if entry:
+                self._entries[t["id"]] = entry
+        self._heap = list(self._entries.values())
+        heapq.heapify(self._heap)
+        self._rearm()
+
+    def schedule(self, task):
+        """(Re)schedule a task after it was added or edited."""
+        entry = self._entry(task)
+        if entry:
+            self._entries[task["id"]] = entry
+            heapq.heappush(self._heap, entry)
+        else:
+            self._entries.pop(task["id"], None)
+        self._rearm()
+
+    def unschedule(self, task):
+        if self._entries.pop(task["id"], None) is not None:
+            self._rearm()
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and self._entries.get(heap[0][4]["id"]) is not heap[0]:
+            heapq.heappop(heap)
+
+    def _rearm(self):
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+        self._drop_stale()
+        if not self._heap:
+            return
+        delay = (self._heap[0][0] - datetime.now()).total_seconds() * 1000
+        delay = int(min(max(delay, 0), self.MAX_SLEEP_MS))
+        self._timer = self.root.after(delay, self.check)
+
+    @timed("check_deadlines")
+    def check(self):
+        self._timer = None
+        now = datetime.now()
+        due = []
+        pairs = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            _notice_at, _seq, dl, dl_text, task = entry
+            if self._entries.get(task["id"]) is not entry:
+                continue
+            del self._entries[task["id"]]
+            if dl < now:
+                # started after the deadline had already passed: nothing to announce
+                continue
+            due.append(task)
+            pairs.append((task["id"], dl_text))
+        if due:
+            # one update (one write for a NotifiedStore) and one notify call per tick
+            self.notified.update(pairs)
+            incr("deadline_notices", len(due))
+            self.notify(due)
+        self._rearm()
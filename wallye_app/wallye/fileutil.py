@@ -0,0 +1,25 @@
+"""Small file helpers shared by the stores."""
+import json
+import os
+
+
+def atomic_write_json(path, data, indent=None):
+    # write to a temp file in the same directory, then swap it in with os.replace
+    # so readers (and a crash mid-write) never see a half-written file
+    folder = os.path.dirname(os.path.abspath(path))
+    tmp = os.path.join(folder, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        # dumps + one write: json.dump streams through the pure-Python encoder
+        f.write(json.dumps(data, ensure_ascii=False, indent=indent))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def file_signature(path):
+    """(mtime_ns, size, inode) of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
@@ -0,0 +1,1114 @@
+"""Tkinter GUI: To-Do Manager, Text Analyzer, Password Generator, updates."""
+import os
+from datetime import datetime
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import tkinter.font as tkfont
+
+from .config import (
+    APP_TITLE, DEADLINE_NOTICE_MINUTES, LIVE_ANALYSIS_DELAY_MS, SEARCH_DELAY_MS,
+)
+from .todos import open_todo_store, format_task_row, diff_todos
+from .bulk import import_file, export_file, format_import, format_export
+from .deadlines import DeadlineScheduler, normalize_deadline, parse_deadline
+from .search import TaskIndex, SORT_KEYS
+from .notify import NotificationQueue, NotifiedStore, format_notice
+from .text import LiveTextStats, format_analysis
+from .analysis import AnalysisJob
+from .corpus import CorpusJob, export_corpus, format_corpus
+from .passwords import build_charset, generate_password, evaluate_password, format_password_report
+from .releases import default_catalog
+from .installer import InstallJob, format_install
+from .watch import FileWatcher
+from . import metrics
+from .metrics import timed
+
+
+# ---------------------------
+# Widgets
+# ---------------------------
+def sync_listbox_rows(listbox, old_rows, new_rows):
+    """Make a plain Listbox show new_rows, touching only rows whose text changed."""
+    for i in range(min(len(old_rows), len(new_rows))):
+        if old_rows[i] != new_rows[i]:
+            listbox.delete(i)
+            listbox.insert(i, new_rows[i])
+    if len(old_rows) > len(new_rows):
+        listbox.delete(len(new_rows), tk.END)
+    elif len(new_rows) > len(old_rows):
+        listbox.insert(tk.END, *new_rows[len(old_rows):])
+
+
+class VirtualList(ttk.Frame):
+    """Windowed list view: only the rows currently visible exist in the Listbox.
+
+    `source` is any sequence, `format_row(i, item)` turns an item into its
+    row text and `key(item)` gives the stable id used to keep the selection
+    on the same item across changes. Callers report changes with
+    row_inserted/row_updated/row_deleted (cost bounded by the window size)
+    or reset() after replacing the data.
+    """
+
+    def __init__(self, master, source, format_row, key=lambda item: item["id"], width=36, on_select=None):
+        super().__init__(master)
+        self._init_state(source, format_row, key, on_select)
+
+        self.listbox = tk.Listbox(self, width=width, exportselection=False, activestyle="none")
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scroll.pack(side="right", fill="y")
+        self.listbox.pack(side="left", expand=1, fill="both")
+        self.listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self.listbox.bind("<Configure>", self._on_configure)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1, "units"))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-1, "units"))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(1, "units"))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self._move_selection(-self.rows))
+        self.listbox.bind("<Next>", lambda e: self._move_selection(self.rows))
+
+    def _init_state(self, source, format_row, key, on_select, rows=20):
+        self.source = source
+        self.format_row = format_row
+        self.key = key
+        self.on_select = on_select
+        self.top = 0
+        self.rows = rows
+        self.selected = None
+        self._selected_key = None  # survives reset() even if the data was reordered in place
+        self._row_of = None  # id -> index, rebuilt on demand after shifting edits
+
+    @classmethod
+    def detached(cls, source, format_row, listbox, scroll, key=lambda item: item["id"], on_select=None, rows=20):
+        """A VirtualList drawing into the given listbox/scrollbar, with no Tk frame.
+
+        For running the list logic without a display (benchmarks): the
+        widgets only need the delete/insert/get/selection/scrollbar calls.
+        """
+        view = cls.__new__(cls)
+        view._init_state(source, format_row, key, on_select, rows)
+        view.listbox = listbox
+        view.scroll = scroll
+        return view
+
+    # --- Listbox-compatible selection ---
+    def curselection(self):
+        return () if self.selected is None else (self.selected,)
+
+    def select(self, idx):
+        if idx is None or not 0 <= idx < len(self.source):
+            self._set_selected(None)
+        else:
+            self._set_selected(idx)
+            self.see(idx)
+        self._render()
+
+    def see(self, idx):
+        if idx < self.top:
+            self.top = idx
+        elif idx >= self.top + self.rows:
+            self.top = idx - self.rows + 1
+
+    def index_of(self, key):
+        if self._row_of is None:
+            self._row_of = {self.key(item): i for i, item in enumerate(self.source)}
+        return self._row_of.get(key)
+
+    # --- change notifications ---
+    def reset(self, source=None):
+        if source is not None:
+            self.source = source
+        self._row_of = None
+        key = self._selected_key
+        self.selected = self.index_of(key) if key is not None else None
+        if self.selected is None:
+            self._selected_key = None
+        self._render()
+
+    def row_inserted(self, idx):
+        if idx == len(self.source) - 1:
+            if self._row_of is not None:
+                self._row_of[self.key(self.source[idx])] = idx
+        else:
+            self._row_of = None
+        if self.selected is not None and idx <= self.selected:
+            self.selected += 1
+        if idx < self.top + self.rows:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def row_deleted(self, idx):
+        self._row_of = None
+        if self.selected is not None:
+            if idx == self.selected:
+                self._set_selected(None)
+            elif idx < self.selected:
+                self.selected -= 1
+        self.top = max(0, min(self.top, len(self.source) - self.rows))
+        if idx < self.top + self.rows:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def row_updated(self, idx):
+        pos = idx - self.top
+        if 0 <= pos < self.rows and idx < len(self.source):
+            self.listbox.delete(pos)
+            self.listbox.insert(pos, self.format_row(idx, self.source[idx]))
+            if idx == self.selected:
+                self.listbox.selection_set(pos)
+
+    # --- scrolling ---
+    def scroll_by(self, n, what="units"):
+        step = self.rows if what == "pages" else 1
+        self._scroll_to(self.top + n * step)
+        return "break"
+
+    def _scroll_to(self, top):
+        top = max(0, min(int(top), len(self.source) - self.rows))
+        if top != self.top:
+            self.top = top
+            self._render()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self._scroll_to(float(args[0]) * len(self.source))
+        elif action == "scroll":
+            self.scroll_by(int(args[0]), args[1])
+
+    def _on_configure(self, event):
+        linespace = tkfont.nametofont(self.listbox.cget("font")).metrics("linespace") + 1
+        rows = max(1, event.height // linespace)
+        if rows != self.rows:
+            self.rows = rows
+            self._render()
+
+    # --- selection ---
+    def _set_selected(self, idx):
+        self.selected = idx
+        self._selected_key = None if idx is None else self.key(self.source[idx])
+
+    def _on_listbox_select(self, _ev):
+        sel = self.listbox.curselection()
+        if not sel:
+            return
+        self._set_selected(self.top + sel[0])
+        if self.on_select:
+            self.on_select(_ev)
+
+    def _move_selection(self, delta):
+        count = len(self.source)
+        if not count:
+            return "break"
+        idx = 0 if self.selected is None else max(0, min(count - 1, self.selected + delta))
+        self.select(idx)
+        if self.on_select:
+            self.on_select(None)
+        return "break"
+
+    # --- drawing ---
+    def _render(self):
+        count = len(self.source)
+        self.top = max(0, min(self.top, count - self.rows))
+        end = min(count, self.top + self.rows)
+        lb = self.listbox
+        lb.delete(0, tk.END)
+        if end > self.top:
+            lb.insert(tk.END, *[self.format_row(i, self.source[i]) for i in range(self.top, end)])
+        if self.selected is not None and self.top <= self.selected < end:
+            lb.selection_set(self.selected - self.top)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        count = len(self.source)
+        if count <= self.rows:
+            self.scroll.set(0, 1)
+        else:
+            self.scroll.set(self.top / count, (self.top + self.rows) / count)
+
+
+class NotificationPanel:
+    """Non-modal summary of the tasks whose deadline is near.
+
+    One Toplevel in the bottom-right corner of the main window, created on
+    the first notice and then reused. New batches are prepended, the window
+    is raised without taking the focus, and nothing waits for the user, so
+    the event loop keeps running. "Mostra" selects the task in the To-Do
+    list (on_open), "Chiudi" hides the panel and clears it.
+    """
+
+    MAX_ROWS = 500  # older notices are dropped past this
+
+    def __init__(self, root, on_open=None):
+        self.root = root
+        self.on_open = on_open
+        self.win = None
+        self.tasks = []
+
+    def _build(self):
+        win = self.win = tk.Toplevel(self.root)
+        win.title("Scadenze vicine")
+        win.transient(self.root)
+        win.protocol("WM_DELETE_WINDOW", self.close)
+        self.lbl = ttk.Label(win, text="")
+        self.lbl.pack(anchor="w", padx=8, pady=(8, 2))
+        body = ttk.Frame(win)
+        body.pack(expand=1, fill="both", padx=8)
+        self.listbox = tk.Listbox(body, width=48, height=8, activestyle="none")
+        scroll = ttk.Scrollbar(body, orient="vertical", command=self.listbox.yview)
+        self.listbox.config(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        self.listbox.pack(side="left", expand=1, fill="both")
+        self.listbox.bind("<Double-Button-1>", lambda e: self.open_selected())
+        btns = ttk.Frame(win)
+        btns.pack(fill="x", padx=8, pady=6)
+        ttk.Button(btns, text="Mostra", command=self.open_selected).pack(side="left")
+        ttk.Button(btns, text="Chiudi", command=self.close).pack(side="right")
+
+    def show(self, tasks):
+        if self.win is None or not self.win.winfo_exists():
+            self._build()
+        self.tasks[:0] = tasks
+        del self.tasks[self.MAX_ROWS:]
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *[format_notice(t) for t in self.tasks])
+        self.lbl.config(text=f"{len(self.tasks)} task in scadenza entro {DEADLINE_NOTICE_MINUTES} min")
+        self.win.deiconify()
+        self._place()
+        self.win.lift()
+        self.root.bell()
+
+    def _place(self):
+        # bottom-right corner of the main window, like a toast
+        self.win.update_idletasks()
+        x = self.root.winfo_rootx() + self.root.winfo_width() - self.win.winfo_reqwidth() - 16
+        y = self.root.winfo_rooty() + self.root.winfo_height() - self.win.winfo_reqheight() - 16
+        self.win.geometry(f"+{max(0, x)}+{max(0, y)}")
+
+    def open_selected(self):
+        sel = self.listbox.curselection()
+        if sel and self.on_open:
+            self.on_open(self.tasks[sel[0]])
+
+    def close(self):
+        self.tasks = []
+        if self.win is not None and self.win.winfo_exists():
+            self.win.withdraw()
+
+
+# ---------------------------
+# GUI Application
+# ---------------------------
+class App:
+    def __init__(self, root):
+        self.root = root
+        root.title(APP_TITLE)
+        root.geometry("900x600")
+        self.store = open_todo_store()
+        self.todos = self.store.load()
+        # Deadline notices (timer re-armed only for the next due task), shown
+        # in one non-modal panel per batch; already notified deadlines are
+        # remembered in NOTIFIED_FILE
+        self.notice_panel = NotificationPanel(root, on_open=self.show_task)
+        self.notices = NotificationQueue(root, self.notice_panel.show)
+        self.deadlines = DeadlineScheduler(root, self.notify_deadlines, notified=NotifiedStore())
+
+        self.tab_control = ttk.Notebook(root)
+        self.tab_todo = ttk.Frame(self.tab_control)
+        self.tab_text = ttk.Frame(self.tab_control)
+        self.tab_pass = ttk.Frame(self.tab_control)
+        self.tab_updates_available = ttk.Frame(self.tab_control)
+        self.tab_diag = ttk.Frame(self.tab_control)
+
+        self.tab_control.add(self.tab_todo, text="To-Do")
+        self.tab_control.add(self.tab_text, text="Analizzatore Testo")
+        self.tab_control.add(self.tab_pass, text="Generatore Password")
+        self.tab_control.add(self.tab_updates_available, text="Aggiornamenti disponibili")
+        self.tab_control.add(self.tab_diag, text="Diagnostica")
+        self.tab_control.pack(expand=1, fill="both")
+
+        self.build_todo_tab()
+        self.build_text_tab()
+        self.build_pass_tab()
+        self.build_updates_available_tab()
+        self.build_diag_tab()
+
+        # Start deadline notices
+        self.deadlines.load(self.store.due_between(datetime.now(), datetime.max))
+
+        # Pick up edits made by other instances or sync tools
+        self._todo_files = {os.path.abspath(p) for p in self.store.files()}
+        self.watcher = FileWatcher(root, list(self._todo_files) + [self.catalog.path], self.on_files_changed).start()
+
+    # ---------------------------
+    # To-Do Tab
+    # ---------------------------
+    def build_todo_tab(self):
+        frame = self.tab_todo
+        left = ttk.Frame(frame)
+        left.pack(side="left", fill="y", padx=8, pady=8)
+        right = ttk.Frame(frame)
+        right.pack(side="left", expand=1, fill="both", padx=8, pady=8)
+
+        lbl = ttk.Label(left, text="Tasks")
+        lbl.pack(anchor="w")
+
+        # Search and filters: the list shows only the matching tasks
+        self.task_index = TaskIndex(self.todos)
+        self._filter_after = None
+        self.search_var = tk.StringVar()
+        ttk.Entry(left, textvariable=self.search_var).pack(fill="x", pady=(2, 2))
+        filters = ttk.Frame(left)
+        filters.pack(fill="x")
+        self.filter_status_var = tk.StringVar(value="tutti")
+        ttk.Combobox(filters, textvariable=self.filter_status_var, values=["tutti", "pending", "done"], state="readonly", width=8).pack(side="left")
+        ttk.Label(filters, text="entro").pack(side="left", padx=(4, 0))
+        self.filter_due_var = tk.StringVar()
+        ttk.Entry(filters, textvariable=self.filter_due_var, width=14).pack(side="left", padx=2)
+        self.sort_var = tk.StringVar(value=SORT_KEYS[0])
+        ttk.Combobox(filters, textvariable=self.sort_var, values=list(SORT_KEYS), state="readonly", width=11).pack(side="left")
+        for var in (self.search_var, self.filter_status_var, self.filter_due_var, self.sort_var):
+            var.trace_add("write", self.on_filter_changed)
+        self.lbl_matches = ttk.Label(left, text="")
+        self.lbl_matches.pack(anchor="w")
+
+        self.lb_tasks = VirtualList(left, self.todos, format_task_row, width=36, on_select=self.on_select_task)
+        self.lb_tasks.pack(expand=1, fill="y")
+
+        btn_frame = ttk.Frame(left)
+        btn_frame.pack(fill="x", pady=6)
+        ttk.Button(btn_frame, text="Aggiungi", command=self.add_task_dialog).pack(side="left", padx=2)
+        ttk.Button(btn_frame, text="Rimuovi", command=self.remove_task).pack(side="left", padx=2)
+        ttk.Button(btn_frame, text="Modifica", command=self.edit_task_dialog).pack(side="left", padx=2)
+        ttk.Button(btn_frame, text="Salva manuale", command=self.store.save_all).pack(side="left", padx=2)
+        io_frame = ttk.Frame(left)
+        io_frame.pack(fill="x")
+        ttk.Button(io_frame, text="Importa...", command=self.import_tasks).pack(side="left", padx=2)
+        ttk.Button(io_frame, text="Esporta...", command=self.export_tasks).pack(side="left", padx=2)
+
+        # Right: details
+        ttk.Label(right, text="Dettagli task").pack(anchor="w")
+        self.txt_details = tk.Text(right, height=5)
+        self.txt_details.pack(fill="x")
+        ttk.Label(right, text="Scadenza (YYYY-MM-DD HH:MM)").pack(anchor="w", pady=(8,0))
+        self.entry_deadline = ttk.Entry(right)
+        self.entry_deadline.pack(fill="x")
+        ttk.Label(right, text="Stato").pack(anchor="w", pady=(8,0))
+        self.status_var = tk.StringVar()
+        self.cb_status = ttk.Combobox(right, textvariable=self.status_var, values=["pending","done"], state="readonly")
+        self.cb_status.pack(fill="x")
+        ttk.Button(right, text="Aggiorna", command=self.update_selected_task).pack(pady=6)
+
+        self.refresh_task_list()
+
+    @timed("refresh_task_list")
+    def refresh_task_list(self):
+        # only the visible rows are rebuilt, see VirtualList
+        self.apply_filter()
+
+    def on_filter_changed(self, *_args):
+        if self._filter_after is not None:
+            self.root.after_cancel(self._filter_after)
+        self._filter_after = self.root.after(SEARCH_DELAY_MS, self.apply_filter)
+
+    @timed("apply_filter")
+    def apply_filter(self):
+        self._filter_after = None
+        text = self.search_var.get().strip()
+        status = self.filter_status_var.get()
+        status = None if status == "tutti" else status
+        due_text = self.filter_due_var.get().strip()
+        due_before = parse_deadline(due_text) if due_text else None
+        sort = self.sort_var.get()
+        if not (text or status or due_before) and sort == SORT_KEYS[0]:
+            # no filter: the list is self.todos itself and edits are applied row by row
+            view = self.todos
+        else:
+            view = self.task_index.query(text, status, due_before, sort)
+        self.lb_tasks.reset(view)
+        note = "  (data non valida)" if due_text and due_before is None else ""
+        if view is self.todos:
+            self.lbl_matches.config(text=f"{len(self.todos)} task{note}")
+        else:
+            self.lbl_matches.config(text=f"{len(view)} di {len(self.todos)} task{note}")
+
+    def _filtering(self):
+        return self.lb_tasks.source is not self.todos
+
+    def on_files_changed(self, paths):
+        if self._todo_files.intersection(paths):
+            self.reload_todos()
+        if os.path.abspath(self.catalog.path) in paths:
+            self.refresh_available_updates()
+
+    def reload_todos(self):
+        # apply only what another writer changed, as if it had been edited here
+        fresh = self.store.reload()
+        if fresh is None:
+            return
+        removed, changed, added = diff_todos(self.todos, fresh)
+        if not (removed or changed or added):
+            return
+        lb = self.lb_tasks
+        bulk = self._filtering() or len(removed) + len(added) > lb.rows
+        for t in removed:
+            idx = None if bulk else lb.index_of(t["id"])
+            self.todos.remove(t)
+            self.deadlines.unschedule(t)
+            self.task_index.remove(t)
+            if not bulk:
+                lb.row_deleted(idx)
+        for t, new in changed:
+            t.clear()
+            t.update(new)
+            self.deadlines.schedule(t)
+            self.task_index.update(t)
+            if not bulk:
+                lb.row_updated(lb.index_of(t["id"]))
+        for t in added:
+            self.todos.append(t)
+            self.deadlines.schedule(t)
+            self.task_index.add(t)
+            if not bulk:
+                lb.row_inserted(len(self.todos) - 1)
+        if bulk:
+            self.refresh_task_list()
+
+    def import_tasks(self):
+        path = filedialog.askopenfilename(filetypes=[("CSV / NDJSON", "*.csv *.ndjson *.jsonl"), ("Tutti i file", "*.*")])
+        if not path:
+            return
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            result = import_file(self.store, path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Errore", f"Importazione non riuscita: {e}")
+            return
+        finally:
+            self.root.config(cursor="")
+        # one refresh for the whole batch
+        self.task_index.invalidate()
+        self.refresh_task_list()
+        self.deadlines.load(self.store.due_between(datetime.now(), datetime.max))
+        messagebox.showinfo("Importazione", format_import(result))
+
+    def export_tasks(self):
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("NDJSON", "*.ndjson")])
+        if not path:
+            return
+        try:
+            result = export_file(self.todos, path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Errore", f"Esportazione non riuscita: {e}")
+            return
+        messagebox.showinfo("Esportazione", format_export(result))
+
+    def on_select_task(self, _ev):
+        sel = self.lb_tasks.curselection()
+        if not sel:
+            return
+        idx = sel[0]
+        item = self.lb_tasks.source[idx]
+        self.txt_details.delete("1.0", tk.END)
+        self.txt_details.insert(tk.END, item.get("desc",""))
+        self.entry_deadline.delete(0, tk.END)
+        self.entry_deadline.insert(0, item.get("deadline",""))
+        self.status_var.set(item.get("status","pending"))
+
+    def add_task_dialog(self):
+        title = simpledialog.askstring("Nuovo task", "Titolo:")
+        if not title:
+            return
+        desc = simpledialog.askstring("Nuovo task", "Descrizione (opzionale):") or ""
+        dl = simpledialog.askstring("Nuovo task", "Scadenza (YYYY-MM-DD HH:MM, 'domani 9:00') (opzionale):") or ""
+        # relative deadlines are stored as the date they mean today
+        dl = normalize_deadline(dl) or dl
+        t = {"title": title, "desc": desc, "deadline": dl, "status": "pending"}
+        self.store.add(t)
+        self.deadlines.schedule(t)
+        self.task_index.add(t)
+        if self._filtering():
+            self.apply_filter()
+        else:
+            self.lb_tasks.row_inserted(len(self.todos) - 1)
+
+    def remove_task(self):
+        sel = self.lb_tasks.curselection()
+        if not sel:
+            return
+        idx = sel[0]
+        if messagebox.askyesno("Conferma", "Rimuovere il task selezionato?"):
+            t = self.lb_tasks.source[idx]
+            self.store.remove(t)
+            self.deadlines.unschedule(t)
+            self.task_index.remove(t)
+            if self._filtering():
+                self.apply_filter()
+            else:
+                self.lb_tasks.row_deleted(idx)
+
+    def edit_task_dialog(self):
+        sel = self.lb_tasks.curselection()
+        if not sel:
+            return
+        idx = sel[0]
+        t = self.lb_tasks.source[idx]
+        title = simpledialog.askstring("Modifica task", "Titolo:", initialvalue=t.get("title",""))
+        if title is None:
+            return
+        desc = simpledialog.askstring("Modifica task", "Descrizione (opzionale):", initialvalue=t.get("desc","")) or ""
+        dl = simpledialog.askstring("Modifica task", "Scadenza (YYYY-MM-DD HH:MM, 'domani 9:00') (opzionale):", initialvalue=t.get("deadline","")) or ""
+        dl = normalize_deadline(dl) or dl
+        status = simpledialog.askstring("Modifica task", "Stato (pending/done):", initialvalue=t.get("status","pending")) or "pending"
+        self.store.update(t, {"title": title, "desc": desc, "deadline": dl, "status": status})
+        self._task_updated(t, idx)
+
+    def update_selected_task(self):
+        sel = self.lb_tasks.curselection()
+        if not sel:
+            return
+        idx = sel[0]
+        desc = self.txt_details.get("1.0", tk.END).strip()
+        dl = self.entry_deadline.get().strip()
+        dl = normalize_deadline(dl) or dl
+        status = self.status_var.get() or "pending"
+        t = self.lb_tasks.source[idx]
+        self.store.update(t, {"desc": desc, "deadline": dl, "status": status})
+        self._task_updated(t, idx)
+
+    def _task_updated(self, t, idx):
+        self.deadlines.schedule(t)
+        self.task_index.update(t)
+        if self._filtering():
+            # the task may now fall outside the filter or move in the sort order
+            self.apply_filter()
+        else:
+            self.lb_tasks.row_updated(idx)
+
+    # Deadline notices, called by DeadlineScheduler on the main thread
+    def notify_deadlines(self, tasks):
+        # queued, never shown from inside the scheduler tick
+        self.notices.push(tasks)
+
+    def show_task(self, task):
+        """Select a task in the To-Do list (from the notice panel)."""
+        idx = self.lb_tasks.index_of(task["id"])
+        if idx is None and self._filtering():
+            # hidden by the current filter: show the whole list
+            self.search_var.set("")
+            self.filter_status_var.set("tutti")
+            self.filter_due_var.set("")
+            self.sort_var.set(SORT_KEYS[0])
+            self.apply_filter()
+            idx = self.lb_tasks.index_of(task["id"])
+        if idx is None:
+            return  # removed in the meantime
+        self.tab_control.select(self.tab_todo)
+        self.lb_tasks.select(idx)
+        self.on_select_task(None)
+
+    # ---------------------------
+    # Text Analyzer Tab
+    # ---------------------------
+    def build_text_tab(self):
+        frame = self.tab_text
+        top = ttk.Frame(frame)
+        top.pack(fill="both", expand=1, padx=8, pady=8)
+        bottom = ttk.Frame(frame)
+        bottom.pack(fill="x", padx=8, pady=4)
+
+        lbl = ttk.Label(top, text="Inserisci testo da analizzare:")
+        lbl.pack(anchor="w")
+        self.txt_input = tk.Text(top)
+        self.txt_input.pack(expand=1, fill="both")
+        self.live_stats = None
+        self._live_after = None
+        self._install_text_proxy(self.txt_input)
+        self.txt_input.bind("<<Modified>>", self.on_text_modified)
+
+        btns = ttk.Frame(bottom)
+        btns.pack(fill="x")
+        ttk.Button(btns, text="Analizza", command=self.analyze_text).pack(side="left", padx=4)
+        ttk.Button(btns, text="Apri file...", command=self.open_text_file).pack(side="left", padx=4)
+        ttk.Button(btns, text="Analizza file...", command=self.analyze_file_dialog).pack(side="left", padx=4)
+        ttk.Button(btns, text="Analizza cartella...", command=self.analyze_folder_dialog).pack(side="left", padx=4)
+        self.btn_export_corpus = ttk.Button(btns, text="Esporta corpus...", command=self.export_corpus_results, state="disabled")
+        self.btn_export_corpus.pack(side="left", padx=4)
+        ttk.Button(btns, text="Salva output", command=self.save_analysis).pack(side="left", padx=4)
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btns, text="Analisi live", variable=self.live_var, command=self.toggle_live_analysis).pack(side="left", padx=4)
+        self.btn_cancel_analysis = ttk.Button(btns, text="Annulla", command=self.cancel_analysis, state="disabled")
+        self.btn_cancel_analysis.pack(side="left", padx=4)
+        self.analysis_progress = ttk.Progressbar(btns, mode="determinate", maximum=100)
+        self.analysis_progress.pack(side="left", fill="x", expand=1, padx=4)
+        self.analysis_job = None
+
+        self.analysis_output = tk.Text(bottom, height=8)
+        self.analysis_output.pack(expand=0, fill="x", pady=6)
+
+    # --- live analysis ---
+    def _install_text_proxy(self, widget):
+        # route the widget's Tcl command through _text_proxy to see which lines each edit touches
+        self._text_orig = widget._w + "_orig"
+        widget.tk.call("rename", widget._w, self._text_orig)
+        widget.tk.createcommand(widget._w, self._text_proxy)
+
+    def _text_line(self, index):
+        return int(self.txt_input.tk.call(self._text_orig, "index", index).split(".")[0])
+
+    def _text_proxy(self, *args):
+        call = self.txt_input.tk.call
+        live = self.live_stats
+        if live is None or not args or args[0] not in ("insert", "delete", "replace", "edit"):
+            return call((self._text_orig,) + args)
+        cmd = args[0]
+        if cmd == "edit":
+            if len(args) > 1 and args[1] in ("undo", "redo"):
+                # undo/redo edit the text below the widget command: rescan everything
+                self.live_stats = None
+            return call((self._text_orig,) + args)
+        if cmd == "delete" and len(args) > 3:
+            self.live_stats = None
+            return call((self._text_orig,) + args)
+        start = self._text_line(args[1])
+        if cmd == "insert":
+            old_end = start
+        else:
+            old_end = max(start, self._text_line(args[2] if len(args) > 2 else f"{args[1]}+1c"))
+        lines_before = self._text_line("end-1c")
+        result = call((self._text_orig,) + args)
+        delta = self._text_line("end-1c") - lines_before
+        live.replace_lines(start - 1, old_end, old_end - start + 1 + delta)
+        return result
+
+    def toggle_live_analysis(self):
+        if self.live_var.get():
+            self.live_stats = None
+            self.update_live_analysis()
+        else:
+            self.live_stats = None
+
+    def on_text_modified(self, _ev):
+        self.txt_input.edit_modified(False)
+        if not self.live_var.get():
+            return
+        # debounce: recompute once typing pauses
+        if self._live_after is not None:
+            self.root.after_cancel(self._live_after)
+        self._live_after = self.root.after(LIVE_ANALYSIS_DELAY_MS, self.update_live_analysis)
+
+    @timed("live_analysis")
+    def update_live_analysis(self):
+        self._live_after = None
+        if not self.live_var.get():
+            return
+        get = self.txt_input.get
+        live = self.live_stats
+        if live is None or len(live.lines) != self._text_line("end-1c"):
+            self.live_stats = LiveTextStats(get("1.0", "end-1c").split("\n"))
+        else:
+            # re-tokenize only the lines touched since the last update
+            for first, last in live.dirty_runs():
+                lines = get(f"{first + 1}.0", f"{last + 1}.end").split("\n")
+                for i, line in enumerate(lines, first):
+                    live.update_line(i, line)
+            live.clean()
+        self.analysis_output.delete("1.0", tk.END)
+        self.analysis_output.insert(tk.END, format_analysis(self.live_stats))
+
+    def open_text_file(self):
+        path = filedialog.askopenfilename(filetypes=[("Text files","*.txt;*.md;*.py;*.csv"),("All files","*.*")])
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                txt = f.read()
+            self.txt_input.delete("1.0", tk.END)
+            self.txt_input.insert(tk.END, txt)
+        except Exception as e:
+            messagebox.showerror("Errore", str(e))
+
+    def save_analysis(self):
+        path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files","*.txt")])
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.analysis_output.get("1.0", tk.END))
+            messagebox.showinfo("Salvato", "Analisi salvata.")
+        except Exception as e:
+            messagebox.showerror("Errore", str(e))
+
+    def analyze_text(self):
+        text = self.txt_input.get("1.0", tk.END).strip()
+        if not text:
+            self.analysis_output.delete("1.0", tk.END)
+            self.analysis_output.insert(tk.END, "Nessun testo.")
+            return
+        self.start_analysis(AnalysisJob(text=text))
+
+    def analyze_file_dialog(self):
+        # analyze straight from disk: the files never go into the Text widget
+        paths = filedialog.askopenfilenames(filetypes=[("Text files","*.txt;*.md;*.py;*.csv;*.log"),("All files","*.*")])
+        if not paths:
+            return
+        try:
+            job = AnalysisJob(paths=paths)
+        except Exception as e:
+            messagebox.showerror("Errore", str(e))
+            return
+        self.start_analysis(job)
+
+    def analyze_folder_dialog(self):
+        # corpus mode: every text file of the folder, unchanged files come from the cache
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        # the folder is listed by the job's thread: a large tree must not block the Tk loop
+        self.start_analysis(CorpusJob(folder))
+
+    def export_corpus_results(self):
+        job = self.analysis_job
+        if not isinstance(job, CorpusJob) or job.result is None:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON (totale + per file)", "*.json"), ("CSV (righe per file)", "*.csv")])
+        if not path:
+            return
+        try:
+            export_corpus(job, path)
+        except OSError as e:
+            messagebox.showerror("Errore", f"Esportazione non riuscita: {e}")
+
+    def start_analysis(self, job):
+        if self.analysis_job is not None and not self.analysis_job.done:
+            self.analysis_job.cancel()
+        self.analysis_job = job.start()
+        self.analysis_progress["value"] = 0
+        self.btn_cancel_analysis.config(state="normal")
+        self.btn_export_corpus.config(state="disabled")
+        self.analysis_output.delete("1.0", tk.END)
+        self.analysis_output.insert(tk.END, "Analisi in corso...")
+        self.root.after(100, self.poll_analysis, job)
+
+    def cancel_analysis(self):
+        if self.analysis_job is not None:
+            self.analysis_job.cancel()
+
+    def poll_analysis(self, job):
+        # results come back to the Tk thread here, never from the worker thread
+        if job is not self.analysis_job:
+            return
+        self.analysis_progress["value"] = job.progress() * 100
+        if not job.done:
+            if isinstance(job, CorpusJob) and job.scanning:
+                self.analysis_output.delete("1.0", tk.END)
+                self.analysis_output.insert(tk.END, f"Ricerca dei file... {job.scanned} trovati")
+            self.root.after(100, self.poll_analysis, job)
+            return
+        self.btn_cancel_analysis.config(state="disabled")
+        self.analysis_output.delete("1.0", tk.END)
+        if job.error is not None:
+            self.analysis_output.insert(tk.END, f"Errore: {job.error}")
+            return
+        if job.result is None:
+            self.analysis_output.insert(tk.END, "Analisi annullata.")
+            return
+        if isinstance(job, CorpusJob) and not job.paths:
+            self.analysis_output.insert(tk.END, "Nessun file di testo nella cartella.")
+            return
+        stats = job.result
+        self.analysis_progress["value"] = 100
+        header = ""
+        top = 10
+        if isinstance(job, CorpusJob):
+            header = format_corpus(job)
+            top = job.top_k or top
+            self.btn_export_corpus.config(state="normal")
+        elif len(job.paths) == 1:
+            header = f"File: {job.paths[0]}\n\n"
+        elif job.paths:
+            header = "".join(f"File: {p} ({job.per_file[p].words} parole)\n" for p in job.paths if p in job.per_file) + "\n"
+        report = format_analysis(stats, top)
+        self.analysis_output.insert(tk.END, header + report)
+
+    # ---------------------------
+    # Password Generator Tab
+    # ---------------------------
+    def build_pass_tab(self):
+        frame = self.tab_pass
+        left = ttk.Frame(frame)
+        left.pack(side="left", fill="y", padx=8, pady=8)
+        right = ttk.Frame(frame)
+        right.pack(side="left", expand=1, fill="both", padx=8, pady=8)
+
+        ttk.Label(left, text="Opzioni").pack(anchor="w")
+        self.len_var = tk.IntVar(value=16)
+        ttk.Label(left, text="Lunghezza").pack(anchor="w")
+        ttk.Spinbox(left, from_=4, to=128, textvariable=self.len_var, width=6).pack(anchor="w")
+        self.use_lower = tk.BooleanVar(value=True)
+        self.use_upper = tk.BooleanVar(value=True)
+        self.use_digits = tk.BooleanVar(value=True)
+        self.use_symbols = tk.BooleanVar(value=True)
+        ttk.Checkbutton(left, text="Lettere minuscole", variable=self.use_lower).pack(anchor="w")
+        ttk.Checkbutton(left, text="Lettere maiuscole", variable=self.use_upper).pack(anchor="w")
+        ttk.Checkbutton(left, text="Cifre", variable=self.use_digits).pack(anchor="w")
+        ttk.Checkbutton(left, text="Simboli", variable=self.use_symbols).pack(anchor="w")
+        ttk.Button(left, text="Genera", command=self.generate_password).pack(pady=6)
+        ttk.Button(left, text="Copia clipboard", command=self.copy_password).pack(pady=2)
+
+        ttk.Label(right, text="Password generata").pack(anchor="w")
+        self.entry_password = ttk.Entry(right, font=("Courier", 12))
+        self.entry_password.pack(fill="x")
+        ttk.Label(right, text="Valutazione").pack(anchor="w", pady=(8,0))
+        self.eval_text = tk.Text(right, height=6)
+        self.eval_text.pack(fill="x")
+
+    def generate_password(self):
+        charset = build_charset(self.use_lower.get(), self.use_upper.get(), self.use_digits.get(), self.use_symbols.get())
+        if not charset:
+            messagebox.showwarning("Attenzione", "Seleziona almeno un tipo di carattere.")
+            return
+        length = max(4, min(256, int(self.len_var.get())))
+        pw = generate_password(length, charset)
+        self.entry_password.delete(0, tk.END)
+        self.entry_password.insert(0, pw)
+        self.evaluate_password(pw, len(charset))
+
+    def evaluate_password(self, pw, charset_size):
+        report = format_password_report(evaluate_password(pw, charset_size))
+        self.eval_text.delete("1.0", tk.END)
+        self.eval_text.insert(tk.END, report)
+
+    def copy_password(self):
+        pw = self.entry_password.get()
+        if not pw:
+            return
+        self.root.clipboard_clear()
+        self.root.clipboard_append(pw)
+        messagebox.showinfo("Copia", "Password copiata negli appunti.")
+    
+
+    # ---------------------------
+    # Aggiornamenti disponibili (read-only)
+    # ---------------------------
+    def build_updates_available_tab(self):
+        frame = self.tab_updates_available
+        left = ttk.Frame(frame)
+        left.pack(side="left", fill="y", padx=8, pady=8)
+        right = ttk.Frame(frame)
+        right.pack(side="left", expand=1, fill="both", padx=8, pady=8)
+
+        ttk.Label(left, text="Aggiornamenti disponibili").pack(anchor="w")
+        self.lb_avail = tk.Listbox(left, width=36)
+        self.lb_avail.pack(expand=1, fill="y")
+        self.lb_avail.bind("<<ListboxSelect>>", self.on_select_avail)
+
+        btns = ttk.Frame(left)
+        btns.pack(fill="x", pady=6)
+        ttk.Button(btns, text="Aggiorna", command=self.refresh_available_updates).pack(side="left", padx=2)
+        ttk.Button(btns, text="Apri release", command=self.open_selected_release).pack(side="left", padx=2)
+        ttk.Button(btns, text="Installa", command=self.install_selected_update).pack(side="left", padx=2)
+        self.btn_cancel_install = ttk.Button(btns, text="Annulla", command=self.cancel_install, state="disabled")
+        self.btn_cancel_install.pack(side="left", padx=2)
+        self.install_progress = ttk.Progressbar(left, mode="determinate", maximum=100)
+        self.install_progress.pack(fill="x")
+        self.install_status = ttk.Label(left, text="")
+        self.install_status.pack(anchor="w")
+        self.install_job = None
+
+        ttk.Label(right, text="Dettagli release").pack(anchor="w")
+        self.txt_avail_details = tk.Text(right, height=12)
+        self.txt_avail_details.pack(fill="both", expand=1)
+
+        self.catalog = default_catalog()
+        self.available_releases = []
+        self._avail_generation = None
+        self.selected_release_path = None
+        self.refresh_available_updates()
+
+    @timed("refresh_available_updates")
+    def refresh_available_updates(self):
+        # show only released entries that are not installed; the catalog is
+        # re-parsed only when releases.json changed on disk
+        available = self.catalog.available()
+        if self.catalog.generation == self._avail_generation:
+            return
+        self._avail_generation = self.catalog.generation
+        self.available_releases = available
+        rows = []
+        for i, r in enumerate(available):
+            v = r.get('version') or '(draft)'
+            t = r.get('title') or ''
+            d = r.get('date') or ''
+            rows.append(f"{i+1}. {v} - {t} ({d})")
+        # rewrite only the rows that differ from what is on screen
+        sync_listbox_rows(self.lb_avail, self.lb_avail.get(0, tk.END), rows)
+
+    def on_select_avail(self, _ev):
+        sel = self.lb_avail.curselection()
+        if not sel:
+            return
+        idx = sel[0]
+        r = self.available_releases[idx]
+        notes = self.catalog.notes(r)
+        self.txt_avail_details.delete('1.0', tk.END)
+        self.txt_avail_details.insert(tk.END, notes)
+        # store path to release file if exists
+        ver = r.get('version')
+        self.selected_release_path = self.catalog.release_file(ver) if ver else None
+
+    def open_selected_release(self):
+        if not self.selected_release_path:
+            messagebox.showinfo('Info', 'Nessun file di release disponibile per l' + "'elemento selezionato")
+            return
+        try:
+            os.startfile(self.selected_release_path)
+        except Exception as e:
+            messagebox.showerror('Errore', str(e))
+            
+    def install_selected_update(self):
+        sel = self.lb_avail.curselection()
+        if not sel:
+            messagebox.showinfo('Info', 'Seleziona un aggiornamento da installare')
+            return
+        if self.install_job is not None and not self.install_job.done:
+            messagebox.showinfo('Info', 'Un\'installazione è già in corso')
+            return
+        
+        idx = sel[0]
+        release = self.available_releases[idx]
+        version = release.get('version', 'sconosciuta')
+        
+        if messagebox.askyesno('Conferma installazione', 
+                             f'Vuoi installare la versione {version}?\n\n' +
+                             'La versione installata diventerà quella attiva.'):
+            # download + verifica in un thread, il progresso arriva via root.after
+            self.install_job = InstallJob(release).start()
+            self.install_progress["value"] = 0
+            self.btn_cancel_install.config(state="normal")
+            self.root.after(100, self.poll_install, self.install_job)
+
+    def cancel_install(self):
+        if self.install_job is not None:
+            self.install_job.cancel()
+
+    def poll_install(self, job):
+        self.install_progress["value"] = job.progress() * 100
+        self.install_status.config(text=f"{job.version}: {job.stage}")
+        if not job.done:
+            self.root.after(100, self.poll_install, job)
+            return
+        self.btn_cancel_install.config(state="disabled")
+        if job.cancelled:
+            self.install_status.config(text=f"{job.version}: annullata (il download riprenderà)")
+            return
+        if job.error is not None:
+            self.install_status.config(text=f"{job.version}: errore")
+            messagebox.showerror('Errore', f'Errore durante l\'installazione: {job.error}')
+            return
+        self.txt_avail_details.delete('1.0', tk.END)
+        self.txt_avail_details.insert(tk.END, format_install(job.result))
+        try:
+            # Marca come installato nel file releases.json (scrittura atomica)
+            self.catalog.mark_installed(job.version)
+        except Exception as e:
+            # the new version is installed and active: only the catalog is behind
+            messagebox.showwarning('Attenzione', f'Versione {job.version} installata, ma il catalogo non è stato aggiornato: {e}')
+            return
+        self.refresh_available_updates()
+        messagebox.showinfo('Successo', f'Versione {job.version} installata con successo!')
+
+    # ---------------------------
+    # Diagnostics Tab
+    # ---------------------------
+    DIAG_COLUMNS = (("count", "chiamate", "{:d}"), ("p50_ms", "p50 ms", "{:.3f}"), ("p95_ms", "p95 ms", "{:.3f}"),
+                    ("p99_ms", "p99 ms", "{:.3f}"), ("max_ms", "max ms", "{:.3f}"), ("total_ms", "totale ms", "{:.1f}"))
+    DIAG_REFRESH_MS = 1000
+
+    def build_diag_tab(self):
+        frame = self.tab_diag
+        top = ttk.Frame(frame)
+        top.pack(fill="both", expand=1, padx=8, pady=8)
+
+        ttk.Label(top, text="Tempi delle operazioni (ultime chiamate)").pack(anchor="w")
+        cols = [c for c, _title, _fmt in self.DIAG_COLUMNS]
+        self.tree_diag = ttk.Treeview(top, columns=cols, height=10)
+        self.tree_diag.heading("#0", text="operazione")
+        self.tree_diag.column("#0", width=200)
+        for c, title, _fmt in self.DIAG_COLUMNS:
+            self.tree_diag.heading(c, text=title)
+            self.tree_diag.column(c, width=90, anchor="e")
+        self.tree_diag.pack(fill="both", expand=1)
+        self.lbl_counters = ttk.Label(top, text="", wraplength=760, justify="left")
+        self.lbl_counters.pack(anchor="w", pady=(4, 0))
+
+        btns = ttk.Frame(top)
+        btns.pack(fill="x", pady=6)
+        ttk.Button(btns, text="Aggiorna", command=self.refresh_diagnostics).pack(side="left", padx=2)
+        ttk.Button(btns, text="Azzera", command=self.reset_diagnostics).pack(side="left", padx=2)
+        ttk.Button(btns, text="Esporta JSON...", command=self.export_diagnostics).pack(side="left", padx=2)
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btns, text="Profilazione (cProfile + tracemalloc)", variable=self.profile_var,
+                        command=self.toggle_profiling).pack(side="left", padx=12)
+
+        self.txt_profile = tk.Text(top, height=10, wrap="none")
+        self.txt_profile.pack(fill="both", expand=1)
+        self.capture = metrics.Capture()
+        self._diag_rows = {}
+        self._diag_after = None
+        self.tab_control.bind("<<NotebookTabChanged>>", self.on_tab_changed, add="+")
+
+    def on_tab_changed(self, _ev):
+        # refreshed once a second, only while the tab is visible
+        if self.tab_control.select() == str(self.tab_diag):
+            self.refresh_diagnostics()
+        elif self._diag_after is not None:
+            self.root.after_cancel(self._diag_after)
+            self._diag_after = None
+
+    def refresh_diagnostics(self):
+        if self._diag_after is not None:
+            self.root.after_cancel(self._diag_after)
+        data = metrics.snapshot()
+        for name, summary in data["timers"].items():
+            values = [fmt.format(summary[c]) for c, _title, fmt in self.DIAG_COLUMNS]
+            if name in self._diag_rows:
+                self.tree_diag.item(self._diag_rows[name], values=values)
+            else:
+                self._diag_rows[name] = self.tree_diag.insert("", tk.END, text=name, values=values)
+        counters = ", ".join(f"{k}: {v}" for k, v in data["counters"].items())
+        self.lbl_counters.config(text=f"Contatori: {counters or '-'}   (attivo da {data['uptime_s']:.0f} s)")
+        self._diag_after = self.root.after(self.DIAG_REFRESH_MS, self.refresh_diagnostics)
+
+    def reset_diagnostics(self):
+        metrics.reset()
+        self.tree_diag.delete(*self.tree_diag.get_children())
+        self._diag_rows = {}
+        self.refresh_diagnostics()
+
+    def export_diagnostics(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            metrics.dump_json(path)
+        except OSError as e:
+            messagebox.showerror("Errore", f"Esportazione non riuscita: {e}")
+
+    def toggle_profiling(self):
+        if self.profile_var.get():
+            self.capture.start()
+            self.txt_profile.delete("1.0", tk.END)
+            self.txt_profile.insert(tk.END, "Profilazione in corso: usa l'app, poi togli la spunta per il report.\n")
+        else:
+            report = self.capture.stop()
+            self.txt_profile.delete("1.0", tk.END)
+            self.txt_profile.insert(tk.END, report)
+
+
+def main():
+    root = tk.Tk()
+    App(root)  # kept alive by the callbacks it registers on root
+    root.mainloop()
@@ -0,0 +1,481 @@
+"""Release installer: download, verify and swap in a release artifact.
+
+A release in releases.json names its artifact with "url" and "sha256"
+(optionally "size"). The url can be http(s)://, file:// or a plain path;
+relative paths are resolved against RELEASE_MIRROR (a folder or a base URL),
+so an offline mirror works the same as a server.
+
+The artifact is fetched into PRIVATE_STAGING_DIR in INSTALL_CHUNK_BYTES
+ranges by INSTALL_WORKERS threads sharing one pooled HTTP session. Finished
+chunks are recorded in a small state file, so an interrupted download
+resumes where it stopped. SHA-256 is computed in file order as soon as the
+leading chunks land, so verification is done when the last byte arrives.
+The archive is unpacked next to the installed versions, renamed into place
+and made current by atomically rewriting PRIVATE_CURRENT_FILE.
+"""
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit
+from urllib.request import url2pathname
+
+from .config import (
+    RELEASE_MIRROR, PRIVATE_STAGING_DIR, PRIVATE_VERSIONS_DIR, PRIVATE_CURRENT_FILE,
+    INSTALL_WORKERS, INSTALL_CHUNK_BYTES, INSTALL_TIMEOUT,
+)
+from .fileutil import atomic_write_json
+from .releases import safe_version
+
+_BLOCK = 64 * 1024  # bytes per read/write while streaming a range
+_RETRIES = 3  # attempts per chunk before the download is abandoned
+
+
+class InstallError(Exception):
+    """The release cannot be installed (bad catalog entry, server, hash or archive)."""
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def resolve_artifact_url(release, mirror=None):
+    url = release.get("url")
+    if not url:
+        raise InstallError(f"la release {release.get('version')} non indica un artefatto ('url')")
+    if "://" in url or os.path.isabs(url):
+        return url
+    mirror = RELEASE_MIRROR if mirror is None else mirror
+    if not mirror:
+        raise InstallError(f"percorso relativo {url!r} ma nessun mirror configurato (WALLYE_RELEASE_MIRROR)")
+    if "://" in mirror:
+        return urljoin(mirror.rstrip("/") + "/", url)
+    return os.path.join(mirror, url)
+
+
+def open_source(url, workers=INSTALL_WORKERS, timeout=INSTALL_TIMEOUT):
+    scheme = urlsplit(url).scheme.lower()
+    if scheme in ("http", "https"):
+        return _HttpSource(url, workers, timeout)
+    if scheme == "file":
+        return _FileSource(url2pathname(urlsplit(url).path))
+    return _FileSource(url)
+
+
+class _FileSource:
+    """Local file or mounted mirror; same read(start, end) interface as _HttpSource."""
+
+    kind = "file"
+    ranges = True
+
+    def __init__(self, path):
+        if not os.path.isfile(path):
+            raise InstallError(f"artefatto non trovato: {path}")
+        self.path = path
+        self.size = os.path.getsize(path)
+
+    def read(self, start, end=None):
+        end = self.size if end is None else end
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            left = end - start
+            while left > 0:
+                block = f.read(min(_BLOCK, left))
+                if not block:
+                    return
+                left -= len(block)
+                yield block
+
+    def close(self):
+        pass
+
+
+class _HttpSource:
+    """HTTP(S) artifact behind a connection pool sized for the download workers.
+
+    Uses a requests.Session when requests is installed, otherwise one
+    keep-alive http.client connection per worker thread.
+    """
+
+    kind = "http"
+
+    def __init__(self, url, workers=INSTALL_WORKERS, timeout=INSTALL_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            requests = None
+        if requests is not None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        else:
+            self._session = None
+            self._local = threading.local()
+            self._connections = []
+            self._conn_lock = threading.Lock()
+        self.size, self.ranges = self._probe()
+
+    # --- transport ---
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            parts = urlsplit(self.url)
+            cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = cls(parts.netloc, timeout=self.timeout)
+            self._local.conn = conn
+            with self._conn_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _get(self, headers):
+        # (status, headers, iterator over body blocks, close)
+        if self._session is not None:
+            resp = self._session.get(self.url, headers=headers, stream=True, timeout=self.timeout)
+            return resp.status_code, resp.headers, resp.iter_content(_BLOCK), resp.close
+        parts = urlsplit(self.url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        conn = self._connection()
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+        except (OSError, http.client.HTTPException):
+            self._drop_connection()
+            raise
+        return resp.status, resp.headers, iter(lambda: resp.read(_BLOCK), b""), resp.close
+
+    def _probe(self):
+        # one-byte ranged GET: a 206 gives the total size and proves Range support
+        for _ in range(5):
+            status, headers, body, close = self._get({"Range": "bytes=0-0"})
+            if status == 206 or status >= 300:
+                for _block in body:
+                    pass
+            elif self._session is None:
+                # a 200 would send the whole artifact: hang up instead of reading it
+                self._drop_connection()
+            close()
+            if status in (301, 302, 303, 307, 308) and headers.get("Location"):
+                self._drop_connection()
+                self.url = urljoin(self.url, headers["Location"])
+                continue
+            if status == 206:
+                total = (headers.get("Content-Range") or "").rpartition("/")[2]
+                return (int(total) if total.isdigit() else None), True
+            if status == 200:
+                length = headers.get("Content-Length")
+                return (int(length) if length and length.isdigit() else None), False
+            raise InstallError(f"il server ha risposto {status} per {self.url}")
+        raise InstallError(f"troppi redirect per {self.url}")
+
+    def read(self, start, end=None):
+        headers = {}
+        if start or end is not None:
+            headers["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        status, _headers, body, close = self._get(headers)
+        try:
+            if status != (206 if headers else 200):
+                raise InstallError(f"il server ha risposto {status} per {headers.get('Range', 'GET')}")
+            for block in body:
+                yield block
+        except BaseException:
+            # a half-read response leaves the connection unusable
+            if self._session is None:
+                self._drop_connection()
+            raise
+        finally:
+            close()
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        else:
+            with self._conn_lock:
+                for conn in self._connections:
+                    conn.close()
+                self._connections = []
+
+
+class InstallJob:
+    """Download + verification + swap of one release, off the Tk thread.
+
+    Like AnalysisJob: the caller polls progress(), `stage`, `done`,
+    `result` and `error`, and may cancel(); a cancelled download keeps its
+    finished chunks for the next attempt. The catalog is not touched here:
+    on success the caller marks the version installed (from its own thread).
+    """
+
+    def __init__(self, release, mirror=None, workers=INSTALL_WORKERS, chunk_bytes=INSTALL_CHUNK_BYTES,
+                 staging_dir=PRIVATE_STAGING_DIR, versions_dir=PRIVATE_VERSIONS_DIR, current_file=PRIVATE_CURRENT_FILE):
+        self.release = release
+        self.version = release.get("version")
+        self.mirror = mirror
+        self.workers = max(1, workers)
+        self.chunk_bytes = chunk_bytes
+        self.staging_dir = staging_dir
+        self.versions_dir = versions_dir
+        self.current_file = current_file
+        self.stage = "in attesa"
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self._total = 0
+        self._processed = 0
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    def cancel(self):
+        self.cancelled = True
+        self._cancel.set()
+
+    def progress(self):
+        # fraction of the artifact on disk, in [0, 1]
+        return min(1.0, self._processed / self._total) if self._total else 0.0
+
+    def _add(self, n):
+        with self._lock:
+            self._processed += n
+
+    def _run(self):
+        try:
+            self.result = self._install()
+        except _Cancelled:
+            self.result = None
+        except Exception as e:
+            self.error = e
+        self.done = True
+
+    def _install(self):
+        if not self.version:
+            raise InstallError("release senza versione")
+        expected = (self.release.get("sha256") or "").lower()
+        if not expected:
+            raise InstallError(f"la release {self.version} non ha uno sha256: installazione rifiutata")
+        url = resolve_artifact_url(self.release, self.mirror)
+        os.makedirs(self.staging_dir, exist_ok=True)
+        part = os.path.join(self.staging_dir, safe_version(self.version) + ".part")
+        start = time.perf_counter()
+        self.stage = "download"
+        source = open_source(url, self.workers)
+        try:
+            if self.release.get("size") and source.size is not None and int(self.release["size"]) != source.size:
+                raise InstallError(f"dimensione attesa {self.release['size']} byte, il server ne offre {source.size}")
+            digest, resumed = self._download(source, part, url, expected)
+        finally:
+            source.close()
+        download_s = time.perf_counter() - start
+        if digest != expected:
+            _remove_quietly(part, part + ".json")
+            raise InstallError(f"SHA-256 non corrisponde per {self.version}: atteso {expected}, ottenuto {digest}")
+        self.stage = "installazione"
+        target = self._swap_in(part, url)
+        _remove_quietly(part, part + ".json")
+        downloaded = self._total - resumed
+        self.stage = "completata"
+        return {
+            "version": self.version,
+            "path": target,
+            "source": source.kind,
+            "bytes": self._total,
+            "downloaded": downloaded,
+            "resumed": resumed,
+            "seconds": time.perf_counter() - start,
+            "download_seconds": download_s,
+            "mb_per_s": downloaded / download_s / 1e6 if download_s else 0.0,
+            "sha256": digest,
+        }
+
+    # --- download ---
+    def _download(self, source, part, url, expected):
+        # returns (sha256 hex, bytes reused from an earlier attempt)
+        if source.size is None or not source.ranges:
+            return self._download_stream(source, part), 0
+        size = source.size
+        chunk = self.chunk_bytes
+        count = (size + chunk - 1) // chunk
+        state_path = part + ".json"
+        state = {"url": url, "size": size, "sha256": expected, "chunk": chunk, "done": []}
+        saved = _read_state(state_path)
+        if saved and os.path.exists(part) and all(saved.get(k) == state[k] for k in ("url", "size", "sha256", "chunk")):
+            state["done"] = saved["done"]
+        else:
+            with open(part, "wb") as f:
+                f.truncate(size)
+        done = set(state["done"])
+        resumed = sum(min(size, (i + 1) * chunk) - i * chunk for i in done)
+        self._total = size
+        self._processed = resumed
+        hasher = hashlib.sha256()
+        next_i = 0
+        with open(part, "rb") as reader:
+            def hash_ready():
+                # feed the hash every chunk that is now contiguous from the start
+                nonlocal next_i
+                while next_i in done:
+                    reader.seek(next_i * chunk)
+                    left = min(size, (next_i + 1) * chunk) - next_i * chunk
+                    while left > 0:
+                        block = reader.read(min(left, 1 << 20))
+                        hasher.update(block)
+                        left -= len(block)
+                    next_i += 1
+
+            hash_ready()
+            with ThreadPoolExecutor(self.workers) as pool:
+                futures = [pool.submit(self._fetch_chunk, source, part, i, chunk, size) for i in range(count) if i not in done]
+                try:
+                    for fut in as_completed(futures):
+                        done.add(fut.result())
+                        state["done"] = sorted(done)
+                        atomic_write_json(state_path, state)
+                        hash_ready()
+                except BaseException:
+                    self._cancel.set()
+                    for fut in futures:
+                        fut.cancel()
+                    raise
+        if self.cancelled:
+            raise _Cancelled()
+        return hasher.hexdigest(), resumed
+
+    def _fetch_chunk(self, source, part, i, chunk, size):
+        start = i * chunk
+        end = min(size, start + chunk)
+        for attempt in range(_RETRIES):
+            written = 0
+            try:
+                with open(part, "r+b") as f:
+                    f.seek(start)
+                    for block in source.read(start, end):
+                        if self._cancel.is_set():
+                            raise _Cancelled()
+                        block = block[:end - start - written]
+                        f.write(block)
+                        written += len(block)
+                        self._add(len(block))
+                if written != end - start:
+                    raise InstallError(f"risposta troncata per i byte {start}-{end - 1}")
+                return i
+            except (OSError, http.client.HTTPException, InstallError):
+                self._add(-written)
+                if attempt == _RETRIES - 1 or self._cancel.is_set():
+                    raise
+            except _Cancelled:
+                self._add(-written)
+                raise
+
+    def _download_stream(self, source, part):
+        # no Range support (or unknown size): one sequential pass, hashed while writing
+        hasher = hashlib.sha256()
+        self._total = source.size or 0
+        self._processed = 0
+        with open(part, "wb") as f:
+            for block in source.read(0):
+                if self._cancel.is_set():
+                    raise _Cancelled()
+                f.write(block)
+                hasher.update(block)
+                self._add(len(block))
+        if not self._total:
+            self._total = self._processed
+        return hasher.hexdigest()
+
+    # --- install ---
+    def _swap_in(self, part, url):
+        os.makedirs(self.versions_dir, exist_ok=True)
+        name = safe_version(self.version)
+        target = os.path.join(self.versions_dir, name)
+        tmp = os.path.join(self.versions_dir, f".{name}.staging")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            if zipfile.is_zipfile(part):
+                with zipfile.ZipFile(part) as zf:
+                    root = os.path.realpath(tmp)
+                    for member in zf.namelist():
+                        dest = os.path.realpath(os.path.join(tmp, member))
+                        if dest != root and not dest.startswith(root + os.sep):
+                            raise InstallError(f"percorso non valido nell'archivio: {member}")
+                    zf.extractall(tmp)
+            else:
+                filename = os.path.basename(urlsplit(url).path) or name
+                shutil.copyfile(part, os.path.join(tmp, filename))
+            old = None
+            if os.path.exists(target):
+                # reinstall: move the old copy aside first, a directory rename cannot overwrite
+                old = os.path.join(self.versions_dir, f".{name}.old")
+                shutil.rmtree(old, ignore_errors=True)
+                os.replace(target, old)
+            os.replace(tmp, target)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        atomic_write_json(self.current_file, {
+            "version": self.version,
+            "path": target,
+            "sha256": self.release.get("sha256"),
+            "installed_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        }, indent=2)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+        return target
+
+
+def _read_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_quietly(*paths):
+    for p in paths:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+def current_release(current_file=PRIVATE_CURRENT_FILE):
+    """{"version", "path", ...} of the release made current by the last install, or None."""
+    state = _read_state(current_file)
+    return state if isinstance(state, dict) else None
+
+
+def format_install(result):
+    mb = result["bytes"] / 1e6
+    lines = [f"Versione {result['version']} installata in {result['path']}"]
+    line = f"{mb:.1f} MB ({result['source']}) in {result['seconds']:.2f} s, {result['mb_per_s']:.1f} MB/s"
+    if result["resumed"]:
+        line += f", {result['resumed'] / 1e6:.1f} MB ripresi da un download precedente"
+    lines.append(line)
+    lines.append(f"SHA-256 verificato: {result['sha256']}")
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+"""Deadline notices: which ones were already given, and how they reach the user.
+
+NotifiedStore remembers task id -> deadline text for every notice already
+shown, in NOTIFIED_FILE, so a restart does not announce them again (a new
+deadline on the same task is a new notice). NotificationQueue merges all
+the tasks that fall due into one batch. It hands the batch to `show` from
+root.after, at most once every NOTIFY_MIN_INTERVAL_MS. A burst of hundreds
+of due tasks therefore costs one panel update, not one modal dialog each.
+"""
+import json
+import time
+from datetime import datetime, timedelta
+
+from .config import NOTIFIED_FILE, NOTIFIED_KEEP_HOURS, NOTIFY_MIN_INTERVAL_MS
+from .deadlines import parse_deadline
+from .fileutil import atomic_write_json
+
+
+class NotifiedStore:
+    """Set of (task id, deadline text) pairs already notified, kept on disk.
+
+    Used by DeadlineScheduler in place of a plain set: `pair in store` and
+    `store.update(pairs)`, with one atomic write per update. `path=None`
+    keeps it in memory only.
+    """
+
+    def __init__(self, path=NOTIFIED_FILE, keep_hours=NOTIFIED_KEEP_HOURS):
+        self.path = path
+        self.keep = timedelta(hours=keep_hours)
+        self._seen = {}  # task id -> deadline text
+        if path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        # deadlines long past can never come up again: drop them so the file stays small
+        cutoff = datetime.now() - self.keep
+        for tid, dl_text in data.items():
+            if isinstance(dl_text, str):
+                dl = parse_deadline(dl_text)
+                if dl is not None and dl >= cutoff:
+                    self._seen[str(tid)] = dl_text
+
+    def __contains__(self, pair):
+        tid, dl_text = pair
+        return self._seen.get(tid) == dl_text
+
+    def __len__(self):
+        return len(self._seen)
+
+    def update(self, pairs):
+        changed = False
+        for tid, dl_text in pairs:
+            if self._seen.get(tid) != dl_text:
+                self._seen[tid] = dl_text
+                changed = True
+        if changed and self.path:
+            try:
+                atomic_write_json(self.path, self._seen)
+            except OSError:
+                pass  # still remembered for this session; only a restart would repeat them
+
+
+class NotificationQueue:
+    """Coalesces due tasks and calls show(tasks) from the Tk loop, rate-limited.
+
+    push() never shows anything itself. It only schedules a flush, so the
+    caller (the scheduler tick) returns right away. Tasks pushed before
+    the flush are merged by id. The first batch goes out on the next idle
+    turn of the loop. Later ones wait until `min_interval_ms` has passed
+    since the previous batch.
+    """
+
+    def __init__(self, root, show, min_interval_ms=NOTIFY_MIN_INTERVAL_MS):
+        self.root = root
+        self.show = show
+        self.min_interval_ms = min_interval_ms
+        self._pending = {}  # task id -> task, in arrival order
+        self._after_id = None
+        self._last_shown = None  # time.monotonic() of the last batch
+        self.batches = 0
+
+    def push(self, tasks):
+        for t in tasks:
+            self._pending[t["id"]] = t
+        if self._pending and self._after_id is None:
+            delay = 0
+            if self._last_shown is not None:
+                elapsed_ms = (time.monotonic() - self._last_shown) * 1000
+                delay = int(max(0, self.min_interval_ms - elapsed_ms))
+            self._after_id = self.root.after(delay, self._flush)
+
+    def pending(self):
+        return len(self._pending)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending.clear()
+
+    def _flush(self):
+        self._after_id = None
+        batch = list(self._pending.values())
+        self._pending.clear()
+        if not batch:
+            return
+        self._last_shown = time.monotonic()
+        self.batches += 1
+        self.show(batch)
+
+
+def format_notice(task):
+    """One line of the notice panel: time of the deadline and title."""
+    dl = parse_deadline(task.get("deadline") or "")
+    when = f"{dl:%H:%M}" if dl is not None else task.get("deadline", "")
+    return f"{when}  {task.get('title', '')}"
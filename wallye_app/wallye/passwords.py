@@ -0,0 +1,95 @@
+"""Password generation and strength estimate."""
+import itertools
+import os
+import string
+from math import log2
+
+from .metrics import incr, timed
+from .strength import analyze_password, rate_entropy
+
+PASSWORD_SYMBOLS = "!@#$%^&*()-_=+[]{};:,.<>/?"  # a reasonable subset of symbols
+
+def build_charset(lower=True, upper=True, digits=True, symbols=True):
+    charset = ""
+    if lower:
+        charset += string.ascii_lowercase
+    if upper:
+        charset += string.ascii_uppercase
+    if digits:
+        charset += string.digits
+    if symbols:
+        charset += PASSWORD_SYMBOLS
+    return charset
+
+def generate_passwords(count, length, charset):
+    """Yield `count` random passwords drawn uniformly from `charset` (ASCII, at most 256 chars).
+
+    Randomness is read from os.urandom in large blocks. Bytes at or above the
+    largest multiple of len(charset) are rejected so that the `byte % n`
+    mapping stays unbiased; mapping and rejection are a single
+    bytes.translate call per block.
+    """
+    n = len(charset)
+    if not 0 < n <= 256:
+        raise ValueError("charset must contain between 1 and 256 characters")
+    if length < 1:
+        raise ValueError("length must be positive")
+    limit = 256 - 256 % n
+    table = bytes(ord(charset[b % n]) for b in range(256))
+    rejected = bytes(range(limit, 256))
+    block = max(length * min(count, 4096) * 256 // limit + 64, 256)
+    pool = b""
+    pos = 0
+    incr("passwords_generated", count)
+    for _ in range(count):
+        while len(pool) - pos < length:
+            pool = pool[pos:] + os.urandom(block).translate(table, rejected)
+            pos = 0
+        yield pool[pos:pos + length].decode("ascii")
+        pos += length
+
+@timed("generate_password")
+def generate_password(length, charset):
+    return next(generate_passwords(1, length, charset))
+
+def write_passwords(out, count, length, charset, batch=10000):
+    """Stream passwords to a text file object, one per line."""
+    gen = generate_passwords(count, length, charset)
+    while True:
+        lines = list(itertools.islice(gen, batch))
+        if not lines:
+            break
+        out.write("\n".join(lines) + "\n")
+
+def evaluate_password(pw, charset_size):
+    """Entropy estimates, rating and character classes.
+
+    "entropy" is length * log2(charset size), what a random password of that
+    alphabet would have; "guess_entropy" accounts for dictionary words,
+    repeats, sequences and keyboard walks (see wallye.strength). The rating
+    uses the lower of the two.
+    """
+    entropy = len(pw) * log2(charset_size) if charset_size > 0 else 0
+    guess_entropy, patterns = analyze_password(pw, charset_size or None)
+    score = rate_entropy(min(entropy, guess_entropy))
+    # simple checks
+    checks = []
+    if any(c.islower() for c in pw): checks.append("minuscole OK")
+    if any(c.isupper() for c in pw): checks.append("maiuscole OK")
+    if any(c.isdigit() for c in pw): checks.append("cifre OK")
+    if any(c in "!@#$%^&*()-_=+[]{};:,.<>/?\\" for c in pw): checks.append("simboli OK")
+    return {"length": len(pw), "charset_size": charset_size, "entropy": entropy,
+            "guess_entropy": guess_entropy, "patterns": patterns, "score": score, "checks": checks}
+
+def format_password_report(result):
+    lines = [
+        f"Lunghezza: {result['length']}",
+        f"Charset size stimata: {result['charset_size']}",
+        f"Entropia stimata: {result['entropy']:.1f} bit",
+        f"Entropia realistica (schemi noti): {result['guess_entropy']:.1f} bit",
+        f"Valutazione: {result['score']}"
+    ]
+    if result["patterns"]:
+        lines.append("Schemi trovati: " + ", ".join(f"{kind} '{tok}'" for tok, kind in result["patterns"]))
+    lines.append("Caratteristiche: " + ", ".join(result["checks"]))
+    return "\n".join(lines)
@@ -0,0 +1,131 @@
+"""Private release catalog (~/.wallye_releases)."""
+import json
+import os
+from collections import OrderedDict
+
+from .config import PRIVATE_RELEASE_HOME, PRIVATE_RELEASES_FILE, PRIVATE_RELEASES_DIR, RELEASE_NOTES_CACHE
+from .fileutil import atomic_write_json, file_signature
+from .metrics import timed
+
+@timed("load_private_releases")
+def load_private_releases():
+    # copies: the caller may edit them without touching the catalog's cache
+    return [dict(r) for r in default_catalog().releases()]
+
+def safe_version(version):
+    # usable as a file name component
+    return str(version).replace("/", "_").replace("\\", "_")
+
+def get_private_release_path(version):
+    return os.path.join(PRIVATE_RELEASES_DIR, f"RELEASE_{safe_version(version)}.md")
+
+
+class ReleaseCatalog:
+    """releases.json parsed once per change of the file's (mtime, size).
+
+    `releases()` costs one os.stat when nothing changed. Each parse also
+    builds a version -> release index. RELEASE_<ver>.md bodies are read
+    only when asked for and kept in a small LRU.
+    """
+
+    def __init__(self, path=PRIVATE_RELEASES_FILE, notes_cache=RELEASE_NOTES_CACHE):
+        self.path = path
+        self.notes_cache = notes_cache
+        self.generation = 0  # bumped every time the catalog is (re)parsed
+        self._signature = None
+        self._releases = []
+        self._by_version = {}
+        self._available = []
+        self._notes = OrderedDict()  # path -> (signature, body or None)
+
+    def releases(self):
+        sig = file_signature(self.path)
+        if sig != self._signature:
+            self._load(sig)
+        return self._releases
+
+    @timed("parse_releases")
+    def _load(self, sig):
+        releases = []
+        if sig is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                releases = data if isinstance(data, list) else []
+            except Exception:
+                releases = []
+        self._set(releases, sig)
+
+    def _set(self, releases, sig):
+        self._signature = sig
+        self._releases = releases
+        self._by_version = {r.get("version"): r for r in releases if r.get("version")}
+        self._available = [r for r in releases if r.get("released") and not r.get("installed")]
+        self.generation += 1
+
+    def available(self):
+        """Released entries that are not installed yet."""
+        self.releases()
+        return self._available
+
+    def get(self, version):
+        self.releases()
+        return self._by_version.get(version)
+
+    def release_file(self, version):
+        """Path of RELEASE_<ver>.md if it exists (existence cached with the body)."""
+        path = get_private_release_path(version)
+        return path if self._note_entry(path)[1] is not None else None
+
+    def notes(self, release):
+        """Inline notes of a release, or the body of its RELEASE_<ver>.md."""
+        if release.get("notes"):
+            return release["notes"]
+        ver = release.get("version")
+        if not ver:
+            return ""
+        return self._note_entry(get_private_release_path(ver))[1] or ""
+
+    def _note_entry(self, path):
+        sig = file_signature(path)
+        entry = self._notes.get(path)
+        if entry is not None and entry[0] == sig:
+            self._notes.move_to_end(path)
+            return entry
+        body = None
+        if sig is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    body = f.read()
+            except OSError:
+                body = None
+        entry = (sig, body)
+        self._notes[path] = entry
+        if len(self._notes) > self.notes_cache:
+            self._notes.popitem(last=False)
+        return entry
+
+    def mark_installed(self, version):
+        """Set installed=True on `version` and rewrite releases.json atomically."""
+        # edit copies: if the write fails, the cache still matches the file
+        releases = [dict(r) for r in self.releases()]
+        found = False
+        for r in releases:
+            if r.get("version") == version:
+                r["installed"] = True
+                found = True
+        if not found:
+            raise KeyError(version)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)) or PRIVATE_RELEASE_HOME, exist_ok=True)
+        atomic_write_json(self.path, releases, indent=2)
+        # our own write: refresh the derived views without parsing the file again
+        self._set(releases, file_signature(self.path))
+
+
+_default_catalog = None
+
+def default_catalog():
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = ReleaseCatalog()
+    return _default_catalog
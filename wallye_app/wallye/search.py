@@ -0,0 +1,178 @@
+"""Search, filter and sort over the task list.
+
+TaskIndex keeps, per task id, the tokens of title + desc in an inverted
+index (token -> ids, plus a sorted vocabulary for prefix matches), the
+status and the deadline in a sorted (deadline, seq, id) list, so a query
+only touches the postings and the deadline range it needs. It is built
+on the first query and then kept up to date with add/update/remove.
+"""
+from bisect import bisect_left, bisect_right, insort
+
+from .deadlines import parse_deadline
+from .metrics import timed
+from .text import WORD_RE
+
+SORT_KEYS = ("inserimento", "scadenza", "titolo")
+
+
+def tokenize(text):
+    return set(WORD_RE.findall(text.lower())) if text else set()
+
+
+class TaskIndex:
+    """Inverted index + deadline index over `source` (a task list), built lazily."""
+
+    def __init__(self, source):
+        self.source = source
+        self.built = False
+        self._reset()
+
+    def _reset(self):
+        self._tasks = {}  # id -> task
+        self._seq = {}  # id -> insertion order
+        self._next_seq = 0
+        self._tokens = {}  # id -> tokens as indexed
+        self._title_key = {}  # id -> lowercase title, for sort="titolo"
+        self._postings = {}  # token -> set of ids
+        self._vocab = []  # sorted tokens, for prefix queries
+        self._status = {}  # status -> set of ids
+        self._due = []  # sorted (deadline, seq, id)
+        self._due_of = {}  # id -> its entry in _due
+
+    # --- maintenance ---
+    @timed("build_task_index")
+    def build(self):
+        self._reset()
+        self.built = True
+        for t in self.source:
+            self._index(t)
+        self._vocab = sorted(self._postings)
+        self._due.sort()
+
+    def invalidate(self):
+        # after a bulk change: rebuilt on the next query
+        self.built = False
+
+    def add(self, task):
+        if self.built:
+            self._index(task, incremental=True)
+
+    def update(self, task):
+        if self.built:
+            self._unindex(task["id"])
+            self._index(task, incremental=True, seq=self._seq.get(task["id"]))
+
+    def remove(self, task):
+        if self.built:
+            self._unindex(task["id"])
+            self._seq.pop(task["id"], None)
+
+    def _index(self, task, incremental=False, seq=None):
+        tid = task["id"]
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        self._seq[tid] = seq
+        self._tasks[tid] = task
+        title = (task.get("title") or "").lower()
+        self._title_key[tid] = title
+        tokens = tokenize(f"{title} {task.get('desc') or ''}")
+        self._tokens[tid] = tokens
+        for tok in tokens:
+            ids = self._postings.get(tok)
+            if ids is None:
+                ids = self._postings[tok] = set()
+                if incremental:
+                    insort(self._vocab, tok)
+            ids.add(tid)
+        self._status.setdefault(task.get("status", "pending"), set()).add(tid)
+        dl = parse_deadline(task.get("deadline") or "")
+        if dl is not None:
+            entry = (dl, seq, tid)
+            self._due_of[tid] = entry
+            if incremental:
+                insort(self._due, entry)
+            else:
+                self._due.append(entry)
+
+    def _unindex(self, tid):
+        task = self._tasks.pop(tid, None)
+        if task is None:
+            return
+        self._title_key.pop(tid, None)
+        for tok in self._tokens.pop(tid, ()):
+            ids = self._postings[tok]
+            ids.discard(tid)
+            if not ids:
+                del self._postings[tok]
+                i = bisect_left(self._vocab, tok)
+                if i < len(self._vocab) and self._vocab[i] == tok:
+                    del self._vocab[i]
+        for ids in self._status.values():
+            ids.discard(tid)
+        entry = self._due_of.pop(tid, None)
+        if entry is not None:
+            i = bisect_left(self._due, entry)
+            if i < len(self._due) and self._due[i] == entry:
+                del self._due[i]
+
+    # --- queries ---
+    def _matching_token(self, prefix):
+        # ids of every token starting with prefix (sorted vocabulary, one bisect)
+        i = bisect_left(self._vocab, prefix)
+        ids = set()
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            ids |= self._postings[self._vocab[i]]
+            i += 1
+        return ids
+
+    @timed("search_tasks")
+    def query(self, text="", status=None, due_before=None, sort="inserimento"):
+        """Tasks matching every filter, in the requested order.
+
+        text: every word must appear in title/desc; the last one may be a
+        prefix (search as you type). status: "pending"/"done" or None.
+        due_before: datetime, only tasks with a deadline up to it.
+        """
+        if not self.built:
+            self.build()
+        words = WORD_RE.findall((text or "").lower())
+        sets = []
+        for i, w in enumerate(words):
+            ids = self._matching_token(w) if i == len(words) - 1 else self._postings.get(w, set())
+            sets.append(ids)
+        if status:
+            sets.append(self._status.get(status, set()))
+        due_range = None
+        if due_before is not None:
+            due_range = self._due[:bisect_right(self._due, (due_before, float("inf"), ""))]
+            sets.append({tid for _dl, _seq, tid in due_range})
+        if not sets:
+            candidates = None
+        else:
+            sets.sort(key=len)
+            candidates = set(sets[0])
+            for s in sets[1:]:
+                if not candidates:
+                    break
+                candidates &= s
+
+        tasks = self._tasks
+        if sort == "scadenza":
+            entries = due_range if due_range is not None else self._due
+            ordered = [tasks[tid] for _dl, _seq, tid in entries if candidates is None or tid in candidates]
+            # tasks without a deadline go last, in insertion order
+            rest = (tid for tid in (candidates if candidates is not None else tasks) if tid not in self._due_of)
+            ordered.extend(tasks[tid] for tid in sorted(rest, key=self._seq.__getitem__))
+            return ordered
+        if sort == "titolo":
+            ids = list(tasks) if candidates is None else list(candidates)
+            ids.sort(key=self._seq.__getitem__)
+            ids.sort(key=self._title_key.__getitem__)  # stable: ties stay in insertion order
+            return [tasks[tid] for tid in ids]
+        if candidates is None:
+            return list(self.source)
+        if len(candidates) > len(tasks) // 8:
+            # a large share of the list: one pass in list order beats sorting by seq
+            return [t for t in self.source if t["id"] in candidates]
+        return [tasks[tid] for tid in sorted(candidates, key=self._seq.__getitem__)]
@@ -0,0 +1,333 @@
+"""Password strength: pattern detection, guess estimate and batch audit.
+
+A password is split into the cheapest sequence of known patterns
+(dictionary words, repeats, sequences, keyboard walks) and brute-forced
+characters; the estimate is the number of guesses an attacker trying
+those patterns first would need, reported as log2 (bits).
+"""
+import os
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from math import log2
+
+WORDLIST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "common_passwords.txt")
+MIN_WORD = 3  # shorter dictionary matches are ignored
+SYMBOL_SPACE = 33  # printable ASCII that is neither letter nor digit
+
+# leet-speak substitutions tried before the dictionary lookup
+_LEET = str.maketrans({"4": "a", "@": "a", "8": "b", "(": "c", "3": "e", "6": "g", "1": "i",
+                       "!": "i", "0": "o", "$": "s", "5": "s", "+": "t", "7": "t", "2": "z"})
+
+_KEYBOARD_ROWS = ("1234567890-=", "qwertyuiop[]", "asdfghjkl;'", "zxcvbnm,./")
+_KEYS_POS = {ch: (r, c) for r, row in enumerate(_KEYBOARD_ROWS) for c, ch in enumerate(row)}
+_REPEAT_RE = re.compile(r"(.+?)\1+")
+
+
+@lru_cache(maxsize=1)
+def load_wordlist(path=WORDLIST_FILE):
+    """word -> rank (1 = most common); read once, on first use."""
+    ranks = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            word = line.strip()
+            if word and not word.startswith("#") and word not in ranks:
+                ranks[word] = len(ranks) + 1
+    return ranks
+
+
+@lru_cache(maxsize=1)
+def _keyboard_graph():
+    # key -> set of neighbouring keys (same row and the rows above/below, staggered)
+    at = {pos: ch for ch, pos in _KEYS_POS.items()}
+    graph = {}
+    for ch, (r, c) in _KEYS_POS.items():
+        near = (at.get((r + dr, c + dc)) for dr, dc in ((0, -1), (0, 1), (-1, 0), (-1, 1), (1, 0), (1, -1)))
+        graph[ch] = {k for k in near if k}
+    return graph
+
+
+def char_space(ch):
+    if ch.isalpha():
+        return 26
+    if ch.isdigit():
+        return 10
+    return SYMBOL_SPACE
+
+
+def charset_size(pw):
+    """Size of the character classes present in pw (brute-force alphabet)."""
+    size = 0
+    if any(c.islower() for c in pw): size += 26
+    if any(c.isupper() for c in pw): size += 26
+    if any(c.isdigit() for c in pw): size += 10
+    if any(not c.isalnum() for c in pw): size += SYMBOL_SPACE
+    return size or 1
+
+
+# ---------------------------
+# Pattern matchers: each yields (start, end, kind, log2 guesses)
+# ---------------------------
+def _dictionary_matches(pw):
+    ranks, prefixes = _dictionary_index()
+    lower = pw.lower()
+    unleet = lower.translate(_LEET)
+    variants = ((lower, False),) if unleet == lower else ((lower, False), (unleet, True))
+    n = len(pw)
+    for text, leet in variants:
+        for i in range(n - MIN_WORD + 1):
+            # walk forward only while text[i:j] is still a prefix of some word
+            for j in range(i + MIN_WORD, n + 1):
+                candidate = text[i:j]
+                if candidate not in prefixes:
+                    break
+                rank = ranks.get(candidate)
+                if rank is None or (leet and candidate == lower[i:j]):
+                    continue
+                guesses = rank
+                token = pw[i:j]
+                if token != token.lower():
+                    # first letter only / all caps are the usual variations
+                    guesses *= 2 if (token[0].isupper() and token[1:] == token[1:].lower()) or token.isupper() else 2 ** sum(c.isupper() for c in token)
+                if leet:
+                    guesses *= 2
+                yield i, j, "dizionario", log2(guesses)
+
+
+@lru_cache(maxsize=1)
+def _dictionary_index():
+    # hash index: word -> rank, plus every prefix of every word so scans stop early
+    ranks = load_wordlist()
+    prefixes = {w[:k] for w in ranks for k in range(MIN_WORD, len(w) + 1)}
+    return ranks, prefixes
+
+
+def _repeat_matches(pw):
+    for m in _REPEAT_RE.finditer(pw):
+        block = m.group(1)
+        if m.end() - m.start() < 3:
+            continue
+        count = (m.end() - m.start()) // len(block)
+        base = estimate_guesses_log2(block) if len(block) > 1 else log2(char_space(block))
+        yield m.start(), m.end(), "ripetizione", base + log2(count)
+
+
+def _sequence_matches(pw):
+    n = len(pw)
+    i = 0
+    while i < n - 2:
+        delta = ord(pw[i + 1]) - ord(pw[i])
+        j = i + 1
+        if delta in (1, -1) and pw[i].isalnum():
+            while j < n and ord(pw[j]) - ord(pw[j - 1]) == delta and pw[j].isalnum() == pw[i].isalnum():
+                j += 1
+        if j - i >= 3:
+            base = 10 if pw[i].isdigit() else 26
+            yield i, j, "sequenza", log2(base * (j - i) * (2 if delta < 0 else 1))
+            i = j - 1
+        else:
+            i += 1
+
+
+def _keyboard_matches(pw):
+    graph = _keyboard_graph()
+    lower = pw.lower()
+    n = len(lower)
+    i = 0
+    while i < n - 2:
+        j = i + 1
+        turns = 0
+        prev_dir = None
+        while j < n and lower[j] in graph.get(lower[j - 1], ()):
+            direction = _KEYS_POS[lower[j]][0] - _KEYS_POS[lower[j - 1]][0], _KEYS_POS[lower[j]][1] - _KEYS_POS[lower[j - 1]][1]
+            if prev_dir is not None and direction != prev_dir:
+                turns += 1
+            prev_dir = direction
+            j += 1
+        if j - i >= 4:
+            keys = sum(len(r) for r in _KEYBOARD_ROWS)
+            yield i, j, "tastiera", log2(keys * (j - i) * 4 ** turns)
+            i = j - 1
+        else:
+            i += 1
+
+
+_MATCHERS = (_dictionary_matches, _repeat_matches, _sequence_matches, _keyboard_matches)
+
+
+def find_patterns(pw):
+    matches = []
+    for matcher in _MATCHERS:
+        matches.extend(matcher(pw))
+    return matches
+
+
+def estimate_guesses_log2(pw, alphabet=None):
+    return analyze_password(pw, alphabet)[0]
+
+
+def analyze_password(pw, alphabet=None):
+    """(log2 guesses, patterns used) for the cheapest split of pw into patterns.
+
+    Characters not covered by a pattern cost log2(alphabet) bits each, where
+    alphabet defaults to the character classes present in pw.
+    """
+    n = len(pw)
+    if not n:
+        return 0.0, []
+    per_char = log2(alphabet or charset_size(pw))
+    by_end = {}
+    for m in find_patterns(pw):
+        by_end.setdefault(m[1], []).append(m)
+    best = [0.0] + [0.0] * n
+    back = [None] * (n + 1)
+    for j in range(1, n + 1):
+        best[j] = best[j - 1] + per_char
+        back[j] = None
+        for m in by_end.get(j, ()):
+            cost = best[m[0]] + m[3]
+            if cost < best[j]:
+                best[j] = cost
+                back[j] = m
+    used = []
+    j = n
+    while j > 0:
+        m = back[j]
+        if m is None:
+            j -= 1
+        else:
+            used.append((pw[m[0]:m[1]], m[2]))
+            j = m[0]
+    used.reverse()
+    return best[n], used
+
+
+def rate_entropy(bits):
+    if bits < 28:
+        return "Molto debole"
+    elif bits < 36:
+        return "Debole"
+    elif bits < 60:
+        return "Moderata"
+    elif bits < 128:
+        return "Forte"
+    return "Molto forte"
+
+
+# ---------------------------
+# Batch audit
+# ---------------------------
+def class_counts(lines):
+    """Per-password (length, lower, upper, digits, symbols) for a list of ASCII byte strings.
+
+    With NumPy the whole batch is classified in a handful of array
+    operations; without it each line goes through bytes.translate + count.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is None:
+        table = bytes(_byte_class(b) for b in range(256))
+        rows = []
+        for line in lines:
+            cls = line.translate(table)
+            rows.append((len(line), cls.count(1), cls.count(2), cls.count(3), cls.count(4)))
+        return rows
+    if not lines:
+        return []
+    lengths = np.fromiter((len(l) for l in lines), dtype=np.int64, count=len(lines))
+    data = np.frombuffer(b"".join(lines), dtype=np.uint8)
+    classes = np.array([_byte_class(b) for b in range(256)], dtype=np.uint8)[data]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    cols = [lengths]
+    nonempty = lengths > 0
+    # reduceat over the non-empty lines only: their starts are strictly increasing
+    idx = starts[nonempty]
+    for k in (1, 2, 3, 4):
+        counts = np.zeros(len(lines), dtype=np.int64)
+        if idx.size:
+            counts[nonempty] = np.add.reduceat((classes == k).astype(np.int64), idx)
+        cols.append(counts)
+    return list(zip(*(c.tolist() for c in cols)))
+
+
+def _byte_class(b):
+    ch = chr(b)
+    if b > 127:
+        return 4
+    if ch.islower():
+        return 1
+    if ch.isupper():
+        return 2
+    if ch.isdigit():
+        return 3
+    return 4
+
+
+def audit_passwords(lines, batch=50000):
+    """Audit an iterable of passwords (str or bytes); returns a summary dict with throughput."""
+    ratings = Counter()
+    patterns = Counter()
+    weakest = []
+    total = 0
+    start = time.perf_counter()
+    it = iter(lines)
+    while True:
+        chunk = []
+        for line in it:
+            if isinstance(line, str):
+                line = line.encode("utf-8", "replace")
+            line = line.rstrip(b"\r\n")
+            if not line:
+                continue  # blank line, not a password
+            chunk.append(line)
+            if len(chunk) >= batch:
+                break
+        if not chunk:
+            break
+        for raw, (length, lower, upper, digits, symbols) in zip(chunk, class_counts(chunk)):
+            alphabet = (26 if lower else 0) + (26 if upper else 0) + (10 if digits else 0) + (SYMBOL_SPACE if symbols else 0)
+            pw = raw.decode("utf-8", "replace")
+            bits, used = analyze_password(pw, alphabet or 1)
+            ratings[rate_entropy(bits)] += 1
+            patterns.update(kind for _tok, kind in used)
+            weakest.append((bits, pw))
+            if len(weakest) > 20:
+                weakest.sort()
+                del weakest[10:]
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    weakest.sort()
+    return {
+        "passwords": total,
+        "seconds": elapsed,
+        "per_second": total / elapsed if elapsed else 0.0,
+        "ratings": dict(ratings),
+        "patterns": dict(patterns),
+        "weakest": weakest[:10],
+    }
+
+
+def audit_file(path, batch=50000):
+    with open(path, "rb") as f:
+        return audit_passwords(f, batch)
+
+
+def format_audit(result):
+    lines = [
+        f"Password analizzate: {result['passwords']}",
+        f"Tempo: {result['seconds']:.2f} s ({result['per_second']:,.0f} password/s)",
+        "",
+        "Valutazioni:",
+    ]
+    for name in ("Molto debole", "Debole", "Moderata", "Forte", "Molto forte"):
+        lines.append(f"  {name}: {result['ratings'].get(name, 0)}")
+    lines.append("")
+    lines.append("Schemi trovati: " + (", ".join(f"{k} {v}" for k, v in sorted(result["patterns"].items())) or "nessuno"))
+    lines.append("")
+    lines.append("Più deboli:")
+    for bits, pw in result["weakest"]:
+        lines.append(f"  {bits:5.1f} bit  {pw}")
+    return "\n".join(lines)
@@ -0,0 +1,222 @@
+"""Text statistics: words, sentences, syllables, Flesch reading ease."""
+import re
+from collections import Counter
+from functools import lru_cache
+
+from .config import ANALYSIS_CHUNK_CHARS, SYLLABLE_CACHE_SIZE
+from .metrics import timed
+
+# syllable estimation (simple heuristic): one syllable per run of vowels.
+# Memoized: a text has far fewer distinct words than word occurrences.
+_VOWEL_RUN_RE = re.compile(r"[aeiouy]+")
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def estimate_syllables(word):
+    word = word.lower()
+    count = len(_VOWEL_RUN_RE.findall(word))
+    if word.endswith("e"):
+        count = max(1, count - 1)
+    return max(1, count)
+
+@timed("flesch_reading_ease")
+def flesch_reading_ease(text):
+    return text_stats(text).readability()
+
+def flesch_score(words, sentences, syllables):
+    """Flesch Reading Ease from totals (None without words)."""
+    if not words:
+        return None
+    sentences = max(1, sentences)
+    score = 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
+    return round(score, 2)
+
+WORD_RE = re.compile(r"[^\W_]+")  # runs of letters/digits, same words as the isalnum() split
+
+class TextStats:
+    """Running character/word/sentence/syllable counts and word frequencies.
+
+    Text is fed in chunks of any size; a word cut by a chunk boundary is held
+    back and completed by the next chunk, so memory depends on the vocabulary
+    size, not on the amount of text.
+    """
+
+    def __init__(self):
+        self.chars = 0
+        self.words = 0
+        self.sentences = 0
+        self.freq = Counter()
+        self._carry = ""
+
+    def feed(self, chunk):
+        """One pass over the chunk: sentence marks via str.count, words via one regex scan."""
+        self.chars += len(chunk)
+        self.sentences += chunk.count(".") + chunk.count("!") + chunk.count("?")
+        if self._carry:
+            chunk = self._carry + chunk
+        # hold back a trailing partial word
+        i = len(chunk)
+        while i and chunk[i - 1].isalnum():
+            i -= 1
+        self._carry = chunk[i:]
+        if chunk.isascii():
+            # lowercasing ASCII never changes word boundaries: do it once for the whole chunk
+            words = WORD_RE.findall(chunk.lower(), 0, i)
+            self.words += len(words)
+            self.freq.update(words)
+        else:
+            self._add_words(WORD_RE.findall(chunk, 0, i))
+        return self
+
+    @property
+    def syllables(self):
+        # counted per distinct word, weighted by its frequency
+        return sum(n * estimate_syllables(w) for w, n in self.freq.items())
+
+    def finish(self):
+        if self._carry:
+            self._add_words(WORD_RE.findall(self._carry))
+            self._carry = ""
+        return self
+
+    def _add_words(self, words):
+        self.words += len(words)
+        self.freq.update(map(str.lower, words))
+
+    def merge(self, other):
+        """Add the counts of another (finished) TextStats, e.g. from another file."""
+        self.chars += other.chars
+        self.words += other.words
+        self.sentences += other.sentences
+        self.freq.update(other.freq)
+        return self
+
+    def most_common(self, n=10):
+        return self.freq.most_common(n)
+
+    def readability(self):
+        # Flesch Reading Ease from the running totals
+        return flesch_score(self.words, self.sentences, self.syllables)
+
+class LiveTextStats(TextStats):
+    """TextStats of an editable document, kept per line.
+
+    Edits replace a range of lines with "dirty" placeholders (their old
+    contribution is subtracted right away); update_line() re-tokenizes a
+    single line and adds it back. Totals are therefore always consistent
+    with the clean lines, and an edit costs O(touched lines).
+    """
+
+    def __init__(self, lines=("",)):
+        super().__init__()
+        self.lines = []
+        self._dirty_range = None  # (first, last) line index that may hold placeholders
+        self.reset(lines)
+
+    def reset(self, lines):
+        TextStats.__init__(self)
+        self.lines = [None] * len(lines)
+        self._dirty_range = None
+        for i, line in enumerate(lines):
+            self.update_line(i, line)
+        # newline between consecutive lines
+        self.chars += max(0, len(self.lines) - 1)
+
+    def replace_lines(self, start, old_end, new_count):
+        """Lines [start, old_end) became `new_count` lines that still need update_line()."""
+        for rec in self.lines[start:old_end]:
+            if rec is not None:
+                self._apply(rec, -1)
+        self.chars += new_count - (old_end - start)
+        self.lines[start:old_end] = [None] * new_count
+        delta = new_count - (old_end - start)
+        first, last = start, start + new_count - 1
+        if self._dirty_range is not None:
+            lo, hi = self._dirty_range
+            if hi >= old_end:
+                hi += delta
+            first, last = min(first, lo), max(last, hi)
+        self._dirty_range = (first, min(last, len(self.lines) - 1))
+
+    def dirty_runs(self):
+        """(first, last) ranges of consecutive lines waiting for update_line()."""
+        if self._dirty_range is None:
+            return []
+        lo, hi = self._dirty_range
+        runs = []
+        run_start = None
+        for i in range(lo, hi + 1):
+            if self.lines[i] is None:
+                if run_start is None:
+                    run_start = i
+            elif run_start is not None:
+                runs.append((run_start, i - 1))
+                run_start = None
+        if run_start is not None:
+            runs.append((run_start, hi))
+        return runs
+
+    def update_line(self, i, text):
+        if self.lines[i] is not None:
+            self._apply(self.lines[i], -1)
+        words = tuple(map(str.lower, WORD_RE.findall(text)))
+        rec = (len(text), text.count(".") + text.count("!") + text.count("?"), words)
+        self.lines[i] = rec
+        self._apply(rec, 1)
+
+    def clean(self):
+        self._dirty_range = None
+
+    def _apply(self, rec, sign):
+        chars, sentences, words = rec
+        self.chars += sign * chars
+        self.sentences += sign * sentences
+        self.words += sign * len(words)
+        if sign > 0:
+            self.freq.update(words)
+        else:
+            freq = self.freq
+            freq.subtract(words)
+            for w in set(words):
+                if freq[w] <= 0:
+                    del freq[w]
+
+
+@timed("text_stats")
+def text_stats(text):
+    """TextStats for an in-memory string (what analyze_text and flesch_reading_ease use)."""
+    return TextStats().feed(text).finish()
+
+def analyze_stream(f, chunk_chars=ANALYSIS_CHUNK_CHARS):
+    stats = TextStats()
+    for chunk in iter(lambda: f.read(chunk_chars), ""):
+        stats.feed(chunk)
+    return stats.finish()
+
+@timed("analyze_file")
+def analyze_file(path, chunk_chars=ANALYSIS_CHUNK_CHARS):
+    """Analyze a text file straight from disk, one chunk at a time."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return analyze_stream(f, chunk_chars)
+
+def format_analysis(stats, top=10):
+    readability = stats.readability()
+    out_lines = []
+    out_lines.append(f"Caratteri: {stats.chars}")
+    out_lines.append(f"Parole: {stats.words}")
+    out_lines.append(f"Frasi (approx): {stats.sentences}")
+    out_lines.append("")
+    out_lines.append("Parole più frequenti:")
+    for w, c in stats.most_common(top):
+        out_lines.append(f"  {w}: {c}")
+    out_lines.append("")
+    out_lines.append(f"Leggibilità (Flesch Reading Ease): {readability if readability is not None else 'N/A'}")
+    out_lines.append("")
+    out_lines.append("Suggerimenti:")
+    if readability is not None:
+        if readability >= 90:
+            out_lines.append("  Molto facile (scuola elementare).")
+        elif readability >= 60:
+            out_lines.append("  Facile/Moderato.")
+        else:
+            out_lines.append("  Difficile - considerare frasi più brevi e parole più semplici.")
+    return "\n".join(out_lines)
@@ -0,0 +1,545 @@
+"""To-do storage: JSON snapshot + journal, or SQLite."""
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+from .config import TODO_FILE, TODO_JOURNAL_SUFFIX, TODO_COMPACT_EVERY, TODO_BACKEND, TODO_DB_FILE, TODO_DB_PAGE
+from .deadlines import parse_deadline, deadline_to_str
+from .fileutil import atomic_write_json, file_signature
+from .metrics import incr, timed
+
+def new_task_id():
+    return uuid.uuid4().hex
+
+def _read_snapshot(path):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except Exception:
+            return []
+    return []
+
+def load_todos(path=TODO_FILE):
+    store = TodoStore(path)
+    todos = store.load()
+    store.close()
+    return todos
+
+def save_todos(todos, path=TODO_FILE):
+    # full rewrite: snapshot + empty journal
+    store = TodoStore(path)
+    store.todos = todos
+    store.save_all()
+    store.close()
+
+
+class TodoStore:
+    """To-do storage: JSON snapshot (TODO_FILE) + append-only journal.
+
+    Every add/update/delete appends one JSON line keyed by the task id to
+    the journal, so a single edit costs O(1) I/O. On load the journal is
+    replayed on top of the snapshot; once it grows past TODO_COMPACT_EVERY
+    records it is folded into a new snapshot in a background thread.
+    Journal records are idempotent, so replaying records that already made
+    it into the snapshot (crash during compaction) is harmless.
+    """
+
+    def __init__(self, path=TODO_FILE, journal_path=None, compact_every=None):
+        self.path = path
+        self.journal_path = journal_path or path + TODO_JOURNAL_SUFFIX
+        self.compact_every = compact_every or TODO_COMPACT_EVERY
+        self.todos = []
+        self._lock = threading.Lock()
+        self._journal = None
+        self._records = 0
+        self._compacting = None
+        self._disk_state = None  # file signatures as of our last read or write
+
+    # --- loading ---
+    @timed("load_todos")
+    def load(self):
+        todos, records, dirty, good = self._read()
+        if good is not None:
+            # cut off the torn tail of an interrupted append, or the next
+            # append would be glued to the broken line
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good)
+        self.todos = todos
+        self._records = records
+        self._disk_state = self._current_state()
+        if dirty:
+            # tasks written by older versions had no id: persist the new ones
+            self.save_all()
+        elif records >= self.compact_every:
+            self.compact()
+        return self.todos
+
+    def _read(self):
+        # snapshot + journal replay; returns (todos, records, ids assigned, torn offset or None)
+        todos = _read_snapshot(self.path)
+        by_id = {}
+        dirty = False
+        for t in todos:
+            if not t.get("id"):
+                t["id"] = new_task_id()
+                dirty = True
+            by_id[t["id"]] = t
+        records = 0
+        good = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete record")
+                        rec = json.loads(line)
+                    except ValueError:
+                        # torn tail from an interrupted append: stop here
+                        return todos, records, dirty, good
+                    self._apply(todos, by_id, rec)
+                    records += 1
+                    good += len(line)
+        return todos, records, dirty, None
+
+    def files(self):
+        """Files an outside writer would touch (for FileWatcher)."""
+        return (self.path, self.journal_path)
+
+    def _current_state(self):
+        return file_signature(self.path), file_signature(self.journal_path)
+
+    def reload(self):
+        """Fresh task dicts read from disk, or None if only this store wrote since.
+
+        Nothing is repaired or rewritten: a torn journal tail here is more
+        likely another process in the middle of an append.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self._disk_state:
+                return None
+            if self._journal is not None:
+                # the journal may have been replaced by another instance's compaction
+                self._journal.close()
+                self._journal = None
+            todos, self._records, _dirty, _torn = self._read()
+            self._disk_state = state
+        return todos
+
+    @staticmethod
+    def _apply(todos, by_id, rec):
+        op = rec.get("op")
+        tid = rec.get("id")
+        if op == "add":
+            task = dict(rec.get("task") or {}, id=tid)
+            old = by_id.get(tid)
+            if old is not None:
+                old.clear()
+                old.update(task)
+            else:
+                todos.append(task)
+                by_id[tid] = task
+        elif op == "update":
+            task = by_id.get(tid)
+            if task is not None:
+                task.update(rec.get("fields") or {})
+        elif op == "delete":
+            task = by_id.pop(tid, None)
+            if task is not None:
+                todos.remove(task)
+
+    # --- mutations ---
+    def add(self, task):
+        if not task.get("id"):
+            task["id"] = new_task_id()
+        self.todos.append(task)
+        self._append({"op": "add", "id": task["id"], "task": task})
+        return task
+
+    def update(self, task, fields):
+        task.update(fields)
+        self._append({"op": "update", "id": task["id"], "fields": fields})
+
+    def remove(self, task):
+        self.todos.remove(task)
+        self._append({"op": "delete", "id": task["id"]})
+
+    def import_todos(self, tasks):
+        """Add or replace (by id) many tasks with one write; returns (added, updated)."""
+        by_id = {t["id"]: t for t in self.todos}
+        records = []
+        added = updated = 0
+        for task in tasks:
+            if not task.get("id"):
+                task["id"] = new_task_id()
+            old = by_id.get(task["id"])
+            if old is None:
+                self.todos.append(task)
+                by_id[task["id"]] = task
+                added += 1
+            else:
+                old.clear()
+                old.update(task)
+                updated += 1
+            records.append({"op": "add", "id": task["id"], "task": task})
+        if len(records) >= self.compact_every:
+            # cheaper as one new snapshot than as a journal that needs compacting
+            self.save_all()
+        elif records:
+            self._append(*records)
+        return added, updated
+
+    @timed("save_todos")
+    def _append(self, *recs):
+        # one write + flush for the whole batch
+        line = "".join(json.dumps(rec, ensure_ascii=False) + "\n" for rec in recs)
+        with self._lock:
+            seen = self._current_state() == self._disk_state
+            if self._journal is None:
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(line)
+            self._journal.flush()
+            self._records += len(recs)
+            incr("journal_records", len(recs))
+            # if someone else wrote in between, leave the state stale so reload() picks it up
+            self._disk_state = self._current_state() if seen else None
+            need_compact = self._records >= self.compact_every
+        if need_compact:
+            self.compact()
+
+    # --- snapshots ---
+    @timed("save_todos")
+    def save_all(self):
+        # synchronous full rewrite, then drop the (now redundant) journal
+        if self._compacting is not None:
+            self._compacting.join()
+        with self._lock:
+            atomic_write_json(self.path, self.todos)
+            self._truncate_journal(0)
+            self._disk_state = self._current_state()
+
+    def compact(self, wait=False):
+        """Fold the journal into a new snapshot in a background thread."""
+        with self._lock:
+            if self._compacting is not None and self._compacting.is_alive():
+                return
+            # copy under the lock: the worker must not see later edits half-applied
+            data = [dict(t) for t in self.todos]
+            if self._journal is not None:
+                self._journal.flush()
+            offset = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+            self._compacting = threading.Thread(target=self._compact_worker, args=(data, offset), daemon=True)
+            self._compacting.start()
+        if wait:
+            self._compacting.join()
+
+    @timed("compact_todos")
+    def _compact_worker(self, data, offset):
+        try:
+            atomic_write_json(self.path, data)
+        except Exception:
+            return
+        with self._lock:
+            # the snapshot was replaced by us just now; only the journal says whether someone else wrote
+            seen = self._disk_state is not None and self._current_state()[1] == self._disk_state[1]
+            self._truncate_journal(offset)
+            if seen:
+                self._disk_state = self._current_state()
+
+    def _truncate_journal(self, offset):
+        # keep only the records appended after `offset` (caller holds the lock)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        tail = b""
+        if offset and os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+        if tail:
+            tmp = self.journal_path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(tail)
+            os.replace(tmp, self.journal_path)
+        elif os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._records = tail.count(b"\n")
+
+    # --- queries ---
+    def due_between(self, start, end, status="pending"):
+        """Tasks with the given status whose deadline falls in [start, end] (linear scan)."""
+        found = []
+        for t in self.todos:
+            if t.get("status", "pending") != status:
+                continue
+            dl = parse_deadline(t.get("deadline") or "")
+            if dl and start <= dl <= end:
+                found.append(t)
+        found.sort(key=lambda t: parse_deadline(t["deadline"]))
+        return found
+
+    def close(self):
+        if self._compacting is not None:
+            self._compacting.join()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+class LazyTodoList:
+    """List-like view over the todos table.
+
+    Only the ordered ids are loaded up front; task dicts are fetched in pages
+    of TODO_DB_PAGE rows the first time they are touched and then cached, so
+    the same dict object is returned (and mutated) on every access.
+    """
+
+    def __init__(self, store, ids):
+        self._store = store
+        self._ids = ids
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self._ids)))]
+        tid = self._ids[idx]
+        task = self._cache.get(tid)
+        if task is None:
+            if idx < 0:
+                idx += len(self._ids)
+            self._fetch(self._ids[idx:idx + TODO_DB_PAGE])
+            task = self._cache[tid]
+        return task
+
+    def __iter__(self):
+        for start in range(0, len(self._ids), TODO_DB_PAGE):
+            page = self._ids[start:start + TODO_DB_PAGE]
+            self._fetch([tid for tid in page if tid not in self._cache])
+            for tid in page:
+                yield self._cache[tid]
+
+    def _fetch(self, ids):
+        if ids:
+            self._cache.update(self._store._fetch_rows(ids))
+
+    def index(self, task):
+        return self._ids.index(task["id"])
+
+    def append(self, task):
+        self._ids.append(task["id"])
+        self._cache[task["id"]] = task
+
+    def remove(self, task):
+        self._ids.remove(task["id"])
+        self._cache.pop(task["id"], None)
+
+
+class SqliteTodoStore:
+    """To-do storage in a SQLite database (stdlib sqlite3).
+
+    Same interface as TodoStore. Deadlines are also stored normalized in
+    `due_at` ("YYYY-MM-DD HH:MM", sorts lexicographically) with an index on
+    (status, due_at), so "pending tasks due before X" is an index range scan.
+    """
+
+    COLUMNS = ("title", "desc", "deadline", "status")
+
+    def __init__(self, path=TODO_DB_FILE, json_path=TODO_FILE):
+        self.path = path
+        self.json_path = json_path
+        self.conn = None
+        self.todos = LazyTodoList(self, [])
+        self._data_version = None
+
+    @timed("load_todos")
+    def load(self):
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS todos ("
+                " id TEXT PRIMARY KEY, title TEXT, desc TEXT, deadline TEXT,"
+                " status TEXT, due_at TEXT, extra TEXT)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_status_due ON todos(status, due_at)")
+        empty = self.conn.execute("SELECT 1 FROM todos LIMIT 1").fetchone() is None
+        if empty and self.json_path and (os.path.exists(self.json_path) or os.path.exists(self.json_path + TODO_JOURNAL_SUFFIX)):
+            self.import_todos(load_todos(self.json_path))
+        ids = [row[0] for row in self.conn.execute("SELECT id FROM todos ORDER BY rowid")]
+        self.todos = LazyTodoList(self, ids)
+        self._data_version = self._current_data_version()
+        return self.todos
+
+    def files(self):
+        """Files an outside writer would touch (for FileWatcher)."""
+        return (self.path, self.path + "-wal")
+
+    def _current_data_version(self):
+        # changes only when another connection commits, never for our own writes
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def reload(self):
+        """Fresh task dicts read from the database, or None if no other connection committed."""
+        version = self._current_data_version()
+        if version == self._data_version:
+            return None
+        self._data_version = version
+        return [self._to_task(row) for row in self.conn.execute("SELECT * FROM todos ORDER BY rowid")]
+
+    # --- rows <-> dicts ---
+    @classmethod
+    def _to_row(cls, task):
+        extra = {k: v for k, v in task.items() if k != "id" and k not in cls.COLUMNS}
+        dl = parse_deadline(task.get("deadline") or "")
+        return (
+            task["id"], task.get("title", ""), task.get("desc", ""), task.get("deadline", ""),
+            task.get("status", "pending"), deadline_to_str(dl) or None,
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+
+    @staticmethod
+    def _to_task(row):
+        tid, title, desc, deadline, status, _due_at, extra = row
+        task = {"title": title, "desc": desc, "deadline": deadline, "status": status, "id": tid}
+        if extra:
+            task.update(json.loads(extra))
+        return task
+
+    def _fetch_rows(self, ids):
+        rows = {}
+        # stay below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 900):
+            chunk = ids[start:start + 900]
+            marks = ",".join("?" * len(chunk))
+            for row in self.conn.execute(f"SELECT * FROM todos WHERE id IN ({marks})", chunk):
+                rows[row[0]] = self._to_task(row)
+        return rows
+
+    # --- mutations ---
+    @timed("save_todos")
+    def import_todos(self, tasks):
+        """Add or replace (by id) many tasks in one transaction; returns (added, updated)."""
+        lazy = self.todos
+        known = set(lazy._ids)
+        new_ids = []
+        updated = 0
+        rows = []
+        for task in tasks:
+            if not task.get("id"):
+                task["id"] = new_task_id()
+            tid = task["id"]
+            if tid in known:
+                updated += 1
+                cached = lazy._cache.get(tid)
+                if cached is not None and cached is not task:
+                    cached.clear()
+                    cached.update(task)
+            else:
+                known.add(tid)
+                new_ids.append(tid)
+                lazy._cache[tid] = task
+            rows.append(self._to_row(task))
+        with self.conn:
+            # upsert keeps the rowid (list order) of tasks that already exist
+            self.conn.executemany(
+                "INSERT INTO todos VALUES (?,?,?,?,?,?,?) ON CONFLICT(id) DO UPDATE SET"
+                " title=excluded.title, desc=excluded.desc, deadline=excluded.deadline,"
+                " status=excluded.status, due_at=excluded.due_at, extra=excluded.extra",
+                rows,
+            )
+        lazy._ids.extend(new_ids)
+        return len(new_ids), updated
+
+    @timed("save_todos")
+    def add(self, task):
+        if not task.get("id"):
+            task["id"] = new_task_id()
+        with self.conn:
+            self.conn.execute("INSERT INTO todos VALUES (?,?,?,?,?,?,?)", self._to_row(task))
+        self.todos.append(task)
+        return task
+
+    @timed("save_todos")
+    def update(self, task, fields):
+        task.update(fields)
+        row = self._to_row(task)
+        with self.conn:
+            self.conn.execute(
+                "UPDATE todos SET title=?, desc=?, deadline=?, status=?, due_at=?, extra=? WHERE id=?",
+                row[1:] + row[:1],
+            )
+
+    @timed("save_todos")
+    def remove(self, task):
+        with self.conn:
+            self.conn.execute("DELETE FROM todos WHERE id=?", (task["id"],))
+        self.todos.remove(task)
+
+    @timed("save_todos")
+    def save_all(self):
+        # every mutation is already committed; kept for the "Salva manuale" button
+        self.conn.commit()
+
+    # --- queries ---
+    def due_between(self, start, end, status="pending"):
+        """Tasks with the given status whose deadline falls in [start, end]."""
+        rows = self.conn.execute(
+            "SELECT * FROM todos WHERE status=? AND due_at BETWEEN ? AND ? ORDER BY due_at",
+            (status, deadline_to_str(start), deadline_to_str(end)),
+        )
+        cache = self.todos._cache
+        # go through the cache so callers and the task list share one dict per task
+        return [cache.get(row[0]) or cache.setdefault(row[0], self._to_task(row)) for row in rows]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def migrate_json_to_sqlite(json_path=TODO_FILE, db_path=TODO_DB_FILE):
+    """One-shot copy of todos.json (+ journal) into a SQLite database."""
+    store = SqliteTodoStore(db_path, json_path=None)
+    store.load()
+    store.import_todos(load_todos(json_path))
+    count = store.conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0]
+    store.close()
+    return count
+
+def diff_todos(current, fresh):
+    """What turns `current` into `fresh`, matching tasks by id.
+
+    Returns (removed, changed, added): tasks of `current` no longer present,
+    (task, new fields) pairs whose content differs, and the new tasks in
+    `fresh` order.
+    """
+    new_by_id = {t["id"]: t for t in fresh}
+    removed = []
+    changed = []
+    for t in current:
+        new = new_by_id.pop(t["id"], None)
+        if new is None:
+            removed.append(t)
+        elif new != t:
+            changed.append((t, new))
+    return removed, changed, list(new_by_id.values())
+
+def open_todo_store(backend=None):
+    if (backend or TODO_BACKEND) == "sqlite":
+        return SqliteTodoStore(TODO_DB_FILE, json_path=TODO_FILE)
+    return TodoStore(TODO_FILE)
+
+def format_task_row(i, t):
+    title = t.get("title","(No title)")
+    dl = t.get("deadline")
+    mark = "[done] " if t.get("status")=="done" else ""
+    dlstr = f" ({dl})" if dl else ""
+    return f"{i+1}. {mark}{title}{dlstr}"
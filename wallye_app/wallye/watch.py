@@ -0,0 +1,143 @@
+"""Change detection for files edited by other processes (todos, releases.json).
+
+FileWatcher polls from the Tk event loop with root.after. Each tick costs
+one os.stat per watched file. On Linux the parent directories are also
+watched with inotify (through ctypes, no extra packages): a daemon thread
+blocks on the inotify descriptor and only sets a flag. Ticks then skip
+the stat calls entirely until something in those directories actually
+moved.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+from .config import WATCH_INTERVAL_MS
+from .fileutil import file_signature
+
+# inotify(7) event masks
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Sets `event` whenever one of `names` changes in one of `dirs`."""
+
+    def __init__(self, dirs, names, event):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.watched = set()
+        for d in dirs:
+            if libc.inotify_add_watch(self.fd, os.fsencode(d), _IN_MASK) >= 0:
+                self.watched.add(d)
+        self.names = {os.fsencode(n) for n in names}
+        self.event = event
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop:
+            ready, _, _ = select.select([self.fd], [], [], 1.0)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            pos = 0
+            while pos + _EVENT.size <= len(data):
+                _wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+                name = data[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0")
+                pos += _EVENT.size + length
+                if mask & _IN_Q_OVERFLOW or name in self.names:
+                    self.event.set()
+
+    def close(self):
+        self._stop = True
+        self._thread.join()
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Calls on_change(paths) from the Tk loop when watched files change on disk.
+
+    `interval_ms` is the polling period (WATCH_INTERVAL_MS, 0 = disabled).
+    Writes made by this process are reported too. Callers that can tell
+    their own writes apart (see TodoStore.reload) simply find nothing new.
+    """
+
+    def __init__(self, root, paths, on_change, interval_ms=None, use_inotify=True):
+        self.root = root
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.on_change = on_change
+        self.interval_ms = WATCH_INTERVAL_MS if interval_ms is None else interval_ms
+        self._signatures = {p: file_signature(p) for p in self.paths}
+        self._after_id = None
+        self._dirty = threading.Event()
+        self._inotify = None
+        self._polled = list(self.paths)  # files whose directory inotify does not cover
+        if use_inotify and sys.platform.startswith("linux") and self.interval_ms:
+            dirs = {os.path.dirname(p) for p in self.paths}
+            try:
+                self._inotify = _Inotify(sorted(d for d in dirs if os.path.isdir(d)),
+                                         {os.path.basename(p) for p in self.paths}, self._dirty)
+            except (OSError, AttributeError):
+                self._inotify = None
+            else:
+                self._polled = [p for p in self.paths if os.path.dirname(p) not in self._inotify.watched]
+
+    @property
+    def mode(self):
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self):
+        if self.interval_ms and self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+        return self
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def check(self):
+        """Stat the files that may have changed; returns the changed paths."""
+        if self._inotify is not None and not self._dirty.is_set():
+            candidates = self._polled
+        else:
+            self._dirty.clear()
+            candidates = self.paths
+        changed = []
+        for p in candidates:
+            sig = file_signature(p)
+            if sig != self._signatures[p]:
+                self._signatures[p] = sig
+                changed.append(p)
+        return changed
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            changed = self.check()
+            if changed:
+                self.on_change(changed)
+        finally:
+            self._after_id = self.root.after(self.interval_ms, self._tick)